@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+REB_Bench.py
+
+Offline benchmark for the Rose Engine Butler panel handlers
+(REB_Display/hitcounter.py).
+
+Loads HandlerClass against the stand-in linuxcnc, hal, hal_glib, glib,
+gi and GtkBuilder modules in REB_Bench/stand_ins, so it runs on any
+Linux box without LinuxCNC or GTK. The simulated machine accepts each
+command after --accept-ms and completes each motion line after
+--motion-ms.
+Each scenario presses one button --count times, waiting for the
+machine after every press the way an operator would, and reports:
+
+    ops/s       throughput
+    p50/p95/max press -> work complete latency, in ms
+    cmds/op     commands the simulated task controller accepted
+
+followed by the REB_Timing phase breakdown of the handler involved.
+
+Usage (from the configuration directory):
+    python3 REB_Bench/REB_Bench.py [--count N] [--accept-ms MS]
+        [--motion-ms MS] [--output bench_output.txt] [scenario ...]
+
+Scenarios: single_index, repeat_index, spindle_start, scale_change
+(default: all of them).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, "stand_ins"),
+                os.path.join(os.path.dirname(HERE), "REB_Display")]
+
+from gtk_builder import Builder, SpinButton
+
+# Time every handler phase; never pick up a real INI file.
+os.environ["REB_TIMING"] = "1"
+os.environ.pop("INI_FILE_NAME", None)
+
+SCENARIOS = ("single_index", "repeat_index", "spindle_start", "scale_change")
+
+
+def load(accept, motion):
+    '''
+    Imports hitcounter.py against the stand-ins and returns the module
+    and a HandlerClass instance, timed by REB_Timing.
+    '''
+    import hal
+    import linuxcnc
+
+    linuxcnc.ACCEPT_DELAY = accept
+    linuxcnc.MOTION_DELAY = motion
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import hitcounter
+        for axis_id, stepgen_ch in hitcounter.AXIS_STEPGEN.items():
+            hal.values()["hm2_7i92.0.stepgen." + stepgen_ch
+                         + ".position-scale"] = 1.0
+            hal.values()["gladevcp." + axis_id + "_ENA_Status"] = True
+        halcomp = hal.component("gladevcp")
+        handler = hitcounter.get_handlers(halcomp, Builder(), [])[0]
+    return hitcounter, handler
+
+
+def drain(hitcounter):
+    '''
+    Waits until every MDI job queued so far has finished, running the
+    stand-in GLib loop meanwhile.
+    '''
+    from gi.repository import GLib
+
+    done = []
+    hitcounter.mdi.submit([], on_done=lambda job: done.append(job))
+    if not GLib.run_until(lambda: done):
+        raise RuntimeError("MDI executor did not finish")
+
+
+def single_index(hitcounter, handler, count):
+    handler.B_Idx_Rpt = 1
+    def press():
+        handler.B_Move_Idx_Fwd(None)
+        drain(hitcounter)
+    return [press] * count
+
+
+def repeat_index(hitcounter, handler, count):
+    # One press of count divisions; reported per division.
+    handler.B_Idx_Rpt = count
+    def press():
+        handler.B_Move_Idx_Fwd(None)
+        drain(hitcounter)
+    return [press]
+
+
+def spindle_start(hitcounter, handler, count):
+    def press():
+        handler.Sp0_Move_Fwd(None)
+        drain(hitcounter)
+    return [press] * count
+
+
+def scale_change(hitcounter, handler, count):
+    def press(value):
+        handler.X_Set_Scale(SpinButton(value))
+    return [lambda i=i: press(16000.0 + i) for i in range(count)]
+
+
+HANDLERS = {
+    "single_index": "B_Move_Idx_Fwd",
+    "repeat_index": "B_Move_Idx_Fwd",
+    "spindle_start": "Sp0_Move_Fwd",
+    "scale_change": "X_Set_Scale",
+}
+
+
+def run(name, hitcounter, handler, count):
+    '''
+    Runs one scenario and returns its report lines.
+    '''
+    import linuxcnc
+    import REB_Timing
+
+    REB_Timing.reset()
+    machine = linuxcnc.machine()
+    commands = machine.commands
+    latencies = []
+
+    started = time.monotonic()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for press in globals()[name](hitcounter, handler, count):
+            pressed = time.monotonic()
+            press()
+            latencies.append(time.monotonic() - pressed)
+    elapsed = time.monotonic() - started
+
+    # repeat_index presses once for count divisions.
+    ops = count
+    if name == "repeat_index":
+        latencies = [latency / count for latency in latencies]
+
+    p50, p95, peak = REB_Timing.summary(latencies)
+    lines = ["%-14s %5d %8.1f %8.1f %8.1f %8.1f %8.1f" % (
+        name, ops, ops / elapsed, p50 * 1000, p95 * 1000, peak * 1000,
+        (machine.commands - commands) / float(ops))]
+    for phase in REB_Timing.PHASES:
+        values = REB_Timing.samples(HANDLERS[name], phase)
+        if not values:
+            continue
+        p50, p95, peak = REB_Timing.summary(values)
+        lines.append("  %-12s %5d %17.1f %8.1f %8.1f" % (
+            phase, len(values), p50 * 1000, p95 * 1000, peak * 1000))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("scenarios", nargs="*", metavar="scenario")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--accept-ms", type=float, default=5.0)
+    parser.add_argument("--motion-ms", type=float, default=50.0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario " + name + " (choose from "
+                         + ", ".join(SCENARIOS) + ")")
+
+    hitcounter, handler = load(args.accept_ms / 1000.0,
+                               args.motion_ms / 1000.0)
+
+    lines = [
+        "REB_Bench: count=%d accept=%.1f ms motion=%.1f ms" % (
+            args.count, args.accept_ms, args.motion_ms),
+        "scenario         ops    ops/s      p50      p95      max  cmds/op",
+    ]
+    for name in args.scenarios or SCENARIOS:
+        lines.extend(run(name, hitcounter, handler, args.count))
+
+    report = "\n".join(lines) + "\n"
+    sys.stdout.write(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+gi - benchmark stand-in
+
+Offline replacement for PyGObject; see gi.repository. Only REB_Bench
+and the tests (tests/conftest.py) put this directory on sys.path.
+"""
+
+
+def require_version(namespace, version):
+    pass
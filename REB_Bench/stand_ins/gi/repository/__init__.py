@@ -0,0 +1,108 @@
+"""
+gi.repository - benchmark stand-in
+
+Offline replacements for the GLib and Gdk namespaces the REB handler
+modules use. GLib is a minimal main loop: idle_add() and timeout_add()
+may be called from any thread, and the benchmark runs the callbacks on
+its own thread with GLib.iterate() / GLib.run_until(). Only REB_Bench
+and the tests (tests/conftest.py) put this directory on sys.path.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class GLib:
+
+    PRIORITY_DEFAULT = 0
+    PRIORITY_HIGH_IDLE = 100
+    PRIORITY_DEFAULT_IDLE = 200
+
+    _lock = threading.Lock()
+    _ids = itertools.count(1)
+    _due = []           # heap of (due time, source id, callback, args)
+    _interval = {}      # source id -> repeat interval in seconds
+    _removed = set()
+
+    @classmethod
+    def _add(cls, delay, interval, callback, args):
+        with cls._lock:
+            source = next(cls._ids)
+            heapq.heappush(cls._due,
+                           (time.monotonic() + delay, source, callback, args))
+            if interval is not None:
+                cls._interval[source] = interval
+            return source
+
+    @classmethod
+    def idle_add(cls, callback, *args, **kwargs):
+        return cls._add(0.0, None, callback, args)
+
+    @classmethod
+    def timeout_add(cls, interval_ms, callback, *args, **kwargs):
+        interval = interval_ms / 1000.0
+        return cls._add(interval, interval, callback, args)
+
+    @classmethod
+    def timeout_add_seconds(cls, interval, callback, *args, **kwargs):
+        return cls._add(interval, interval, callback, args)
+
+    @classmethod
+    def source_remove(cls, source):
+        with cls._lock:
+            cls._removed.add(source)
+            cls._interval.pop(source, None)
+        return True
+
+    @classmethod
+    def iterate(cls):
+        '''
+        Runs every callback that is due. Returns True if any ran.
+        '''
+        ran = False
+        now = time.monotonic()
+        while True:
+            with cls._lock:
+                if not cls._due or cls._due[0][0] > now:
+                    return ran
+                due, source, callback, args = heapq.heappop(cls._due)
+                if source in cls._removed:
+                    cls._removed.discard(source)
+                    continue
+            ran = True
+            again = callback(*args)
+            with cls._lock:
+                interval = cls._interval.get(source)
+                if again and interval is not None:
+                    heapq.heappush(cls._due, (time.monotonic() + interval,
+                                              source, callback, args))
+                else:
+                    cls._interval.pop(source, None)
+
+    @classmethod
+    def run_until(cls, predicate, timeout=60.0, step=0.0005):
+        '''
+        Runs the loop until predicate() is true. Returns False if it
+        timed out first.
+        '''
+        end = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > end:
+                return False
+            if not cls.iterate():
+                time.sleep(step)
+        return True
+
+
+class _ScrollDirection:
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+    SMOOTH = 4
+
+
+class Gdk:
+    ScrollDirection = _ScrollDirection
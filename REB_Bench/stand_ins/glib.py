@@ -0,0 +1,13 @@
+"""
+glib.py - benchmark stand-in
+
+Offline replacement for the old static glib bindings hitcounter.py
+still imports; it forwards to the stand-in GLib main loop. Only
+REB_Bench puts this directory on sys.path.
+"""
+
+from gi.repository import GLib
+
+idle_add = GLib.idle_add
+timeout_add = GLib.timeout_add
+source_remove = GLib.source_remove
@@ -0,0 +1,159 @@
+"""
+gtk_builder.py - benchmark stand-in
+
+Offline replacement for the GtkBuilder gladevcp hands to
+hitcounter.get_handlers(), shared by REB_Bench, REB_Sim_Driver and the
+tests. Builder has the widgets of all the REB .ui files, so one
+HandlerClass gets the pins, state and callbacks of every component,
+but only of the types the handlers use: buttons, check and radio
+buttons, spin buttons and combo boxes. get_object() returns None for
+anything else, as for a widget the .ui does not have.
+
+Unlike the other stand-ins this one replaces no LinuxCNC module, so
+REB_Sim_Driver, which runs against the real ones, can import it too.
+"""
+
+import glob
+import os
+import xml.etree.ElementTree as ET
+
+UI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), "REB_Display")
+
+
+def ui_files():
+    '''
+    The tracked .ui files of REB_Display (not the .cached.ui copies).
+    '''
+    return sorted(path for path in glob.glob(os.path.join(UI_DIR, "*.ui"))
+                  if not path.endswith(".cached.ui"))
+
+
+class Button:
+    '''
+    Stand-in for a GtkButton or HAL_Button; the handlers only check
+    that it is there.
+    '''
+
+
+class ToggleButton:
+    '''
+    Stand-in for a check or radio button.
+    '''
+
+    def __init__(self):
+        self.active = False
+
+    def get_active(self):
+        return self.active
+
+    def set_active(self, active):
+        self.active = bool(active)
+
+
+class SpinButton:
+    '''
+    Stand-in for a spin button, also the widget a value-changed
+    handler receives.
+    '''
+
+    def __init__(self, value=0.0):
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+
+
+class Entry:
+    '''
+    Stand-in for the entry of a combo box with has-entry set.
+    '''
+
+    def __init__(self):
+        self.text = ""
+
+    def get_text(self):
+        return self.text
+
+    def set_text(self, text):
+        self.text = text
+
+
+class ComboBoxText:
+    '''
+    Stand-in for a GtkComboBoxText, with an Entry child if it has one.
+    '''
+
+    def __init__(self, has_entry=False):
+        self.items = []         # [(id, text)]
+        self.active = -1
+        self.entry = Entry() if has_entry else None
+
+    def get_child(self):
+        return self.entry
+
+    def append(self, item_id, text):
+        self.items.append((item_id, text))
+
+    def append_text(self, text):
+        self.items.append((None, text))
+
+    def remove_all(self):
+        self.items = []
+        self.active = -1
+
+    def set_active(self, index):
+        self.active = index if 0 <= index < len(self.items) else -1
+
+    def get_active_id(self):
+        if self.active < 0:
+            return None
+        return self.items[self.active][0]
+
+    def set_active_id(self, item_id):
+        ids = [item[0] for item in self.items]
+        self.active = ids.index(item_id) if item_id in ids else -1
+        return self.active >= 0
+
+
+# Stand-in for each widget class the handlers look up.
+WIDGETS = {
+    "GtkButton":        Button,
+    "HAL_Button":       Button,
+    "HAL_CheckButton":  ToggleButton,
+    "HAL_RadioButton":  ToggleButton,
+    "HAL_SpinButton":   SpinButton,
+    "GtkComboBoxText":  ComboBoxText,
+}
+
+
+class Builder:
+    '''
+    Stand-in GtkBuilder holding the WIDGETS of the given .ui files
+    (default: all of them), each created on first use.
+    '''
+
+    def __init__(self, paths=None):
+        self._ui = {}           # widget id -> its <object> element
+        self._objects = {}
+        for path in paths if paths is not None else ui_files():
+            for obj in ET.parse(path).iter("object"):
+                if obj.get("class") in WIDGETS and obj.get("id"):
+                    self._ui[obj.get("id")] = obj
+
+    def get_object(self, name):
+        if name not in self._objects:
+            obj = self._ui.get(name)
+            if obj is None:
+                return None
+            kind = WIDGETS[obj.get("class")]
+            if kind is ComboBoxText:
+                self._objects[name] = kind(any(
+                    prop.get("name") == "has-entry" and prop.text == "True"
+                    for prop in obj.findall("property")))
+            else:
+                self._objects[name] = kind()
+        return self._objects[name]
@@ -0,0 +1,102 @@
+"""
+hal.py - benchmark stand-in
+
+Offline replacement for the LinuxCNC "hal" Python module: components
+with pins, plus get_value() / set_p() over one in-memory table of
+pins and parameters. Only REB_Bench and the tests (tests/conftest.py)
+put this directory on sys.path.
+"""
+
+HAL_BIT = 1
+HAL_FLOAT = 2
+HAL_S32 = 3
+HAL_U32 = 4
+
+HAL_IN = 16
+HAL_OUT = 32
+HAL_IO = HAL_IN | HAL_OUT
+
+HAL_RO = 64
+HAL_RW = 192
+
+
+class error(RuntimeError):
+    pass
+
+
+# name -> value for every pin and parameter in the simulated HAL.
+_values = {}
+
+
+def values():
+    '''
+    The in-memory HAL table, for benchmarks to seed and inspect.
+    '''
+    return _values
+
+
+def get_value(name):
+    try:
+        return _values[name]
+    except KeyError:
+        raise error("pin or parameter " + name + " not found")
+
+
+def set_p(name, text):
+    if name not in _values:
+        raise error("pin or parameter " + name + " not found")
+    current = _values[name]
+    if isinstance(current, bool):
+        _values[name] = text.upper() in ("TRUE", "1")
+    elif isinstance(current, float):
+        _values[name] = float(text)
+    else:
+        _values[name] = text
+
+
+def component_exists(name):
+    return any(key.startswith(name + ".") for key in _values)
+
+
+def component_is_ready(name):
+    return component_exists(name)
+
+
+class Pin:
+
+    def __init__(self, name, type, dir):
+        self.name = name
+        self.type = type
+        self.dir = dir
+
+    def get(self):
+        return _values[self.name]
+
+    def set(self, value):
+        _values[self.name] = value
+
+    def get_name(self):
+        return self.name
+
+
+class component:
+
+    def __init__(self, name):
+        self.name = name
+
+    def getprefix(self):
+        return self.name
+
+    def newpin(self, name, type, dir):
+        full = self.name + "." + name
+        _values[full] = False if type == HAL_BIT else 0.0
+        return Pin(full, type, dir)
+
+    def ready(self):
+        pass
+
+    def __getitem__(self, name):
+        return _values[self.name + "." + name]
+
+    def __setitem__(self, name, value):
+        _values[self.name + "." + name] = value
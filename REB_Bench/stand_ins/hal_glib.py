@@ -0,0 +1,25 @@
+"""
+hal_glib.py - benchmark stand-in
+
+Offline replacement for LinuxCNC's hal_glib: GPin wraps a stand-in
+hal pin. Only REB_Bench and the tests (tests/conftest.py) put this
+directory on sys.path.
+"""
+
+
+class GPin:
+
+    def __init__(self, pin):
+        self.pin = pin
+
+    def get(self):
+        return self.pin.get()
+
+    def set(self, value):
+        self.pin.set(value)
+
+    def get_name(self):
+        return self.pin.get_name()
+
+    def connect(self, signal, callback, *args):
+        return 0
@@ -0,0 +1,198 @@
+"""
+linuxcnc.py - benchmark stand-in
+
+Offline replacement for the LinuxCNC "linuxcnc" Python module, just
+complete enough for hitcounter.py, REB_Mdi.py and REB_Stat.py to run
+off the machine. Only REB_Bench and the tests (tests/conftest.py)
+put this directory on sys.path.
+
+Every command and stat channel talks to one simulated machine, the
+way real NML channels all talk to the same task controller:
+
+    ACCEPT_DELAY    seconds each command (mode, mdi, auto, abort)
+                    takes to be accepted
+    MOTION_DELAY    seconds each motion line (G0/G1/G2/G3/M19) takes
+                    to complete once accepted
+
+Both can be set by the benchmark or from the REB_BENCH_ACCEPT /
+REB_BENCH_MOTION environment variables.
+"""
+
+import os
+import re
+import threading
+import time
+
+MODE_MANUAL = 1
+MODE_AUTO = 2
+MODE_MDI = 3
+
+STATE_ESTOP = 1
+STATE_ESTOP_RESET = 2
+STATE_OFF = 3
+STATE_ON = 4
+
+INTERP_IDLE = 1
+INTERP_READING = 2
+INTERP_PAUSED = 3
+INTERP_WAITING = 4
+
+EXEC_ERROR = 1
+EXEC_DONE = 2
+
+RCS_DONE = 1
+RCS_EXEC = 2
+RCS_ERROR = 3
+
+AUTO_RUN = 0
+
+ACCEPT_DELAY = float(os.environ.get("REB_BENCH_ACCEPT", "0.005"))
+MOTION_DELAY = float(os.environ.get("REB_BENCH_MOTION", "0.05"))
+
+_MOTION = re.compile(r'^\s*(G0*[0-3]\b|M19\b)', re.IGNORECASE)
+_SPEED = re.compile(r'S\s*([-\d.]+)(?:\s*\$(\d))?', re.IGNORECASE)
+
+
+class error(Exception):
+    pass
+
+
+class _Machine:
+    '''
+    The simulated task controller shared by every channel.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.task_mode = MODE_MANUAL
+        self.schedule = []      # (end time, program line) of queued motion
+        self.program = []
+        self.speeds = [0.0, 0.0]
+        self.running = [False, False]
+        self.commands = 0
+
+    def accept(self):
+        time.sleep(ACCEPT_DELAY)
+        self.commands += 1
+
+    def busy_until(self):
+        return self.schedule[-1][0] if self.schedule else 0.0
+
+    def queue_motion(self, line):
+        with self.lock:
+            start = max(time.monotonic(), self.busy_until())
+            self.schedule.append((start + MOTION_DELAY, line))
+
+    def current_line(self, now):
+        with self.lock:
+            while self.schedule and self.schedule[0][0] <= now:
+                self.schedule.pop(0)
+            return self.schedule[0][1] if self.schedule else 0
+
+
+_machine = _Machine()
+
+
+def machine():
+    '''
+    The shared simulated machine, for benchmarks that want to inspect
+    or reset it.
+    '''
+    return _machine
+
+
+class command:
+
+    def mode(self, mode):
+        _machine.accept()
+        _machine.task_mode = mode
+
+    def mdi(self, gcode):
+        _machine.accept()
+        self._spindle_words(gcode)
+        if _MOTION.match(gcode):
+            _machine.queue_motion(0)
+
+    def _spindle_words(self, gcode):
+        word = gcode.strip().upper()
+        match = _SPEED.search(word)
+        if match and not word.startswith("M19"):
+            spindle = int(match.group(2) or 0)
+            if spindle < len(_machine.speeds):
+                _machine.speeds[spindle] = float(match.group(1))
+        if word.startswith(("M3", "M4")):
+            _machine.running = [True, True]
+        elif word.startswith("M5"):
+            _machine.running = [False, False]
+
+    def wait_complete(self, timeout=5.0):
+        remaining = _machine.busy_until() - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return -1
+        if remaining > 0:
+            time.sleep(remaining)
+        return RCS_DONE
+
+    def abort(self):
+        _machine.accept()
+        with _machine.lock:
+            _machine.schedule = []
+        _machine.running = [False, False]
+
+    def program_open(self, path):
+        _machine.accept()
+        with open(path) as f:
+            _machine.program = f.read().splitlines()
+
+    def auto(self, how, *args):
+        _machine.accept()
+        if how != AUTO_RUN:
+            return
+        for lineno, text in enumerate(_machine.program, start=1):
+            if _MOTION.match(text):
+                _machine.queue_motion(lineno)
+            else:
+                self._spindle_words(text)
+
+
+class stat:
+
+    spindles = 2
+    task_state = STATE_ON
+    exec_state = EXEC_DONE
+    estop = 0
+    enabled = 1
+    position = (0.0,) * 9
+
+    def __init__(self):
+        self.poll()
+
+    def poll(self):
+        now = time.monotonic()
+        line = _machine.current_line(now)
+        busy = _machine.busy_until() > now
+        self.task_mode = _machine.task_mode
+        self.interp_state = INTERP_READING if busy else INTERP_IDLE
+        self.motion_line = line
+        self.current_line = line
+        self.current_vel = 1.0 if busy else 0.0
+        self.spindle = tuple(
+            {"speed": speed if running else 0.0, "enabled": int(running)}
+            for speed, running in zip(_machine.speeds, _machine.running)
+        )
+
+
+class error_channel:
+
+    def poll(self):
+        return None
+
+
+class ini:
+
+    def __init__(self, path):
+        self.path = path
+
+    def find(self, section, key):
+        return None
@@ -0,0 +1,307 @@
+"""
+REB_Axis.py
+
+Table-driven axis engine for the Rose Engine Butler GladeVCP handlers
+(hitcounter.py).
+
+The linear axes, the B axis and both spindles share the same handful
+of callbacks, differing only in the axis letter and stepgen channel.
+Instead of one hand-written copy per axis, axis_table() builds a
+descriptor for each entry of hitcounter.AXIS_STEPGEN and AxisEngine
+generates the callbacks GladeVCP connects to from those:
+
+    <id>_Idx_Minus, <id>_Idx_Plus   linear  G0 index move of
+                                            <id>_Idx_Dist at <id>_Feed,
+                                            counted in <id>_Idx_Qty
+    <id>_Set_Feed                   linear
+    <id>_Set_Idx_Dist               linear
+    <id>_Set_Move_Dist              linear, rotary
+    <id>_Set_Scale                  linear, rotary, spindle
+
+The values they set live on the handler object under the names the
+rest of HandlerClass uses (self.X_Feed, self.X_Idx_Dist, ...). A
+callback HandlerClass defines itself, such as B_Set_Idx_Dist, is never
+replaced. Adding an axis to AXIS_STEPGEN (and its widgets to the UI)
+is all it takes to give it these callbacks.
+
+hitcounter.py is loaded by four gladevcp components, each with its own
+.ui, so bind() only generates the callbacks whose widget (WIDGETS) is
+in the .ui that component loaded.
+"""
+
+import collections
+import contextlib
+
+import REB_Hal
+
+# Descriptor of one axis or spindle: its id as used in widget and
+# handler names, its stepgen channel, its kind and the callbacks it
+# gets.
+Axis = collections.namedtuple("Axis", "id stepgen kind callbacks")
+
+CALLBACKS = {
+    "linear":  ("Idx_Minus", "Idx_Plus", "Set_Feed", "Set_Idx_Dist",
+                "Set_Move_Dist", "Set_Scale"),
+    "rotary":  ("Set_Move_Dist", "Set_Scale"),
+    "spindle": ("Set_Scale",),
+}
+
+# Widget (<id>_<name>) each callback is connected to.
+WIDGETS = {
+    "Idx_Minus":     "Idx_Minus",
+    "Idx_Plus":      "Idx_Plus",
+    "Set_Feed":      "Feed",
+    "Set_Idx_Dist":  "Idx_Dist",
+    "Set_Move_Dist": "Move_Dist",
+    "Set_Scale":     "Set_Scale",
+}
+
+# Handler attributes a callback reads or writes, with their initial
+# value. Set only if HandlerClass has not set them already.
+STATE = {
+    "Idx_Minus":     (("Feed", 1.0), ("Idx_Dist", 0.0), ("Idx_Qty", 0)),
+    "Idx_Plus":      (("Feed", 1.0), ("Idx_Dist", 0.0), ("Idx_Qty", 0)),
+    "Set_Feed":      (("Feed", 1.0),),
+    "Set_Idx_Dist":  (("Idx_Dist", 0.0), ("Idx_Qty", 0)),
+    "Set_Move_Dist": (("Move_Dist", 0.0),),
+}
+
+
+def axis_kind(axis_id):
+    '''
+    "spindle" for Sp0, Sp1 ..., "rotary" for A, B and C, otherwise
+    "linear".
+    '''
+    if axis_id.startswith("Sp"):
+        return "spindle"
+    if axis_id in ("A", "B", "C"):
+        return "rotary"
+    return "linear"
+
+
+def axis_table(axis_stepgen):
+    '''
+    Builds the Axis descriptors for a mapping of axis id -> stepgen
+    channel, in the mapping's order.
+    '''
+    table = []
+    for axis_id, stepgen_ch in axis_stepgen.items():
+        kind = axis_kind(axis_id)
+        table.append(Axis(axis_id, stepgen_ch, kind, CALLBACKS[kind]))
+    return table
+
+
+class AxisEngine:
+    '''
+    Generates the per-axis callbacks of a HandlerClass instance from an
+    axis table and runs them on one shared code path.
+    '''
+
+    def __init__(self, handler, executor, axes, settings=None):
+        self.handler = handler
+        self.mdi = executor
+        self.axes = {axis.id: axis for axis in axes}
+        # REB_Settings.SettingsWriter that applied scales are saved
+        # through, in the component that has one.
+        self.settings = settings
+        # {axis id: scale} collected by the Set_Scale callbacks inside
+        # batch(), or None outside one.
+        self._batch = None
+
+    def bind(self, builder=None):
+        '''
+        Sets the generated callbacks (and the state they use) on the
+        handler. gladevcp collects callbacks with dir(), which sees
+        them on the instance; call before halcomp.ready().
+
+        Given the component's builder, only callbacks whose widget it
+        has are generated; without one, all of them are.
+        '''
+        defined = type(self.handler)
+        for axis in self.axes.values():
+            for callback in axis.callbacks:
+                widget = axis.id + "_" + WIDGETS[callback]
+                if builder is not None and builder.get_object(widget) is None:
+                    continue
+
+                for field, value in STATE.get(callback, ()):
+                    if not hasattr(self.handler, axis.id + "_" + field):
+                        setattr(self.handler, axis.id + "_" + field, value)
+
+                name = axis.id + "_" + callback
+                if hasattr(defined, name):
+                    continue
+                make = getattr(self, "_make_" + callback.lower())
+                function = make(axis, name)
+                function.__name__ = name
+                function.__doc__ = make.__doc__
+                setattr(self.handler, name, function)
+
+    def _make_idx_minus(self, axis, name):
+        '''
+        Indexes the axis in the minus direction (G0).
+        '''
+        return self._make_idx(axis, name, "-", -1)
+
+    def _make_idx_plus(self, axis, name):
+        '''
+        Indexes the axis in the plus direction (G0).
+        '''
+        return self._make_idx(axis, name, "", 1)
+
+    def _make_idx(self, axis, name, sign, step):
+        handler = self.handler
+        submit = self.mdi.submit
+        prefix = "G0 " + axis.id + sign
+        dist_attr = axis.id + "_Idx_Dist"
+        feed_attr = axis.id + "_Feed"
+        qty_attr = axis.id + "_Idx_Qty"
+
+        def callback(widget):
+            print("=================================================")
+            print("FUNCTION " + name)
+
+            # Send an MDI command to move along the axis. The executor
+            # waits for the move off the GTK main loop, then the index
+            # is counted and journalled like the B axis ones.
+            distance = getattr(handler, dist_attr)
+            Gcode = (prefix + str(distance)
+                     + " F" + str(getattr(handler, feed_attr)))
+
+            print(Gcode)
+            submit([Gcode], on_done=handler._count_index(qty_attr, step,
+                                                         distance))
+        return callback
+
+    def _make_set_feed(self, axis, name):
+        '''
+        Sets the axis feed rate from the spin button.
+        '''
+        return self._make_setter(name, axis.id + "_Feed", 1)
+
+    def _make_set_idx_dist(self, axis, name):
+        '''
+        Sets the axis index distance from the spin button.
+        '''
+        return self._make_setter(name, axis.id + "_Idx_Dist", None)
+
+    def _make_set_move_dist(self, axis, name):
+        '''
+        Sets the axis move distance from the spin button.
+        '''
+        return self._make_setter(name, axis.id + "_Move_Dist", None)
+
+    def _make_setter(self, name, attr, digits):
+        handler = self.handler
+
+        def callback(widget):
+            print("=================================================")
+            print("FUNCTION " + name)
+
+            value = widget.get_value()
+            if digits is not None:
+                value = round(value, digits)
+            setattr(handler, attr, value)
+
+            print(attr + " = " + str(value))
+        return callback
+
+    def _make_set_scale(self, axis, name):
+        '''
+        Disables the axis and writes the spin button's value to its
+        stepgen position-scale parameter.
+        '''
+        def callback(widget):
+            print("=================================================")
+            print("FUNCTION " + name)
+
+            scale = round(widget.get_value(), 1)
+            if self._batch is not None:
+                self._batch[axis.id] = scale
+                return
+            self.apply_scale(axis.id, scale)
+        return callback
+
+    @contextlib.contextmanager
+    def batch(self):
+        '''
+        Collects the scales set inside the with block - by the
+        Set_Scale callbacks, or added to the dict it yields - and
+        applies them together with apply_scales() at the end.
+        '''
+        self._batch = {}
+        try:
+            yield self._batch
+        finally:
+            scales, self._batch = self._batch, None
+        self.apply_scales(scales)
+
+    def apply_scales(self, scales):
+        '''
+        Applies {axis id: scale} in one REB_Hal.set_values() call.
+        Only the scales that differ from the ones last saved are
+        written; those axes are forced disabled first (as in
+        apply_scale()). Returns {axis id: True/False} of the scales
+        written.
+        '''
+        saved = {}
+        if self.settings is not None:
+            saved = self.settings.settings.values("scale")
+
+        params = {}
+        for axis_id, scale in scales.items():
+            if saved.get(axis_id) == scale:
+                continue
+            print(axis_id + " scale " + str(saved.get(axis_id)) + " -> "
+                  + str(scale) + " - disabling")
+            self.handler.halcomp[axis_id + '_Ena_Override'] = False
+            hal_pin = REB_Hal.stepgen_scale_param(self.axes[axis_id].stepgen)
+            params[hal_pin] = (axis_id, scale)
+        if not params:
+            return {}
+
+        results = REB_Hal.set_values(
+            {hal_pin: scale for hal_pin, (axis_id, scale) in params.items()})
+
+        applied = {}
+        for hal_pin, (axis_id, scale) in params.items():
+            applied[axis_id] = bool(results.get(hal_pin))
+            if not applied[axis_id]:
+                print("Error setting " + hal_pin)
+                continue
+            print("Set " + hal_pin + " = " + str(scale))
+            if self.settings is not None:
+                self.settings.record(axis_id, "scale", scale)
+        return applied
+
+    def apply_scale(self, axis_id, scale):
+        '''
+        Forces the axis disabled, then writes the new scale to its
+        stepgen position-scale parameter and records it for saving to
+        the settings file.
+
+        <axis>_ENA_Status belongs to the main panel's HAL component
+        ("gladevcp"); read it cross-component through REB_Hal. To
+        disable the axis, drive this component's own
+        <axis>_Ena_Override pin (ANDed with the panel button in
+        REB_PostGUI.hal) instead of trying to write another
+        component's pin directly.
+        '''
+        status_pin = "gladevcp." + axis_id + "_ENA_Status"
+        is_enabled = REB_Hal.get_value(status_pin)
+
+        if is_enabled is not None:
+            print(status_pin + " = " + str(is_enabled))
+            if is_enabled:
+                print(axis_id + " axis is enabled - disabling")
+                self.handler.halcomp[axis_id + '_Ena_Override'] = False
+            else:
+                print(axis_id + " axis is already disabled")
+
+        # Send the new scale to the axis's stepgen.
+        hal_pin = REB_Hal.stepgen_scale_param(self.axes[axis_id].stepgen)
+        if REB_Hal.set_value(hal_pin, scale):
+            print("Set " + hal_pin + " = " + str(scale))
+            # Saved in the background (REB_Settings.SettingsWriter).
+            if self.settings is not None:
+                self.settings.record(axis_id, "scale", scale)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+REB_Boot.py
+
+Boot-to-ready profiling and embedded tab launching for the Rose Engine
+Butler GUI stack.
+
+LinuxCNC brings the REB GUI up as a chain: the GUI ([DISPLAY]DISPLAY)
+shows its INTRO_GRAPHIC splash for INTRO_TIME seconds, the GLADEVCP
+main panel ("gladevcp") loads, the EMBED_TAB_COMMAND tabs (REBHlp,
+REBCnfg, REBUsg) load, and REB_PostGUI.hal nets their pins.
+REB_Startup.py records when each gladevcp component came up; this
+script records the rest and reads the timeline back:
+
+    tab <component> <ui file> <xid>
+        EMBED_TAB_COMMAND launcher for one tab. Loads the tab's
+        .cached.ui (see REB_Images.py) when it is up to date; a tab
+        in [DISPLAY]REB_LAZY_TABS starts on a placeholder and builds
+        its .ui when first shown (see REB_Lazy.py). With
+        [DISPLAY]REB_TAB_LAUNCH = wait (the default) it runs
+        "halcmd loadusr -Wn <component> gladevcp ...", so the GUI
+        waits for each tab's component to be ready. With concurrent,
+        it starts gladevcp directly: the tabs load alongside each
+        other and the GUI, and REB_PostGUI.hal waits for all of them
+        at once (see wait) before netting their pins.
+    wait <component> ...
+        Blocks until every component is ready in HAL, or until
+        WAIT_TIMEOUT. Run first thing in REB_PostGUI.hal.
+    mark <component> <stage>
+        Adds one event to the timeline.
+    report [--ini <file>] [timeline file]
+        Prints the most recent boot's timeline: every stage against
+        the GUI start, the stage that took longest and whether the
+        tabs loaded one after another or together.
+
+The timeline is only written when [DISPLAY]REB_STARTUP_TIMELINE is set.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import REB_Images
+import REB_Startup
+
+HANDLER_FILE = os.path.join(os.path.dirname(__file__), "hitcounter.py")
+
+# The main panel's component; every other gladevcp component is a tab.
+PANEL = "gladevcp"
+
+# How long "wait" waits for the tab components, and how often it looks.
+WAIT_TIMEOUT = 30.0
+WAIT_POLL = 0.05
+
+# Two tabs count as loading together if one started this long (in
+# seconds) before the other was ready.
+OVERLAP = 0.05
+
+
+def launch_tab(component, ui_file, xid):
+    '''
+    Replaces this process with the tab's gladevcp (or the halcmd that
+    waits for it), so the GUI keeps track of it as its own child.
+    '''
+    REB_Startup.timeline_event(component, "launch")
+    ui_file = REB_Images.cached_ui(ui_file)
+    gladevcp = ["gladevcp", "-c", component, "-u", HANDLER_FILE, "-x", xid]
+
+    lazy = (REB_Startup.ini_value("DISPLAY", "REB_LAZY_TABS") or "").split()
+    if component in lazy:
+        import REB_Lazy
+        gladevcp += ["-U", REB_Lazy.USEROPT + os.path.abspath(ui_file),
+                     REB_Lazy.PLACEHOLDER_UI]
+    else:
+        gladevcp.append(ui_file)
+
+    mode = REB_Startup.ini_value("DISPLAY", "REB_TAB_LAUNCH") or "wait"
+    if mode == "concurrent":
+        os.execvp("gladevcp", gladevcp)
+    if mode != "wait":
+        print("Unknown [DISPLAY]REB_TAB_LAUNCH " + mode + " - using wait")
+    os.execvp("halcmd", ["halcmd", "loadusr", "-Wn", component] + gladevcp)
+
+
+def wait_ready(components):
+    '''
+    Waits until every component exists and is ready in HAL. Returns
+    the ones that were not ready by WAIT_TIMEOUT.
+    '''
+    import hal
+
+    REB_Startup.timeline_event("postgui", "wait_start")
+    waiting = list(components)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while waiting and time.monotonic() < deadline:
+        waiting = [name for name in waiting
+                   if not (hal.component_exists(name)
+                           and hal.component_is_ready(name))]
+        if waiting:
+            time.sleep(WAIT_POLL)
+    REB_Startup.timeline_event("postgui", "wait_end")
+
+    for name in waiting:
+        print("Component " + name + " not ready after "
+              + str(WAIT_TIMEOUT) + " s")
+    return waiting
+
+
+def read_timeline(path):
+    '''
+    {boot key: {component: {stage: time}}} from a timeline file, plus
+    the boot keys in the order they first appear.
+    '''
+    boots = {}
+    order = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) != 4:
+                continue
+            key, component, stage, when = fields
+            if key not in boots:
+                boots[key] = {}
+                order.append(key)
+            boots[key].setdefault(component, {})[stage] = float(when)
+    return boots, order
+
+
+# One line of the report's component table. "init" is the time spent in
+# get_handlers(), "show" the time from there until the GTK loop is idle.
+ROW = "%-10s" + " %6s" * 7
+
+
+def _fmt(value):
+    return "     -" if value is None else "%6.2f" % value
+
+
+def _span(stages, start, end):
+    if start in stages and end in stages:
+        return stages[end] - stages[start]
+    return None
+
+
+def report(boot, key, intro_time):
+    '''
+    The timeline report lines of one boot.
+    '''
+    if key != "-":
+        t0 = float(key)
+    else:
+        t0 = min(min(stages.values()) for stages in boot.values())
+
+    lines = [
+        "REB boot " + time.strftime("%Y-%m-%d %H:%M:%S",
+                                    time.localtime(t0))
+        + " (seconds from GUI start)",
+        ROW % ("component", "start", "launch", "python", "import",
+               "init", "show", "ready"),
+    ]
+
+    # (duration, description) of every stage, to find the longest.
+    durations = []
+    if intro_time:
+        durations.append((intro_time, "GUI splash (INTRO_TIME)"))
+        lines.append("%-10s %s -> %.2f" % ("splash", _fmt(0.0), intro_time))
+
+    components = [name for name in boot if name != "postgui"]
+    components.sort(key=lambda name: min(boot[name].values()))
+    spans = {}
+    for name in components:
+        stages = boot[name]
+        start = stages.get("launch", stages.get("process_start"))
+        parts = [
+            ("launch", _span(stages, "launch", "process_start")),
+            ("python", _span(stages, "process_start", "import_start")),
+            ("import", _span(stages, "import_start", "imported")),
+            ("init", _span(stages, "imported", "handlers")),
+            ("show", _span(stages, "handlers", "ready")),
+        ]
+        ready = stages.get("ready")
+        lines.append(ROW % (
+            (name, _fmt(start - t0 if start is not None else None))
+            + tuple(_fmt(span) for stage, span in parts)
+            + (_fmt(ready - t0 if ready is not None else None),)))
+        for stage, span in parts:
+            if span is not None:
+                durations.append((span, name + " " + stage))
+        if start is not None and ready is not None:
+            spans[name] = (start, ready)
+
+    # Deferred tabs (REB_Lazy.py) record when they were built, which
+    # should be when they were first opened rather than at boot.
+    for name in components:
+        built = boot[name].get("built")
+        if built is not None:
+            lines.append("%-10s built %s (first shown)"
+                         % (name, _fmt(built - t0).strip()))
+
+    postgui = boot.get("postgui", {})
+    if postgui:
+        wait = _span(postgui, "wait_start", "wait_end")
+        nets = _span(postgui, "wait_end", "done")
+        first = postgui.get("wait_start", postgui.get("done"))
+        last = postgui.get("done", postgui.get("wait_end"))
+        lines.append("%-10s %s   wait %s   nets %s   done %s" % (
+            "postgui", _fmt(first - t0), _fmt(wait).strip(),
+            _fmt(nets).strip(), _fmt(last - t0).strip()))
+        if wait is not None:
+            durations.append((wait, "REB_PostGUI.hal waiting for tabs"))
+        if nets is not None:
+            durations.append((nets, "REB_PostGUI.hal nets"))
+
+    if durations:
+        longest = max(durations)
+        lines.append("Longest stage: %s (%.2f s)" % (longest[1], longest[0]))
+
+    tabs = sorted((spans[name][0], spans[name][1], name)
+                  for name in spans if name != PANEL)
+    if len(tabs) > 1:
+        serial = all(later[0] >= earlier[1] - OVERLAP
+                     for earlier, later in zip(tabs, tabs[1:]))
+        names = ", ".join(name for start, ready, name in tabs)
+        wall = max(ready for start, ready, name in tabs) - tabs[0][0]
+        slowest = max(ready - start for start, ready, name in tabs)
+        if serial:
+            lines.append("Tabs %s loaded one after another in %.2f s. They"
+                         " are independent (only REB_PostGUI.hal nets their"
+                         " pins); loaded together they would take about"
+                         " %.2f s (REB_TAB_LAUNCH = concurrent)."
+                         % (names, wall, slowest))
+        else:
+            lines.append("Tabs %s loaded together in %.2f s (slowest tab"
+                         " %.2f s)." % (names, wall, slowest))
+
+    readies = [stages[stage] for stages in boot.values()
+               for stage in ("ready", "done") if stage in stages]
+    if readies:
+        lines.append("Ready %.2f s after GUI start." % (max(readies) - t0))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tab = commands.add_parser("tab")
+    tab.add_argument("component")
+    tab.add_argument("ui_file")
+    tab.add_argument("xid")
+
+    wait = commands.add_parser("wait")
+    wait.add_argument("components", nargs="+", metavar="component")
+
+    mark = commands.add_parser("mark")
+    mark.add_argument("component")
+    mark.add_argument("stage")
+
+    show = commands.add_parser("report")
+    show.add_argument("timeline", nargs="?")
+    show.add_argument("--ini")
+
+    args = parser.parse_args()
+
+    if args.command == "tab":
+        launch_tab(args.component, args.ui_file, args.xid)
+    elif args.command == "wait":
+        wait_ready(args.components)
+    elif args.command == "mark":
+        REB_Startup.timeline_event(args.component, args.stage)
+    else:
+        if args.ini:
+            os.environ["INI_FILE_NAME"] = os.path.abspath(args.ini)
+        path = args.timeline or REB_Startup.ini_path("REB_STARTUP_TIMELINE")
+        if path is None:
+            parser.error("no timeline file given or set in the INI file")
+        boots, order = read_timeline(path)
+        if not order:
+            sys.exit("No boots recorded in " + path)
+        intro = REB_Startup.ini_value("DISPLAY", "INTRO_TIME")
+        for line in report(boots[order[-1]], order[-1],
+                           float(intro) if intro else None):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
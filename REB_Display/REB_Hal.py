@@ -0,0 +1,265 @@
+"""
+REB_Hal.py
+
+Shared HAL pin / parameter access for the Rose Engine Butler GladeVCP
+handlers (hitcounter.py) and helper scripts.
+
+Reads and writes go in-process through the LinuxCNC "hal" Python
+bindings whenever the calling process is attached to HAL - every
+gladevcp component is, as soon as its halcomp has been created. Only
+when the bindings are missing, or cannot reach a given pin or
+parameter, does a call fall back to forking "halcmd getp" /
+"halcmd setp".
+
+Stepgen channels are named with a str.format() template taking the
+channel number: hm2_7i92.0.stepgen.{:02d} for the Mesa card, or
+[HAL]REB_STEPGEN from the INI file LinuxCNC was started with
+(REB_Sim.ini uses the software stepgen's stepgen.{:d}).
+"""
+
+import os
+import subprocess
+import time
+
+import REB_Timing
+
+try:
+    import hal
+except ImportError:
+    hal = None
+
+HALCMD_MISSING = "halcmd not found - is the LinuxCNC environment sourced?"
+
+# Everything the bindings raise when a name can't be reached: hal.error
+# (a RuntimeError subclass) for unknown names or a process that isn't
+# attached to HAL, AttributeError on LinuxCNC versions whose bindings
+# predate get_value()/set_p(), and TypeError/ValueError for values the
+# bindings refuse to convert.
+_HAL_ERRORS = (RuntimeError, AttributeError, TypeError, ValueError)
+
+DEFAULT_STEPGEN = "hm2_7i92.0.stepgen.{:02d}"
+
+
+def _stepgen_template():
+    path = os.environ.get("INI_FILE_NAME")
+    if not path:
+        return DEFAULT_STEPGEN
+    try:
+        import linuxcnc
+        template = linuxcnc.ini(path).find("HAL", "REB_STEPGEN")
+    except Exception:
+        return DEFAULT_STEPGEN
+    return template or DEFAULT_STEPGEN
+
+STEPGEN = _stepgen_template()
+
+
+def stepgen_prefix():
+    '''
+    The part of every stepgen channel's HAL name before the channel
+    number ("hm2_7i92.0.stepgen." for the Mesa card).
+    '''
+    return STEPGEN.split("{")[0]
+
+
+def stepgen_scale_param(stepgen_ch):
+    '''
+    Name of the position-scale parameter of a stepgen channel
+    ("04" -> hm2_7i92.0.stepgen.04.position-scale on the Mesa card).
+    '''
+    return STEPGEN.format(int(stepgen_ch)) + ".position-scale"
+
+
+def parse_value(text):
+    '''
+    Converts halcmd's textual output for a pin, parameter or signal
+    into the same Python types the bindings return.
+    '''
+    text = text.strip()
+    if text.upper() == "TRUE":
+        return True
+    if text.upper() == "FALSE":
+        return False
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def format_value(value):
+    '''
+    Formats a value the way halcmd expects it on a setp line.
+    '''
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        return format(value, ".10g")
+    return str(value)
+
+
+def _halcmd(*args, **kwargs):
+    started = time.monotonic()
+    try:
+        return subprocess.run(["halcmd"] + list(args), capture_output=True,
+                              text=True, **kwargs)
+    finally:
+        REB_Timing.record(REB_Timing.current(), "halcmd",
+                          time.monotonic() - started)
+
+
+def get_value(name):
+    '''
+    Returns the current value of a HAL pin, parameter or signal, or
+    None (after printing why) if it could not be read.
+    '''
+    if hal is not None:
+        try:
+            return hal.get_value(name)
+        except _HAL_ERRORS:
+            pass
+
+    try:
+        result = _halcmd("getp", name, check=True)
+    except subprocess.CalledProcessError as e:
+        print("Error reading " + name + ": " + e.stderr)
+        return None
+    except FileNotFoundError:
+        print(HALCMD_MISSING)
+        return None
+
+    return parse_value(result.stdout)
+
+
+def set_value(name, value):
+    '''
+    Sets a HAL pin or parameter. Returns True on success, False (after
+    printing why) otherwise.
+    '''
+    text = format_value(value)
+
+    if hal is not None:
+        try:
+            hal.set_p(name, text)
+            return True
+        except _HAL_ERRORS:
+            pass
+
+    try:
+        _halcmd("setp", name, text, check=True)
+    except subprocess.CalledProcessError as e:
+        print("Error setting " + name + ": " + e.stderr)
+        return False
+    except FileNotFoundError:
+        print(HALCMD_MISSING)
+        return False
+
+    return True
+
+
+def net(signal, pin):
+    '''
+    Connects a pin to a signal, creating the signal if needed. Returns
+    True on success, False (after printing why) otherwise.
+    '''
+    if hal is not None:
+        try:
+            hal.connect(pin, signal)
+            return True
+        except _HAL_ERRORS:
+            pass
+
+    try:
+        _halcmd("net", signal, pin, check=True)
+    except subprocess.CalledProcessError as e:
+        print("Error connecting " + pin + " to " + signal + ": " + e.stderr)
+        return False
+    except FileNotFoundError:
+        print(HALCMD_MISSING)
+        return False
+    return True
+
+
+def set_values(values):
+    '''
+    Sets several HAL pins / parameters as one transaction.
+
+    values maps name -> value. Every name the bindings can reach is
+    written in-process; whatever is left over goes to a single
+    "halcmd -k -f" session fed on stdin, so the whole batch costs at
+    most one process launch.
+
+    Returns a dict mapping each name to True (set) or False (failed).
+    '''
+    results = {}
+    pending = []
+
+    for name, value in values.items():
+        text = format_value(value)
+        if hal is not None:
+            try:
+                hal.set_p(name, text)
+                results[name] = True
+                continue
+            except _HAL_ERRORS:
+                pass
+        pending.append((name, text))
+
+    if not pending:
+        return results
+
+    script = "".join("setp " + name + " " + text + "\n"
+                     for name, text in pending)
+    try:
+        result = _halcmd("-k", "-f", input=script)
+    except FileNotFoundError:
+        print(HALCMD_MISSING)
+        for name, text in pending:
+            results[name] = False
+        return results
+
+    # halcmd reports each failing line of the stream as
+    # "<file>:<line>: <message>". If it failed without saying which
+    # line, treat the whole batch as failed rather than guess.
+    failed_lines = set()
+    if result.returncode != 0:
+        import re
+        for line in result.stderr.splitlines():
+            match = re.search(r':(\d+):', line)
+            if match:
+                failed_lines.add(int(match.group(1)))
+        if not failed_lines:
+            failed_lines = set(range(1, len(pending) + 1))
+        print("Error setting HAL values: " + result.stderr)
+
+    for lineno, (name, text) in enumerate(pending, start=1):
+        results[name] = lineno not in failed_lines
+
+    return results
+
+
+def show_params(prefix):
+    '''
+    Snapshots every HAL parameter whose name starts with prefix using
+    a single "halcmd -s show param" dump.
+
+    Returns a dict mapping parameter name -> value, or None (after
+    printing why) if halcmd could not be run.
+    '''
+    try:
+        result = _halcmd("-s", "show", "param", prefix, check=True)
+    except subprocess.CalledProcessError as e:
+        print("Error reading parameters " + prefix + "*: " + e.stderr)
+        return None
+    except FileNotFoundError:
+        print(HALCMD_MISSING)
+        return None
+
+    # Script-mode rows are "<owner> <type> <dir> <value> <name>".
+    values = {}
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) < 5 or not fields[-1].startswith(prefix):
+            continue
+        values[fields[-1]] = parse_value(fields[-2])
+
+    return values
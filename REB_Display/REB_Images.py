@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+REB_Images.py
+
+Pre-decoded image cache for the Rose Engine Butler tab .ui files.
+
+Every GtkImage in the tab .ui files names a PNG in REB_Display/Images
+through its "pixbuf" property, and GtkBuilder inflates each of them
+every time a component starts. None of the .ui files scales them, so
+the cache holds each image at its own full size; the saving is the
+PNG decode, not any resizing:
+
+    build
+        For each .ui file in UI_FILES, decodes its images once and
+        stores their pixels, zlib-compressed, in CACHE_FILE, keyed by
+        the sha256 of the PNG they came from, and writes
+        <name>.cached.ui next to it: the same .ui without the "pixbuf"
+        properties that were cached. REB.hal runs it before any GUI
+        loads, but it returns straight away unless a .ui file or one
+        of the cached PNGs has changed since the last build
+        (up_to_date()), so a normal start only reads the cache's index.
+        Images that are already cached and unchanged are not decoded
+        again.
+
+    load(builder)
+        Called from HandlerClass.__init__: fills every GtkImage of the
+        loaded .cached.ui straight from the cache. An image whose PNG
+        has changed since the cache was built is decoded from the PNG
+        instead, so a stale cache only costs time.
+
+REB_Boot.py loads a tab's .cached.ui only when it is newer than the
+.ui (cached_ui()), and the tracked .ui otherwise; load() then has
+nothing to do. The main panel is not cached: GLADEVCP names a fixed
+file with no such fallback, so it loads the tracked REB_Panel_v2.ui,
+whose images are small icons.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import zlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+UI_FILES = ("REB_Tab_Help_v2.ui", "REB_Tab_Settings_v1.ui",
+            "REB_Tab_TsCs_v1.ui")
+
+CACHE_FILE = os.path.join(HERE, "Images", "REB_Images.cache")
+MAGIC = b"REBIMG2\n"
+
+# Suffix of the .ui files the build step writes.
+CACHED_UI = ".cached.ui"
+
+
+def cached_ui(ui_file):
+    '''
+    The .cached.ui of ui_file if the build step has written one since
+    ui_file last changed, otherwise ui_file itself.
+    '''
+    cached = ui_file[:-len(".ui")] + CACHED_UI
+    try:
+        if os.path.getmtime(cached) >= os.path.getmtime(ui_file):
+            return cached
+    except OSError:
+        pass
+    return ui_file
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _stamp(path):
+    '''
+    (size, mtime) of a source PNG, to skip re-hashing it when unchanged.
+    '''
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def read_index(path=CACHE_FILE):
+    '''
+    The cache's index, or None if there is no usable cache:
+
+        {"images": {sha256: {"source", "stamp", "width", "height",
+                             "rowstride", "alpha", "offset", "length"}},
+         "widgets": {widget id: sha256}}
+
+    offset is where the image's compressed pixels start in the cache
+    file and length how many bytes they take.
+    '''
+    try:
+        with open(path, "rb") as f:
+            if f.readline() != MAGIC:
+                return None
+            index = json.loads(f.readline().decode())
+            index["base"] = f.tell()
+            return index
+    except (OSError, ValueError):
+        return None
+
+
+def _source_hash(entry, source):
+    '''
+    sha256 of a source PNG, re-hashed only if it changed on disk since
+    the cache entry was written.
+    '''
+    if entry is not None and entry["stamp"] == _stamp(source):
+        return entry["source_sha256"]
+    return _sha256(source)
+
+
+def up_to_date(ui_files=UI_FILES, path=CACHE_FILE):
+    '''
+    True if build() has nothing to do: every .cached.ui is at least as
+    new as its .ui and every cached PNG is unchanged on disk. Only
+    stat()s the files and reads the cache's index.
+    '''
+    index = read_index(path)
+    if index is None:
+        return False
+    try:
+        for ui_file in ui_files:
+            ui_path = os.path.join(HERE, ui_file)
+            if cached_ui(ui_path) == ui_path:
+                return False
+        for entry in index["images"].values():
+            if _stamp(os.path.join(HERE, entry["source"])) != entry["stamp"]:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def ui_images(ui_path):
+    '''
+    (GtkImage element, image path relative to the .ui) of every image a
+    .ui file sets through its "pixbuf" property, and the parsed tree.
+    '''
+    import xml.etree.ElementTree as ET
+
+    tree = ET.parse(ui_path)
+    images = []
+    for obj in tree.iter("object"):
+        if obj.get("class") != "GtkImage":
+            continue
+        for prop in obj.findall("property"):
+            if prop.get("name") == "pixbuf" and prop.text:
+                images.append((obj, prop.text.strip()))
+    return images, tree
+
+
+def build(ui_files=UI_FILES, path=CACHE_FILE):
+    '''
+    Brings the cache and the .cached.ui files up to date. Returns the
+    number of images decoded.
+    '''
+    old = read_index(path) or {"images": {}, "widgets": {}, "base": 0}
+    by_source = {entry["source"]: entry for entry in old["images"].values()}
+
+    # Work out what every image should be cached as.
+    wanted = {}         # sha256 -> source path (relative to HERE)
+    widgets = {}
+    trees = []
+    for ui_file in ui_files:
+        ui_path = os.path.join(HERE, ui_file)
+        images, tree = ui_images(ui_path)
+        stem = ui_file[:-len(".ui")]
+        for n, (obj, source) in enumerate(images):
+            full = os.path.normpath(os.path.join(HERE, source))
+            if not os.path.exists(full):
+                print("REB_Images: " + ui_file + ": no " + source)
+                continue
+            rel = os.path.relpath(full, HERE)
+            digest = _source_hash(by_source.get(rel), full)
+            # Images nested in a container have no id; give them one so
+            # load() can find them.
+            if obj.get("id") is None:
+                obj.set("id", stem + "_Image_" + str(n))
+            wanted[digest] = rel
+            widgets[obj.get("id")] = digest
+        trees.append((stem, images, tree))
+
+    # Reuse the pixels that are already cached, decode the rest.
+    blobs = {}
+    decoded = 0
+    if old["images"]:
+        with open(path, "rb") as f:
+            for digest, entry in old["images"].items():
+                if digest in wanted:
+                    f.seek(old["base"] + entry["offset"])
+                    blobs[digest] = (entry, f.read(entry["length"]))
+    for digest, rel in wanted.items():
+        if digest not in blobs:
+            try:
+                blobs[digest] = _decode(os.path.join(HERE, rel))
+            except Exception as e:
+                print("REB_Images: could not decode " + rel + ": " + str(e))
+                continue
+            decoded += 1
+
+    images = _layout(blobs, wanted)
+    if images != old["images"] or widgets != old["widgets"]:
+        _write_cache(path, images, blobs, widgets)
+
+    # Strip only the images that made it into the cache.
+    for stem, found, tree in trees:
+        for obj, source in found:
+            if widgets.get(obj.get("id")) in blobs:
+                for prop in obj.findall("property"):
+                    if prop.get("name") == "pixbuf":
+                        obj.remove(prop)
+        tree.write(os.path.join(HERE, stem + CACHED_UI),
+                   encoding="UTF-8", xml_declaration=True)
+    return decoded
+
+
+def _decode(source):
+    '''
+    ({"width", "height", "rowstride", "alpha"}, compressed pixels) of
+    a PNG.
+    '''
+    import gi
+    gi.require_version("GdkPixbuf", "2.0")
+    from gi.repository import GdkPixbuf
+
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file(source)
+    entry = {
+        "width": pixbuf.get_width(),
+        "height": pixbuf.get_height(),
+        "rowstride": pixbuf.get_rowstride(),
+        "alpha": pixbuf.get_has_alpha(),
+    }
+    return entry, zlib.compress(pixbuf.read_pixel_bytes().get_data())
+
+
+def _layout(blobs, wanted):
+    '''
+    The index entries of the images in blobs, laid out back to back.
+    '''
+    images = {}
+    offset = 0
+    for digest in sorted(blobs):
+        entry, pixels = blobs[digest]
+        source = wanted[digest]
+        images[digest] = {
+            "source": source,
+            "source_sha256": digest,
+            "stamp": _stamp(os.path.join(HERE, source)),
+            "width": entry["width"],
+            "height": entry["height"],
+            "rowstride": entry["rowstride"],
+            "alpha": entry["alpha"],
+            "offset": offset,
+            "length": len(pixels),
+        }
+        offset += len(pixels)
+    return images
+
+
+def _write_cache(path, images, blobs, widgets):
+    index = json.dumps({"images": images, "widgets": widgets})
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(index.encode() + b"\n")
+        for digest in images:
+            f.write(blobs[digest][1])
+    os.replace(tmp, path)
+
+
+def load(builder, path=CACHE_FILE):
+    '''
+    Sets every GtkImage in builder that the cache has an image for and
+    that has no pixbuf yet (it came from a .cached.ui). Returns the
+    number of images set.
+    '''
+    index = read_index(path)
+    if index is None:
+        return 0
+
+    todo = []
+    for widget_id, digest in index["widgets"].items():
+        image = builder.get_object(widget_id)
+        if hasattr(image, "get_pixbuf") and image.get_pixbuf() is None:
+            todo.append((image, index["images"].get(digest)))
+    if not todo:
+        return 0
+
+    from gi.repository import GdkPixbuf, GLib
+
+    with open(path, "rb") as f:
+        for image, entry in todo:
+            if entry is None:
+                continue
+            source = os.path.join(HERE, entry["source"])
+            try:
+                current = _source_hash(entry, source)
+            except OSError:
+                continue
+            if current != entry["source_sha256"]:
+                # The PNG changed since the last build.
+                image.set_from_pixbuf(
+                    GdkPixbuf.Pixbuf.new_from_file(source))
+                continue
+            f.seek(index["base"] + entry["offset"])
+            pixels = GLib.Bytes.new(zlib.decompress(f.read(entry["length"])))
+            image.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_bytes(
+                pixels, GdkPixbuf.Colorspace.RGB, entry["alpha"], 8,
+                entry["width"], entry["height"], entry["rowstride"]))
+    return len(todo)
+
+
+def main():
+    if sys.argv[1:] != ["build"]:
+        sys.exit("usage: REB_Images.py build")
+    if up_to_date():
+        print("REB_Images: " + os.path.relpath(CACHE_FILE) + " is up to date")
+        return
+    decoded = build()
+    print("REB_Images: " + str(decoded) + " image(s) decoded into "
+          + os.path.relpath(CACHE_FILE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+REB_Journal.py
+
+Append-only journal of the index moves made from the Rose Engine
+Butler panel, so the index counters (B_Idx_Qty, Sp0_Idx_Qty, ...)
+survive a restart of the panel or of LinuxCNC part way through a job.
+
+Every completed index appends one line to [DISPLAY]REB_INDEX_JOURNAL
+(relative to the INI file's directory):
+
+    <time> <axis> <direction> <distance> <count> <position>
+
+direction is +1 or -1, distance the index distance moved, count the
+axis's index counter after the move and position the commanded
+position it ended at (the B axis position, or the orient angle of a
+spindle). Lines are written straight away but fsynced at most every
+SYNC_INTERVAL seconds, so a long repeat costs one fsync per interval
+rather than one per index; after a power cut, at most that much is
+lost, and a half-written last line is skipped on reading.
+
+Resetting a counter from the panel appends a reset line, fsynced
+straight away:
+
+    <time> <axis> reset 0 0 0
+
+counters() rebuilds the counters from the journal: the last count
+recorded for each axis, or 0 if that axis was last reset. When the
+journal has grown past COMPACT_LINES it is compacted, atomically, to
+the last line of each axis, so a reset survives compaction.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+import REB_Settings
+import REB_Startup
+
+# Longest a written line waits to be fsynced, in seconds.
+SYNC_INTERVAL = 1.0
+
+# Lines the journal may grow to before counters() compacts it.
+COMPACT_LINES = 5000
+
+# direction field of a reset line.
+RESET = "reset"
+
+
+def journal_path():
+    '''
+    The journal file, or None if [DISPLAY]REB_INDEX_JOURNAL is not set.
+    '''
+    return REB_Startup.ini_path("REB_INDEX_JOURNAL")
+
+
+def parse_line(line):
+    '''
+    (time, axis, direction, distance, count, position) of a journal
+    line, or None if it is not a complete, valid line. direction is
+    RESET, and count 0, for a reset line.
+    '''
+    fields = line.split()
+    if len(fields) != 6 or not line.endswith("\n"):
+        return None
+    try:
+        if fields[2] == RESET:
+            return (float(fields[0]), fields[1], RESET, 0.0, 0, 0.0)
+        return (float(fields[0]), fields[1], int(fields[2]),
+                float(fields[3]), int(fields[4]), float(fields[5]))
+    except ValueError:
+        return None
+
+
+class Journal:
+    '''
+    The index journal of one panel.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        self._sync = None       # threading.Timer of the pending fsync
+        atexit.register(self.close)
+
+    def counters(self):
+        '''
+        {axis: index count} rebuilt from the journal, compacting it
+        first if it has grown past COMPACT_LINES. An axis whose last
+        line is a reset counts 0.
+        '''
+        last = {}
+        lines = 0
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    event = parse_line(line)
+                    if event is not None:
+                        last[event[1]] = line
+                        lines += 1
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            print("Could not read " + self.path + ": " + str(e))
+            return {}
+
+        if lines > COMPACT_LINES:
+            self.compact(last.values())
+        return {axis: parse_line(line)[4] for axis, line in last.items()}
+
+    def compact(self, lines):
+        '''
+        Replaces the journal with lines (the last line of each axis).
+        '''
+        with self._lock:
+            self._close()
+            try:
+                REB_Settings.write_atomic(self.path, "".join(lines),
+                                          backups=1)
+                print("Compacted " + self.path)
+            except REB_Settings.SettingsError as e:
+                print(str(e))
+
+    def append(self, axis, direction, distance, count, position):
+        '''
+        Appends one index event and schedules an fsync.
+        '''
+        line = "%.3f %s %+d %s %d %s\n" % (
+            time.time(), axis, direction, repr(float(distance)), count,
+            repr(float(position)))
+        with self._lock:
+            if not self._write(line):
+                return
+            if self._sync is None:
+                self._sync = threading.Timer(SYNC_INTERVAL, self.sync)
+                self._sync.daemon = True
+                self._sync.start()
+
+    def reset(self, axis):
+        '''
+        Appends a reset of axis's counter to 0 and fsyncs it right away.
+        Returns False if it could not be written.
+        '''
+        line = "%.3f %s %s 0 0 0\n" % (time.time(), axis, RESET)
+        with self._lock:
+            if not self._write(line):
+                return False
+            try:
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                print("Could not sync " + self.path + ": " + str(e))
+                return False
+        return True
+
+    def _write(self, line):
+        try:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line)
+            self._file.flush()
+        except OSError as e:
+            print("Could not write " + self.path + ": " + str(e))
+            return False
+        return True
+
+    def _open(self):
+        f = open(self.path, "a+")
+        # End a line left half-written by a crash, so it can't run
+        # into the next one. The last byte is read with pread, by its
+        # byte offset, rather than seeking the text file.
+        size = os.fstat(f.fileno()).st_size
+        if size > 0 and os.pread(f.fileno(), 1, size - 1) != b"\n":
+            f.write("\n")
+        return f
+
+    def sync(self):
+        '''
+        fsyncs everything appended so far.
+        '''
+        with self._lock:
+            self._sync = None
+            if self._file is not None:
+                try:
+                    os.fsync(self._file.fileno())
+                except OSError as e:
+                    print("Could not sync " + self.path + ": " + str(e))
+
+    def close(self):
+        '''
+        fsyncs and closes the journal; the next append reopens it.
+        '''
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._sync is not None:
+            self._sync.cancel()
+            self._sync = None
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
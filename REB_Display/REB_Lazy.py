@@ -0,0 +1,165 @@
+"""
+REB_Lazy.py
+
+Deferred construction of the rarely opened embedded tabs (Help and
+License) of the Rose Engine Butler GUI.
+
+With [DISPLAY]REB_LAZY_TABS naming a tab's component, REB_Boot.py
+starts that tab's gladevcp on PLACEHOLDER_UI, a single "Loading" label,
+and passes the real .ui along as the user option
+
+    -U REB_LAZY_UI=<real .ui>
+
+HandlerClass.__init__ hands it to LazyTab, which only reads the real
+.ui's HAL widgets so their pins exist before halcomp.ready(). The
+widget tree itself, with its images, is built the first time the tab
+is shown, swapped in for the label and connected to the same
+HandlerClass, so the component's pins and callbacks are the same as if
+it had loaded the real .ui.
+
+"The first time the tab is shown" is the placeholder's first "draw".
+Its "map" is no use: AXIS embeds every tab's plug at startup, which
+maps it while the tab is still hidden. The build is recorded as the
+component's "built" event in the REB_Startup timeline, so "REB_Boot.py
+report" shows whether it happened at boot or when the tab was opened.
+"""
+
+import os
+
+import hal
+
+import REB_Images
+import REB_Startup
+
+PLACEHOLDER_UI = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "REB_Tab_Lazy_v1.ui")
+
+# Box in PLACEHOLDER_UI the real tab's content goes into.
+PLACEHOLDER_BOX = "Lazy_Tab_Box"
+
+USEROPT = "REB_LAZY_UI="
+
+# Pins gladevcp gives each HAL widget class, as (type, direction). Only
+# these widgets can be deferred; a deferred tab with any other HAL
+# widget in it is built at startup instead.
+HAL_PINS = {
+    "HAL_Button": (hal.HAL_BIT, hal.HAL_OUT),
+}
+
+
+def lazy_ui(useropts):
+    '''
+    The real .ui passed with -U REB_LAZY_UI=..., or None.
+    '''
+    for opt in useropts or ():
+        if opt.startswith(USEROPT):
+            return opt[len(USEROPT):]
+    return None
+
+
+def hal_widgets(ui_file):
+    '''
+    (widget id, class) of every gladevcp HAL widget in a .ui file.
+    '''
+    import xml.etree.ElementTree as ET
+
+    return [(obj.get("id"), obj.get("class"))
+            for obj in ET.parse(ui_file).iter("object")
+            if obj.get("class", "").startswith("HAL_")]
+
+
+class _MadePins:
+    '''
+    Stands in for the HAL component when a deferred HAL widget is
+    initialised: hands back the pin created for it at startup instead
+    of creating one after halcomp.ready().
+    '''
+
+    def __init__(self, halcomp, pins):
+        self._halcomp = halcomp
+        self._pins = pins
+
+    def newpin(self, name, pin_type, direction):
+        return self._pins[name]
+
+    def __getattr__(self, name):
+        return getattr(self._halcomp, name)
+
+
+class LazyTab:
+    '''
+    Builds a tab's real .ui into the placeholder the first time the tab
+    is shown.
+    '''
+
+    def __init__(self, handler, ui_file):
+        self.handler = handler
+        self.ui_file = ui_file
+        self.builder = None
+        self.pins = {}
+        self._drawn = None
+
+    def attach(self, builder):
+        '''
+        Creates the real .ui's HAL pins and arranges for it to be built
+        when the placeholder is first drawn. Returns False, building
+        the tab right away, if the .ui has a HAL widget that can't be
+        deferred.
+        '''
+        box = builder.get_object(PLACEHOLDER_BOX)
+        if box is None:
+            print("REB_Lazy: no " + PLACEHOLDER_BOX + " to build "
+                  + self.ui_file + " into")
+            return False
+
+        halcomp = self.handler.halcomp
+        widgets = hal_widgets(self.ui_file)
+        unknown = [cls for name, cls in widgets if cls not in HAL_PINS]
+        if unknown:
+            print("REB_Lazy: " + self.ui_file + " has "
+                  + ", ".join(sorted(set(unknown))) + " - building it now")
+            self._build(box, halcomp)
+            return False
+
+        for name, cls in widgets:
+            self.pins[name] = halcomp.newpin(name, *HAL_PINS[cls])
+        self._drawn = box.connect("draw", self._on_draw)
+        return True
+
+    def _on_draw(self, box, cr):
+        from gi.repository import GLib
+
+        box.disconnect(self._drawn)
+        # Swap the widgets once this draw is over, not in the middle
+        # of it; the label is shown until then.
+        GLib.idle_add(self._build_shown, box)
+        return False
+
+    def _build_shown(self, box):
+        halcomp = self.handler.halcomp
+        self._build(box, _MadePins(halcomp, self.pins))
+        REB_Startup.timeline_event(halcomp.getprefix(), "built")
+        return False    # one-shot idle callback
+
+    def _build(self, box, halcomp):
+        from gi.repository import Gtk
+
+        print("REB_Lazy: building " + os.path.basename(self.ui_file))
+        self.builder = Gtk.Builder()
+        self.builder.add_from_file(self.ui_file)
+        REB_Images.load(self.builder)
+
+        for obj in self.builder.get_objects():
+            if hasattr(obj, "hal_init"):
+                obj.hal_init(halcomp, Gtk.Buildable.get_name(obj))
+        self.builder.connect_signals(self.handler)
+
+        # Move the real tab's content out of its own toplevel and into
+        # the placeholder, in place of the label.
+        window = self.builder.get_object("window1")
+        content = window.get_child()
+        window.remove(content)
+        for child in box.get_children():
+            box.remove(child)
+        box.pack_start(content, True, True, 0)
+        content.show()
@@ -0,0 +1,447 @@
+"""
+REB_Mdi.py
+
+Background MDI command executor for the Rose Engine Butler GladeVCP
+handlers (hitcounter.py).
+
+GTK signal handlers must never block, but every motion button used to
+call c.mdi() and then c.wait_complete() inline, freezing the whole
+panel for the length of the move. Handlers now hand their G-code to
+an MdiExecutor instead. Jobs run strictly in the order they were
+submitted (FIFO) on a single worker thread, which switches to MDI
+mode, sends the commands, waits for them to finish and then posts the
+finished job back to the GTK main loop through GLib.idle_add(), where
+the job's on_done callback runs.
+
+Stopping never waits in that queue. MdiExecutor.stop() is a separate
+priority lane: it aborts straight away on its own command channel,
+drops every job still queued, marks the one in flight as aborted and
+measures how long the machine took to halt after the button press.
+
+Both lanes read the machine through a shared REB_Stat.StatCache
+rather than a linuxcnc.stat channel of their own, and the worker
+leaves task mode changes to a ModeManager, which only switches when
+the machine is not already in the mode a job needs.
+
+Controls that fire on every tick of a spin button use
+submit_coalesced() instead of submit(): a burst of changes collapses
+into one trailing job carrying only the latest value, sent once the
+control has been quiet for COALESCE_DELAY seconds.
+
+Work that would otherwise be many MDI round trips (repeated indexing)
+is submitted as one generated program instead: submit_program() runs
+an REB_Program.Program in auto mode on the same worker, in the same
+FIFO order, reporting each completed step as it goes.
+"""
+
+import bisect
+import collections
+import queue
+import threading
+import time
+
+import linuxcnc
+from gi.repository import GLib
+
+import REB_Timing
+
+# How long a single c.wait_complete() call may block before the worker
+# re-checks the job. Moves longer than this are waited out in steps.
+WAIT_STEP = 1.0
+
+# Interval at which the worker polls for the interpreter to go idle
+# once the last command has been accepted.
+IDLE_POLL = 0.02
+
+# The stop lane gives up measuring press-to-halt latency after this
+# many seconds, and keeps this many recent measurements.
+STOP_TIMEOUT = 10.0
+STOP_HISTORY = 50
+
+# Quiet period after the last change before a coalesced job is sent.
+COALESCE_DELAY = 0.25
+
+
+class ModeManager:
+    '''
+    Tracks the task mode (MODE_MANUAL / MODE_AUTO / MODE_MDI) and
+    changes it only when a transition is really needed.
+
+    Status snapshots can be up to one tick old, so right after a switch
+    the manager trusts the mode it set itself until a snapshot taken
+    after the switch says otherwise (e.g. because the mode was changed
+    from the main GUI).
+
+    switches and skips count the transitions issued and avoided.
+    '''
+
+    def __init__(self, command, stats):
+        self._command = command
+        self._stats = stats
+        self._mode = None
+        self._set_at = 0.0
+        self.switches = 0
+        self.skips = 0
+
+    def current(self):
+        '''
+        Best known current task mode.
+        '''
+        snapshot = self._stats.get()
+        if self._mode is not None and snapshot.time <= self._set_at:
+            return self._mode
+        self._mode = snapshot.task_mode
+        return self._mode
+
+    def ensure(self, mode):
+        '''
+        Puts the machine in mode, issuing c.mode() and waiting for it
+        only if it is not in that mode already. Returns False if the
+        mode change failed.
+        '''
+        if self.current() == mode:
+            self.skips += 1
+            return True
+
+        c = self._command
+        c.mode(mode)
+        status = c.wait_complete() # Wait for mode change to complete
+        self.switches += 1
+        if status == linuxcnc.RCS_ERROR or status == -1:
+            self._mode = None
+            return False
+        self._mode = mode
+        self._set_at = time.monotonic()
+        return True
+
+
+class MdiJob:
+    '''
+    One unit of work for the executor: a list of MDI commands that are
+    sent back to back and then waited on as a whole.
+
+    After the job has run, ok is True if every command completed and
+    error holds a short description otherwise.
+    '''
+
+    def __init__(self, commands, on_done=None, label=None):
+        self.commands = list(commands)
+        self.on_done = on_done
+        self.label = label or " / ".join(self.commands)
+        self.generation = 0
+        self.trace = None
+        self.ok = False
+        self.error = None
+
+
+class ProgramJob(MdiJob):
+    '''
+    An MdiJob that runs a generated REB_Program.Program in auto mode
+    instead of sending MDI commands.
+
+    on_progress(job, steps), if given, is called on the GTK main loop
+    with the number of steps newly completed since the last call;
+    completed holds the running total.
+    '''
+
+    def __init__(self, program, on_progress=None, on_done=None, label=None):
+        MdiJob.__init__(self, [], on_done, label or program.lines[1])
+        self.program = program
+        self.on_progress = on_progress
+        self.completed = 0
+
+
+class MdiExecutor:
+    '''
+    Runs MdiJobs in FIFO order on a background thread.
+
+    The executor owns the command channel it is given; nothing else
+    should send commands on it once it has been created. The stop lane
+    opens its own command channel so that an abort never has to wait
+    for the worker. Status comes from stats, a REB_Stat.StatCache that
+    may be shared with other consumers.
+
+    Nothing is connected until the first job or stop: command may be
+    None, in which case the executor opens its own channel then, and
+    the worker thread is only started at that point too.
+    '''
+
+    def __init__(self, command, stats):
+        self._command = command
+        self._stats = stats
+        self._stop_command = None
+        self.modes = None
+        self._queue = queue.Queue()
+
+        # key -> (GLib timeout id, latest commands) for coalesced jobs
+        # that are waiting out their quiet period.
+        self._coalesced = {}
+
+        # Bumped by every stop(); jobs submitted before it are stale.
+        # _lock keeps the worker from sending a stale job's commands
+        # in between stop() bumping the generation and aborting.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        # Press-to-halt times of recent stops, in seconds.
+        self.stop_latencies = collections.deque(maxlen=STOP_HISTORY)
+
+        self._thread = None
+
+    def _open(self):
+        '''
+        Opens the command channels and starts the worker, once.
+        '''
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self._command is None:
+                self._command = linuxcnc.command()
+            self._stop_command = linuxcnc.command()
+            self.modes = ModeManager(self._command, self._stats)
+            self._thread = threading.Thread(
+                target=self._run, name="REB_Mdi", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, commands, on_done=None, label=None):
+        '''
+        Queues a list of MDI commands and returns immediately with the
+        MdiJob. on_done(job), if given, is called on the GTK main loop
+        once the job has finished (successfully or not).
+        '''
+        if self._thread is None:
+            self._open()
+        job = MdiJob(commands, on_done, label)
+        job.generation = self._generation
+        job.trace = REB_Timing.current()
+        self._queue.put(job)
+        return job
+
+    def submit_program(self, program, on_progress=None, on_done=None,
+                       label=None):
+        '''
+        Queues a generated REB_Program.Program to be written out and run
+        in auto mode, and returns the ProgramJob. It waits its turn in
+        the queue like any other job.
+        '''
+        if self._thread is None:
+            self._open()
+        job = ProgramJob(program, on_progress, on_done, label)
+        job.generation = self._generation
+        job.trace = REB_Timing.current()
+        self._queue.put(job)
+        return job
+
+    def submit_coalesced(self, key, commands, delay=COALESCE_DELAY):
+        '''
+        Like submit(), for values that change in rapid bursts (a spin
+        button held down). Calls with the same key replace each other's
+        commands and restart the quiet period; only the latest commands
+        are queued, delay seconds after the last call.
+
+        Must be called from the GTK main loop.
+        '''
+        pending = self._coalesced.get(key)
+        if pending is not None:
+            GLib.source_remove(pending[0])
+        timer = GLib.timeout_add(int(delay * 1000), self._flush_coalesced, key)
+        self._coalesced[key] = (timer, list(commands), REB_Timing.current())
+
+    def _flush_coalesced(self, key):
+        timer, commands, trace = self._coalesced.pop(key)
+        job = self.submit(commands, label=key)
+        job.trace = trace
+        return False    # one-shot timeout
+
+    def stop(self, pressed_at=None, followup=None):
+        '''
+        Priority stop lane. Aborts immediately on the dedicated stop
+        channel, bypassing any queued or in-flight MDI work, and drops
+        every pending job (their on_done callbacks still run, with
+        ok False). followup, if given, is a list of MDI commands queued
+        as the first job after the abort.
+
+        pressed_at is the time.monotonic() of the button press; the
+        time from then until the machine reports it has halted is
+        appended to stop_latencies and printed.
+        '''
+        if pressed_at is None:
+            pressed_at = time.monotonic()
+        if self._thread is None:
+            self._open()
+
+        with self._lock:
+            self._generation += 1
+            self._stop_command.abort()
+
+        dropped = 0
+        for timer, commands, trace in self._coalesced.values():
+            GLib.source_remove(timer)
+            dropped += 1
+        self._coalesced.clear()
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            job.error = "dropped by stop"
+            dropped += 1
+            if job.on_done is not None:
+                GLib.idle_add(self._finish, job)
+        print("Stop: aborted, dropped " + str(dropped) + " queued job(s)")
+
+        threading.Thread(
+            target=self._measure_stop, args=(pressed_at,),
+            name="REB_Mdi_Stop", daemon=True
+        ).start()
+
+        if followup:
+            self.submit(followup, label="stop follow-up")
+
+    def _measure_stop(self, pressed_at):
+        while time.monotonic() - pressed_at < STOP_TIMEOUT:
+            snap = self._stats.poll()
+            spinning = any(speed != 0 for speed in snap.spindle_speeds)
+            if snap.current_vel == 0 and not spinning:
+                latency = time.monotonic() - pressed_at
+                self.stop_latencies.append(latency)
+                print("Stop: halted %.1f ms after press" % (latency * 1000))
+                return
+            time.sleep(IDLE_POLL / 4)
+        print("Stop: machine not halted after " + str(STOP_TIMEOUT) + " s")
+
+    def pending(self):
+        '''
+        Number of jobs waiting to run (not counting the one in flight).
+        '''
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            REB_Timing.mark(job.trace, "queued")
+            try:
+                self._execute(job)
+            except Exception as e:
+                job.ok = False
+                job.error = str(e)
+
+            if not job.ok:
+                print("MDI job not completed: " + job.label + ": "
+                      + str(job.error))
+
+            if job.on_done is not None:
+                GLib.idle_add(self._finish, job)
+
+    def _finish(self, job):
+        job.on_done(job)
+        return False    # one-shot idle callback
+
+    def _execute(self, job):
+        if isinstance(job, ProgramJob):
+            self._execute_program(job)
+            return
+
+        c = self._command
+
+        # Ensure the system is in MDI mode
+        started = time.monotonic()
+        in_mode = self.modes.ensure(linuxcnc.MODE_MDI)
+        REB_Timing.record(job.trace, "mode", time.monotonic() - started)
+        if not in_mode:
+            job.error = "could not switch to MDI mode"
+            return
+
+        with self._lock:
+            if job.generation != self._generation:
+                job.error = "dropped by stop"
+                return
+            for gcode in job.commands:
+                c.mdi(gcode)
+        REB_Timing.mark(job.trace, "mdi")
+
+        # Wait for the commands to complete, a step at a time so that
+        # long moves are not cut short by wait_complete()'s timeout.
+        status = c.wait_complete(WAIT_STEP)
+        while status == -1:
+            status = c.wait_complete(WAIT_STEP)
+        REB_Timing.mark(job.trace, "wait")
+
+        if status == linuxcnc.RCS_ERROR:
+            job.error = "command reported an error"
+            return
+
+        # Then wait for the interpreter to finish the motion itself.
+        while self._stats.poll().interp_state != linuxcnc.INTERP_IDLE:
+            time.sleep(IDLE_POLL)
+
+        if job.generation != self._generation:
+            job.error = "aborted by stop"
+            return
+
+        job.ok = True
+
+    def _execute_program(self, job):
+        c = self._command
+        path = job.program.write()
+        move_lines = job.program.move_lines
+
+        started = time.monotonic()
+        in_mode = self.modes.ensure(linuxcnc.MODE_AUTO)
+        REB_Timing.record(job.trace, "mode", time.monotonic() - started)
+        if not in_mode:
+            job.error = "could not switch to auto mode"
+            return
+
+        with self._lock:
+            if job.generation != self._generation:
+                job.error = "dropped by stop"
+                return
+            c.program_open(path)
+            c.auto(linuxcnc.AUTO_RUN, 0)
+        REB_Timing.mark(job.trace, "mdi")
+
+        status = c.wait_complete(WAIT_STEP)
+        while status == -1:
+            status = c.wait_complete(WAIT_STEP)
+        REB_Timing.mark(job.trace, "wait")
+
+        if status == linuxcnc.RCS_ERROR:
+            job.error = "program could not be started"
+            return
+
+        # A step is complete once the program has moved past its last
+        # line (motion_line for moves, current_line for orients). When
+        # the program runs to its end, the line stops short of the
+        # closing %, so the final step is only counted then.
+        while True:
+            snapshot = self._stats.poll()
+            idle = snapshot.interp_state == linuxcnc.INTERP_IDLE
+            stopped = job.generation != self._generation
+            if idle and not stopped:
+                done = len(move_lines)
+            else:
+                line = getattr(snapshot, job.program.line_field)
+                done = bisect.bisect_left(move_lines, line)
+            if done > job.completed:
+                self._post_progress(job, done - job.completed)
+                job.completed = done
+            if idle:
+                break
+            time.sleep(IDLE_POLL)
+
+        if job.generation != self._generation:
+            job.error = ("aborted by stop after " + str(job.completed)
+                         + " of " + str(len(move_lines)))
+            return
+
+        job.ok = True
+
+    def _post_progress(self, job, steps):
+        if job.on_progress is not None:
+            GLib.idle_add(self._progress, job, steps)
+
+    def _progress(self, job, steps):
+        job.on_progress(job, steps)
+        return False    # one-shot idle callback
@@ -0,0 +1,79 @@
+"""
+REB_Program.py
+
+Generated G-code programs for the Rose Engine Butler GladeVCP handlers
+(hitcounter.py).
+
+Repeated indexing (fluting at 96 divisions, say) used to be one MDI
+command, mode check and wait_complete() per division. Instead the
+handlers can write all N divisions into one unrolled .ngc file under
+[DISPLAY]PROGRAM_PREFIX and have the MDI executor run it in auto mode
+(see MdiExecutor.submit_program()). The file records the line number
+of every index step, so the executor can tell how many divisions have
+been completed while the program runs: from stat.motion_line for axis
+moves, from stat.current_line for spindle orients (M19 runs in task
+and never reaches motion's queue, so motion_line stays put).
+"""
+
+import os
+
+import linuxcnc
+
+REPEAT_FILE = "REB_Repeat.ngc"
+
+
+def program_dir():
+    '''
+    Directory generated programs are written to: [DISPLAY]PROGRAM_PREFIX
+    of the INI file LinuxCNC was started with, or the system temporary
+    directory if that can't be found.
+    '''
+    path = os.environ.get("INI_FILE_NAME")
+    prefix = None
+    if path:
+        try:
+            prefix = linuxcnc.ini(path).find("DISPLAY", "PROGRAM_PREFIX")
+        except linuxcnc.error:
+            prefix = None
+    if prefix:
+        prefix = os.path.expanduser(prefix)
+        if not os.path.isabs(prefix):
+            prefix = os.path.join(os.path.dirname(path), prefix)
+        if os.path.isdir(prefix):
+            return prefix
+    import tempfile
+    return tempfile.gettempdir()
+
+
+class Program:
+    '''
+    An unrolled program: header lines, then each index step (a list of
+    G-code lines) repeated in turn.
+
+    move_lines holds, for every step, the file line number of its last
+    line; the step is complete once the program has moved past that
+    line. line_field names the stat field that tells how far it has
+    got: "motion_line" when the steps are moves, "current_line" when
+    they are not (moves=False).
+    '''
+
+    def __init__(self, title, header=None, moves=True):
+        # % delimiters rather than M2: M2 would reset the distance mode
+        # to G90, while every MDI handler relies on the G91 set up by
+        # RS274NGC_STARTUP_CODE.
+        self.lines = ["%", "(" + title + ")"] + list(header or [])
+        self.move_lines = []
+        self.line_field = "motion_line" if moves else "current_line"
+
+    def add_step(self, gcodes):
+        self.lines.extend(gcodes)
+        self.move_lines.append(len(self.lines))
+
+    def write(self, filename=REPEAT_FILE):
+        '''
+        Writes the program and returns its path.
+        '''
+        path = os.path.join(program_dir(), filename)
+        with open(path, "w") as f:
+            f.write("\n".join(self.lines + ["%"]) + "\n")
+        return path
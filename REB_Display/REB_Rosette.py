@@ -0,0 +1,139 @@
+"""
+REB_Rosette.py
+
+Rosette profiles for the electronic rosette (REB_Comp/reb_rosette.comp)
+of the Rose Engine Butler.
+
+The rosettes offered on the panel are listed in [DISPLAY]
+REB_ROSETTE_FILE (relative to the INI file's directory), one per line:
+
+    <name>  <lobes>  <profile>
+
+lobes is the number of times the profile repeats per revolution of
+the spindle. profile is either one of the built-in SHAPES or the
+profile's own values, comma separated: one lobe, evenly spaced, from
+-1 to 1. "#" starts a comment.
+
+load() writes a rosette into the component's table in one
+REB_Hal.set_values() transaction and then counts up its serial pin,
+which makes the component take the whole table at once. Amplitude
+(scale), phase and on/off are pins of their own, driven straight from
+the panel's widgets (REB_PostGUI.hal), so changing them needs no
+Python at all.
+"""
+
+import collections
+import math
+
+import REB_Hal
+import REB_Startup
+
+# HAL name of the component (loadrt reb_rosette names=... in REB_Rosette.tcl).
+COMPONENT = "reb-rosette"
+
+# Table size of the component, and the number of points a built-in
+# shape is sampled at.
+POINTS = 128
+
+Rosette = collections.namedtuple("Rosette", "name lobes values")
+
+# Built-in profiles: one lobe, t from 0 to 1 -> -1 .. 1.
+SHAPES = {
+    # Smooth, evenly rounded bumps.
+    "sine":     lambda t: math.cos(2 * math.pi * t),
+    # Straight flanks meeting in sharp points.
+    "triangle": lambda t: 4 * abs(t - 0.5) - 1,
+    # Round arcs meeting in sharp cusps (the classic "scallop").
+    "scallop":  lambda t: 2 * math.sqrt(max(0.0, 1 - (2 * t - 1) ** 2)) - 1,
+}
+
+
+def rosette_path():
+    '''
+    The rosette file, or None if [DISPLAY]REB_ROSETTE_FILE is not set.
+    '''
+    return REB_Startup.ini_path("REB_ROSETTE_FILE")
+
+
+def sample(shape, points=POINTS):
+    '''
+    The values of a built-in shape at points evenly spaced points.
+    '''
+    function = SHAPES[shape]
+    return [round(function(k / points), 6) for k in range(points)]
+
+
+def parse_line(line):
+    '''
+    The Rosette of a rosette file line, None for a blank or comment
+    line. Raises ValueError.
+    '''
+    fields = line.split("#")[0].split()
+    if not fields:
+        return None
+    if len(fields) != 3:
+        raise ValueError("expected <name> <lobes> <profile>")
+    name, lobes, profile = fields
+
+    lobes = int(lobes)
+    if lobes < 1:
+        raise ValueError("lobes must be 1 or more")
+    if profile in SHAPES:
+        values = sample(profile)
+    else:
+        values = [float(value) for value in profile.split(",")]
+        if not 2 <= len(values) <= POINTS:
+            raise ValueError("a profile has 2 to " + str(POINTS)
+                             + " values")
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError("profile values must be finite")
+    return Rosette(name, lobes, values)
+
+
+def read_rosettes(path):
+    '''
+    The rosettes in a rosette file, in file order. Lines that are not
+    valid are reported and skipped.
+    '''
+    rosettes = []
+    try:
+        with open(path, "r") as f:
+            for lineno, line in enumerate(f, start=1):
+                try:
+                    rosette = parse_line(line)
+                except ValueError as e:
+                    print(path + ":" + str(lineno) + ": " + str(e)
+                          + " - ignored")
+                    continue
+                if rosette is not None:
+                    rosettes.append(rosette)
+    except OSError as e:
+        print("Could not read " + path + ": " + str(e))
+    return rosettes
+
+
+def load(rosette):
+    '''
+    Writes a rosette into the component's table, then counts up its
+    serial pin so the component takes it in the next servo period.
+    Returns False if the table could not be written.
+    '''
+    # REB_Rosette.tcl leaves the component out if it is not installed.
+    if REB_Hal.get_value(COMPONENT + ".loaded") is None:
+        print("The electronic rosette is not loaded; run "
+              "REB_Setup/REB_Update.sh to install reb_rosette")
+        return False
+
+    values = {COMPONENT + ".points": len(rosette.values),
+              COMPONENT + ".lobes": rosette.lobes}
+    for k, value in enumerate(rosette.values):
+        values[COMPONENT + ".point-%03d" % k] = float(value)
+    results = REB_Hal.set_values(values)
+    if not all(results.values()):
+        print("Could not load rosette " + rosette.name)
+        return False
+
+    serial = REB_Hal.get_value(COMPONENT + ".serial")
+    if serial is None:
+        return False
+    return REB_Hal.set_value(COMPONENT + ".serial", (int(serial) + 1) % 2**32)
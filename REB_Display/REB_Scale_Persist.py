@@ -4,18 +4,23 @@ REB_Scale_Persist.py
 
 At LinuxCNC shutdown, reads the current stepgen position-scale value
 for each Rose Engine Butler axis directly from HAL and writes it back
-into REB_Settings_v1.ini, updating only the <scale> value inside each
-<axis id="..."> block. The rest of the file - including its header
-comment - is left untouched.
+into REB_Settings_v1.ini through the REB_Settings model, updating only
+each axis's <scale> value. Every other stored value, and the file's
+header comment, is kept.
+
+All eight scales are taken from one bulk snapshot (a single
+"halcmd show param" dump) and the settings file is rewritten once,
+so a save costs one process launch however many axes there are.
 
 Invoked from REB_Shutdown.hal:
     loadusr -w python3 REB_Display/REB_Scale_Persist.py
 """
 
-import re
-import subprocess
 import sys
 
+import REB_Hal
+import REB_Settings
+
 # Axis id (as used in REB_Settings_v1.ini and the Settings tab spin
 # buttons) -> hm2_7i92.0 stepgen channel. Verified against the actual
 # "net <axis>-enable => hm2_7i92.0.stepgen.NN.enable" lines in REB.hal
@@ -31,57 +36,51 @@ AXIS_STEPGEN = {
     "Sp1": "07",
 }
 
-SETTINGS_PATH = "/home/reuben/linuxcnc/configs/RoseEngineButlerLocal/REB_Settings_v1.ini"
+def get_all_scales():
+    '''
+    Returns {axis id: scale} for every axis in AXIS_STEPGEN,
+    read from one bulk HAL snapshot, or None if HAL could not be read.
+    '''
+    values = REB_Hal.show_params(REB_Hal.stepgen_prefix())
+    if values is None:
+        return None
+
+    scales = {}
+    for axis_id, stepgen_ch in AXIS_STEPGEN.items():
+        hal_pin = REB_Hal.stepgen_scale_param(stepgen_ch)
+        if hal_pin not in values:
+            print("Error reading scale for axis " + axis_id + ": "
+                  + hal_pin + " not found")
+            continue
+        scales[axis_id] = values[hal_pin]
 
-def get_scale(stepgen_ch):
-    hal_pin = "hm2_7i92.0.stepgen." + stepgen_ch + ".position-scale"
-    result = subprocess.run(
-        ["halcmd", "getp", hal_pin],
-        check=True,
-        capture_output=True,
-        text=True
-    )
-    return result.stdout.strip()
+    return scales
 
 def main():
     try:
-        with open(SETTINGS_PATH, "r") as f:
-            xml_text = f.read()
-    except OSError as e:
-        print("Could not read " + SETTINGS_PATH + ": " + str(e))
+        settings = REB_Settings.Settings.load()
+    except REB_Settings.SettingsError as e:
+        print(str(e))
         sys.exit(1)
 
-    for axis_id, stepgen_ch in AXIS_STEPGEN.items():
-        try:
-            value = get_scale(stepgen_ch)
-        except subprocess.CalledProcessError as e:
-            print("Error reading scale for axis " + axis_id + ": " + e.stderr)
-            continue
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-            sys.exit(1)
-
-        pattern = (
-            r'(<axis\s+id="' + re.escape(axis_id) + r'">\s*<scale>)'
-            r'[\d.]+'
-            r'(</scale>)'
-        )
-        new_text, count = re.subn(
-            pattern, r'\g<1>' + value + r'\g<2>', xml_text, count=1
-        )
-        if count == 0:
+    scales = get_all_scales()
+    if scales is None:
+        sys.exit(1)
+
+    for axis_id, value in scales.items():
+        if axis_id not in settings.axes:
             print("No <axis id=\"" + axis_id + "\"> entry found in "
-                  + SETTINGS_PATH + " - leaving it unchanged")
+                  + settings.path + " - leaving it unchanged")
             continue
 
-        xml_text = new_text
-        print("Saved " + axis_id + " scale = " + value)
+        settings.set(axis_id, "scale", value)
+        print("Saved " + axis_id + " scale = "
+              + REB_Hal.format_value(settings.get(axis_id, "scale")))
 
     try:
-        with open(SETTINGS_PATH, "w") as f:
-            f.write(xml_text)
-    except OSError as e:
-        print("Could not write " + SETTINGS_PATH + ": " + str(e))
+        settings.save()
+    except REB_Settings.SettingsError as e:
+        print(str(e))
         sys.exit(1)
 
 
@@ -0,0 +1,253 @@
+"""
+REB_Session.py
+
+Session state of the Rose Engine Butler main panel: the working values
+an operator dials in (feeds, index distances, move distances, repeats,
+Deg/Div modes, index on/off, the rosette and its amplitude and phase),
+kept across restarts of the panel. The electronic rosette itself
+always starts switched off. The index counters are kept by the index
+journal (REB_Journal.py).
+
+The values are stored as JSON in [DISPLAY]REB_SESSION_FILE (relative to
+the INI file's directory); without that setting nothing is kept.
+HandlerClass.__init__ restores the whole file in one go with apply(),
+before gladevcp connects the callbacks, so setting the widgets fires
+none of the per-change handlers. From then on HandlerClass.__setattr__
+records every change of a FIELDS attribute, and a
+REB_Settings.SettingsWriter saves them in the background, atomically.
+
+A settings profile (REB_Settings.py) also holds working values, as
+<axis> fields: profile_values() turns session values into those
+fields and profile_attrs() turns them back; apply_changes() sets only
+the ones that differ from the panel's.
+"""
+
+import json
+
+import REB_Settings
+import REB_Startup
+
+DEG_DIV = ("Deg", "Div")
+
+# Panel attribute -> (type, widget, kind of widget). kind is "spin",
+# "check", "radio" (widget is then a (Deg, Div) pair of radio
+# buttons), "combo" (a combo box, by item id) or None for a value with
+# no widget of its own.
+FIELDS = {
+    "B_Feed":         (float, "B_Feed", "spin"),
+    "B_Idx_Dist":     (float, "B_Idx_Dist", "spin"),
+    "B_Idx_Rpt":      (int, "B_Idx_Repeat", "spin"),
+    "B_Idx_DegDiv":   (DEG_DIV, ("B_Idx_Deg", "B_Idx_Div"), "radio"),
+    "B_Move_Dist":    (float, "B_Move_Dist", "spin"),
+
+    "Sp0_Feed":       (float, "Sp0_Set_Feed", "spin"),
+    "Sp0_Idx_Dist":   (float, "Sp0_Idx_Dist", "spin"),
+    "Sp0_Idx_Rpt":    (int, "Sp0_Idx_Repeat", "spin"),
+    "Sp0_Idx_DegDiv": (DEG_DIV, ("Sp0_Set_Idx_bW_Deg",
+                                 "Sp0_Set_Idx_bW_Div"), "radio"),
+    "Sp0_Idx_Bool":   (bool, "Sp0_Set_Idx_OnOff", "check"),
+
+    "Sp1_Pct":        (float, "Sp1_Set_Move_Pct", "spin"),
+    "Sp1_Idx_Dist":   (float, None, None),
+    "Sp1_Idx_Bool":   (bool, "Sp1_Set_Idx_OnOff", "check"),
+
+    "Rosette_Name":   (str, "Rosette_Select", "combo"),
+    "Rosette_Scale":  (float, "Rosette_Scale", "spin"),
+    "Rosette_Phase":  (float, "Rosette_Phase", "spin"),
+}
+
+# Settings profile field (REB_Settings.FIELDS) -> attribute suffix,
+# <axis id>_<suffix>. idx_mode comes first so the Deg/Div mode is set
+# before the index distance it applies to.
+PROFILE_FIELDS = {
+    "idx_mode":  "Idx_DegDiv",
+    "feed":      "Feed",
+    "idx_dist":  "Idx_Dist",
+    "idx_rpt":   "Idx_Rpt",
+    "move_dist": "Move_Dist",
+    "pct":       "Pct",
+}
+
+
+def add_axes(axes):
+    '''
+    Adds the working values of the linear axes in an axis table
+    (REB_Axis.axis_table) to FIELDS.
+    '''
+    for axis in axes:
+        if axis.kind != "linear":
+            continue
+        for field in ("Feed", "Idx_Dist", "Move_Dist"):
+            name = axis.id + "_" + field
+            FIELDS.setdefault(name, (float, name, "spin"))
+
+
+def session_path():
+    '''
+    The session file, or None if [DISPLAY]REB_SESSION_FILE is not set.
+    '''
+    return REB_Startup.ini_path("REB_SESSION_FILE")
+
+
+def convert(name, value):
+    '''
+    value as the type of the FIELDS attribute name. Raises ValueError.
+    '''
+    kind = FIELDS[name][0]
+    if isinstance(kind, tuple):
+        if value not in kind:
+            raise ValueError(name + " must be one of " + ", ".join(kind))
+        return value
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ValueError(name + " must be true or false")
+        return value
+    if kind is str:
+        if not isinstance(value, str):
+            raise ValueError(name + " must be text")
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(name + " must be a number")
+    if kind is int and value != int(value):
+        raise ValueError(name + " must be a whole number")
+    return kind(value)
+
+
+def profile_values(values):
+    '''
+    {axis id: {profile field: value}} of session values {attribute:
+    value}, for the attributes a profile can hold.
+    '''
+    axes = {}
+    for name, value in values.items():
+        for field, suffix in PROFILE_FIELDS.items():
+            if name.endswith("_" + suffix):
+                axis_id = name[:-len(suffix) - 1]
+                axes.setdefault(axis_id, {})[field] = value
+    return axes
+
+
+def profile_attrs(axes):
+    '''
+    {attribute: value} of a profile's {axis id: {field: value}}, for
+    the FIELDS attributes the panel has, idx_mode first.
+    '''
+    attrs = {}
+    for field, suffix in PROFILE_FIELDS.items():
+        for axis_id, fields in axes.items():
+            name = axis_id + "_" + suffix
+            if field in fields and name in FIELDS:
+                attrs[name] = convert(name, fields[field])
+    return attrs
+
+
+def set_value(handler, builder, name, value):
+    '''
+    Sets one FIELDS attribute on the handler and its widget.
+    '''
+    kind, widget_name, widget_kind = FIELDS[name]
+    if widget_kind == "radio":
+        widget = builder.get_object(widget_name[DEG_DIV.index(value)])
+        if widget is not None:
+            widget.set_active(True)
+    elif widget_name is not None:
+        widget = builder.get_object(widget_name)
+        if widget is not None and widget_kind == "spin":
+            widget.set_value(value)
+            # The spin button's range has the last word.
+            value = convert(name, widget.get_value())
+        elif widget is not None and widget_kind == "check":
+            widget.set_active(value)
+        elif widget is not None and widget_kind == "combo":
+            # An item the combo box no longer lists selects nothing.
+            widget.set_active_id(value)
+    setattr(handler, name, value)
+
+
+def apply_changes(handler, builder, values):
+    '''
+    Sets the values {attribute: value} that differ from the handler's,
+    in order. Once the callbacks are connected, each widget changed
+    runs its callback as if the operator had changed it. Returns the
+    names of the values set.
+    '''
+    changed = []
+    for name, value in values.items():
+        if getattr(handler, name, None) != value:
+            set_value(handler, builder, name, value)
+            changed.append(name)
+    return changed
+
+
+class Session:
+    '''
+    The stored session values, {attribute: value}.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.values = {}
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Reads the session file. A missing file is an empty session;
+        values that are unknown or invalid are dropped.
+        '''
+        session = cls(path)
+        try:
+            with open(path, "r") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return session
+        except (OSError, ValueError) as e:
+            print("Could not read " + path + ": " + str(e))
+            return session
+
+        if not isinstance(stored, dict):
+            print(path + ": not a session file - ignored")
+            return session
+        for name, value in stored.items():
+            if name not in FIELDS:
+                continue
+            try:
+                session.values[name] = convert(name, value)
+            except ValueError as e:
+                print(path + ": " + str(e) + " - ignored")
+        return session
+
+    def set(self, name, value):
+        '''
+        Stores one value. Returns True if that changed anything.
+        '''
+        value = convert(name, value)
+        if self.values.get(name) == value:
+            return False
+        self.values[name] = value
+        return True
+
+    def dump(self):
+        '''
+        The text SettingsWriter saves.
+        '''
+        return json.dumps(self.values, indent=4, sort_keys=True) + "\n"
+
+    def apply(self, handler, builder):
+        '''
+        Sets every stored value on the handler and its widget. Call
+        before the callbacks are connected, so no handler runs.
+        '''
+        for name, value in self.values.items():
+            set_value(handler, builder, name, value)
+
+
+class SessionWriter(REB_Settings.SettingsWriter):
+    '''
+    Write-behind saving of a Session (see REB_Settings.SettingsWriter).
+    '''
+
+    def record(self, name, value):
+        try:
+            super().record(name, value)
+        except ValueError as e:
+            print("Session: " + str(e))
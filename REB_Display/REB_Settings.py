@@ -0,0 +1,480 @@
+"""
+REB_Settings.py
+
+Settings model shared by the Rose Engine Butler GUI (hitcounter.py)
+and helper scripts (REB_Scale_Persist.py).
+
+REB_Settings_v1.ini is an XML file: a header comment, then one
+<axis id="..."> element per axis holding that axis's stored values:
+
+    <settings profile="...">
+        <axis id="B">
+            <scale>57599</scale>
+            <feed>10</feed>
+        </axis>
+        ...
+        <profile name="...">
+            <axis id="B"> ... </axis>
+            ...
+        </profile>
+    </settings>
+
+The <axis> elements directly in <settings> hold the current values.
+Each <profile> is a named set of values (scales and panel working
+values) for one machine or job setup; the profile attribute records
+which was applied last (select_profile()). Applying one only writes
+the values that differ from the current ones.
+
+Settings.load() parses it once into {axis id: {field: value}},
+checking every value against FIELDS, and to_xml() writes the same
+layout back, keeping the header (everything before <settings>) and
+whatever follows </settings> exactly as they were. A field absent from
+the file is simply not set; callers keep their own default.
+
+save() replaces the file atomically and keeps the previous versions;
+SettingsWriter saves changes made from the GUI in the background.
+"""
+
+import atexit
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+
+import REB_Hal
+import REB_Startup
+
+# Used unless [DISPLAY]REB_SETTINGS_FILE names another file.
+SETTINGS_PATH = "/home/reuben/linuxcnc/configs/RoseEngineButlerLocal/REB_Settings_v1.ini"
+
+ROOT = "settings"
+
+# Previous versions kept by save(), as <file>.1 (newest) .. <file>.N.
+BACKUPS = 3
+
+# Seconds SettingsWriter waits after the last change before saving.
+FLUSH_DELAY = 2.0
+
+# Fields an <axis> may hold -> the type of their value. A tuple lists
+# the only values a text field may take.
+FIELDS = {
+    "scale":     float,     # stepgen position-scale
+    "feed":      float,     # feed rate / spindle speed
+    "idx_dist":  float,     # index distance
+    "idx_deg":   float,     # index degrees
+    "idx_rpt":   int,       # indexes per press
+    "move_dist": float,     # move distance
+    "pct":       float,     # speed as a percentage of Sp0
+    "idx_mode":  ("Deg", "Div"),
+}
+
+
+class SettingsError(ValueError):
+    '''
+    The settings file is missing, unreadable or not valid.
+    '''
+
+
+def check(field, value):
+    '''
+    Returns value converted to the type of field, or raises
+    SettingsError if it isn't a valid value for it.
+    '''
+    kind = FIELDS.get(field)
+    if kind is None:
+        raise SettingsError("unknown field <" + field + ">")
+
+    if isinstance(kind, tuple):
+        value = str(value).strip()
+        if value not in kind:
+            raise SettingsError("<" + field + "> must be one of "
+                                + ", ".join(kind) + ", not " + repr(value))
+        return value
+
+    try:
+        if kind is int and isinstance(value, str):
+            value = float(value)
+            if value != int(value):
+                raise ValueError
+        value = kind(value)
+    except (TypeError, ValueError):
+        raise SettingsError("<" + field + "> is not a number: "
+                            + repr(value))
+    if not math.isfinite(value):
+        raise SettingsError("<" + field + "> is not finite: " + repr(value))
+    return value
+
+
+def settings_path():
+    '''
+    The settings file: [DISPLAY]REB_SETTINGS_FILE if it is set,
+    otherwise SETTINGS_PATH.
+    '''
+    return REB_Startup.ini_path("REB_SETTINGS_FILE") or SETTINGS_PATH
+
+
+class Settings:
+    '''
+    Parsed contents of the settings file.
+    '''
+
+    def __init__(self, path=None, header=None):
+        self.path = path if path is not None else settings_path()
+        self.header = header or '<?xml version="1.0" encoding="UTF-8"?>\n'
+        self.trailer = "\n"
+        self.axes = {}      # axis id -> {field: value}, in file order
+        self.profiles = {}  # profile name -> {axis id: {field: value}}
+        self.profile = None # name of the profile last applied
+
+    @classmethod
+    def load(cls, path=None):
+        '''
+        Reads and validates the settings file (default: settings_path()).
+        Raises SettingsError.
+        '''
+        if path is None:
+            path = settings_path()
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except OSError as e:
+            raise SettingsError("Could not read " + path + ": " + str(e))
+
+        settings = cls(path)
+        settings.parse(text)
+        return settings
+
+    def parse(self, text):
+        '''
+        Replaces the model with the contents of text.
+        '''
+        import xml.etree.ElementTree as ET
+
+        try:
+            root = ET.fromstring(text)
+        except ET.ParseError as e:
+            raise SettingsError(self.path + ": " + str(e))
+        if root.tag != ROOT:
+            raise SettingsError(self.path + ": root element is <"
+                                + root.tag + ">, not <" + ROOT + ">")
+
+        profiles = {}
+        for profile in root.findall("profile"):
+            name = profile.get("name")
+            if not name:
+                raise SettingsError(self.path + ": <profile> without a name")
+            if name in profiles:
+                raise SettingsError(self.path + ": profile " + name
+                                    + " is listed twice")
+            profiles[name] = self._parse_axes(profile, "profile " + name)
+        for element in root.findall("profile"):
+            root.remove(element)
+        axes = self._parse_axes(root, "<" + ROOT + ">")
+
+        # The header is everything before <settings>, skipping over
+        # comments that mention it.
+        self.header = ""
+        for match in re.finditer(r"<!--.*?-->|<" + ROOT + r"[\s>/]", text,
+                                 re.DOTALL):
+            if not match.group().startswith("<!--"):
+                self.header = text[:match.start()]
+                break
+        end = text.rfind("</" + ROOT + ">")
+        self.trailer = text[end + len(ROOT) + 3:] if end >= 0 else "\n"
+        self.axes = axes
+        self.profiles = profiles
+        self.profile = root.get("profile")
+
+    def _parse_axes(self, parent, where):
+        '''
+        {axis id: {field: value}} of the <axis> elements in parent.
+        '''
+        axes = {}
+        for axis in parent:
+            if axis.tag != "axis":
+                raise SettingsError(self.path + ": unexpected <"
+                                    + axis.tag + "> in " + where)
+            axis_id = axis.get("id")
+            if not axis_id:
+                raise SettingsError(self.path + ": <axis> without an id in "
+                                    + where)
+            if axis_id in axes:
+                raise SettingsError(self.path + ": axis " + axis_id
+                                    + " is listed twice in " + where)
+            fields = {}
+            for field in axis:
+                try:
+                    fields[field.tag] = check(field.tag, field.text)
+                except SettingsError as e:
+                    raise SettingsError(self.path + ": " + where + ": axis "
+                                        + axis_id + ": " + str(e))
+            axes[axis_id] = fields
+        return axes
+
+    def get(self, axis_id, field, default=None):
+        '''
+        A stored value, or default if the file doesn't have it.
+        '''
+        return self.axes.get(axis_id, {}).get(field, default)
+
+    def set(self, axis_id, field, value):
+        '''
+        Stores a value, adding the axis if it is new. Returns True if
+        that changed anything.
+        '''
+        value = check(field, value)
+        fields = self.axes.setdefault(axis_id, {})
+        if fields.get(field) == value:
+            return False
+        fields[field] = value
+        return True
+
+    def values(self, field):
+        '''
+        {axis id: value} of one field, for the axes that have it.
+        '''
+        return {axis_id: fields[field]
+                for axis_id, fields in self.axes.items() if field in fields}
+
+    def set_profile(self, name, axes):
+        '''
+        Stores (or replaces) the profile name. Returns True if that
+        changed anything.
+        '''
+        checked = {}
+        for axis_id, fields in axes.items():
+            checked[axis_id] = {field: check(field, value)
+                                for field, value in fields.items()}
+        if self.profiles.get(name) == checked:
+            return False
+        self.profiles[name] = checked
+        return True
+
+    def select_profile(self, name):
+        '''
+        Records name as the profile last applied. Returns True if that
+        changed anything.
+        '''
+        if name not in self.profiles:
+            raise SettingsError("no profile " + repr(name))
+        if self.profile == name:
+            return False
+        self.profile = name
+        return True
+
+    def to_xml(self):
+        '''
+        The settings file's text.
+        '''
+        from xml.sax.saxutils import quoteattr
+
+        root = "<" + ROOT
+        if self.profile is not None:
+            root += " profile=" + quoteattr(self.profile)
+        lines = [root + ">"]
+        _axes_xml(lines, self.axes, "    ")
+        for name, axes in self.profiles.items():
+            lines.append("    <profile name=" + quoteattr(name) + ">")
+            _axes_xml(lines, axes, "        ")
+            lines.append("    </profile>")
+        lines.append("</" + ROOT + ">")
+        return self.header + "\n".join(lines) + self.trailer
+
+    def save(self, path=None):
+        '''
+        Writes the settings file atomically: the new text goes to a
+        temporary file that is fsynced and renamed over the old one,
+        so a power cut leaves either the old file or the new one,
+        never a truncated one. The replaced file is kept as the newest
+        of BACKUPS backups (<file>.1 is the most recent). Raises
+        SettingsError.
+        '''
+        write_atomic(path or self.path, self.dump())
+
+    def dump(self):
+        '''
+        The text save() writes.
+        '''
+        return self.to_xml()
+
+
+def _axes_xml(lines, axes, indent):
+    from xml.sax.saxutils import escape, quoteattr
+
+    for axis_id, fields in axes.items():
+        lines.append(indent + "<axis id=" + quoteattr(axis_id) + ">")
+        for field, value in fields.items():
+            lines.append(indent + "    <" + field + ">"
+                         + escape(REB_Hal.format_value(value))
+                         + "</" + field + ">")
+        lines.append(indent + "</axis>")
+
+
+def _fsync_dir(path):
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _rotate_backups(path, backups):
+    '''
+    Shifts <path>.1 .. <path>.<backups - 1> up by one and makes the
+    current file <path>.1.
+    '''
+    if backups < 1 or not os.path.exists(path):
+        return
+    for n in range(backups - 1, 0, -1):
+        older = path + "." + str(n)
+        if os.path.exists(older):
+            os.replace(older, path + "." + str(n + 1))
+    # A hard link keeps the old contents under the backup name once the
+    # new file is renamed into place, without copying them.
+    try:
+        os.link(path, path + ".1")
+    except OSError:
+        import shutil
+        shutil.copy2(path, path + ".1")
+
+
+def write_atomic(path, text, backups=BACKUPS):
+    '''
+    Replaces path with text (temporary file, fsync, rename), keeping
+    the previous contents as the newest of backups backups. Raises
+    SettingsError.
+
+    Each call writes its own temporary file, so two writers never mix
+    their text in one; the last rename wins.
+    '''
+    directory, name = os.path.split(os.path.abspath(path))
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "w") as f:
+            # mkstemp() creates the file private to its owner.
+            os.fchmod(f.fileno(), _file_mode(path))
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        _rotate_backups(path, backups)
+        os.replace(tmp, path)
+        tmp = None
+        _fsync_dir(path)
+    except OSError as e:
+        raise SettingsError("Could not write " + path + ": " + str(e))
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _file_mode(path):
+    '''
+    Permission bits for a new version of path: those of the current
+    file, or the usual ones for a new file under the process umask.
+    '''
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class SettingsWriter:
+    '''
+    Write-behind persistence for a Settings model, or any model with
+    the same set(), dump() and path (REB_Session.Session).
+
+    record() only updates the model in memory, so it is cheap enough
+    to call from a GTK handler. A background thread saves the model
+    once FLUSH_DELAY seconds have passed without another change, so a
+    burst of spin button clicks costs one write. flush() saves any
+    pending change right away; it is also run at interpreter exit.
+    '''
+
+    def __init__(self, settings, delay=None):
+        self.settings = settings
+        self.delay = FLUSH_DELAY if delay is None else delay
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # Held by flush() while it writes the file, so one save runs at
+        # a time; with the generations below, text dumped before a newer
+        # save finished is dropped instead of replacing it.
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._generation = 0    # bumped by every change
+        self._saved = 0         # the generation last written to disk
+        self._due = None        # time.monotonic() the flush is due at
+        self._thread = None
+
+    def record(self, *key_and_value):
+        '''
+        Stores a value in the model (arguments as for its set()) and
+        schedules a save. Raises the model's error for an invalid
+        value.
+        '''
+        self.modify(self.settings.set, *key_and_value)
+
+    def modify(self, change, *args):
+        '''
+        Runs change(*args), a method of the model that returns True if
+        it changed anything, and schedules a save if it did.
+        '''
+        with self._lock:
+            if not change(*args):
+                return
+            self._dirty = True
+            self._generation += 1
+            self._due = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="REB_Settings", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+            self._changed.notify()
+
+    def flush(self):
+        '''
+        Saves the model now if it has unsaved changes. Returns False if
+        the save failed.
+        '''
+        with self._lock:
+            if not self._dirty:
+                return True
+            text = self.settings.dump()
+            generation = self._generation
+            self._dirty = False
+            self._due = None
+        with self._write_lock:
+            if generation <= self._saved:
+                # Another flush dumped later but wrote first.
+                return True
+            try:
+                write_atomic(self.settings.path, text)
+            except SettingsError as e:
+                print(str(e))
+                with self._lock:
+                    # Try again later.
+                    self._dirty = True
+                    if self._due is None:
+                        self._due = time.monotonic() + self.delay
+                return False
+            self._saved = generation
+        return True
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._due is None or time.monotonic() < self._due:
+                    if self._due is None:
+                        self._changed.wait()
+                    else:
+                        self._changed.wait(self._due - time.monotonic())
+            self.flush()
@@ -0,0 +1,233 @@
+"""
+REB_Startup.py
+
+Startup-time report for the Rose Engine Butler gladevcp components
+(every process that loads hitcounter.py).
+
+hitcounter.py imports this module before anything else and marks the
+milestones of bringing its component up:
+
+    python    process start -> hitcounter.py starts importing
+              (interpreter, gladevcp, HAL component and .ui)
+    import    hitcounter.py and the REB modules it imports
+    handlers  get_handlers(): HandlerClass construction
+    ready     process start -> the GTK main loop first goes idle,
+              i.e. the panel or tab is up and responding
+
+Once the component is ready one line is printed, and appended to
+[DISPLAY]REB_STARTUP_LOG (relative to the INI file's directory) when
+that is set, so boot-to-ready times on the panel PC can be tracked
+across restarts.
+
+When [DISPLAY]REB_STARTUP_TIMELINE is set, the same milestones are
+also appended to that file as timeline events, in wall-clock time and
+keyed by the start time of the GUI process ([DISPLAY]DISPLAY) they
+belong to, alongside the events REB_Boot.py records for the tab
+launches and REB_PostGUI.hal. "REB_Boot.py report" turns a boot's
+events into the boot-to-ready timeline.
+"""
+
+import os
+import time
+
+IMPORT_START = time.monotonic()
+
+_marks = {"import_start": IMPORT_START}
+
+# Order of a component's milestones in the timeline.
+STAGES = ("launch", "process_start", "import_start", "imported",
+          "handlers", "ready")
+
+
+def _proc_stat(pid):
+    '''
+    (command name, parent pid, start time in clock ticks after boot)
+    of a process, from /proc/<pid>/stat.
+    '''
+    with open("/proc/" + str(pid) + "/stat") as f:
+        text = f.read()
+    name = text[text.index("(") + 1:text.rindex(")")]
+    # Fields 4 (ppid) and 22 (starttime), counted after the command.
+    fields = text.rsplit(")", 1)[1].split()
+    return name, int(fields[1]), int(fields[19])
+
+
+def _boot_time():
+    with open("/proc/stat") as f:
+        for line in f:
+            if line.startswith("btime "):
+                return int(line.split()[1])
+    raise ValueError("no btime in /proc/stat")
+
+
+def process_epoch(pid="self"):
+    '''
+    Wall-clock time (time.time()) at which a process was started, or
+    None where /proc can't tell. Every process that asks about the
+    same pid gets exactly the same value.
+    '''
+    try:
+        started = _proc_stat(pid)[2]
+        return _boot_time() + started / float(os.sysconf("SC_CLK_TCK"))
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def process_start():
+    '''
+    time.monotonic() at which this process was started, or None where
+    that can't be read.
+    '''
+    epoch = process_epoch()
+    if epoch is None:
+        return None
+    return time.monotonic() - (time.time() - epoch)
+
+
+def gui_pid(display=None):
+    '''
+    pid of the GUI ([DISPLAY]DISPLAY, e.g. axis) this process was
+    started under, found by walking up its parents, or None.
+    '''
+    if display is None:
+        display = ini_value("DISPLAY", "DISPLAY") or "axis"
+    display = os.path.basename(display.split()[0])[:15]   # comm length
+    pid = os.getpid()
+    try:
+        while pid > 1:
+            name, parent, started = _proc_stat(pid)
+            if name == display:
+                return pid
+            pid = parent
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
+def boot_key():
+    '''
+    Identifies the current LinuxCNC session in the timeline: the GUI's
+    start time, to 0.01 s, or "-" if there is no GUI above us.
+    '''
+    pid = gui_pid()
+    epoch = process_epoch(pid) if pid is not None else None
+    if epoch is None:
+        return "-"
+    return "%.2f" % epoch
+
+
+def ini_value(section, name):
+    '''
+    A value from the INI file LinuxCNC was started with, or None.
+    '''
+    path = os.environ.get("INI_FILE_NAME")
+    if not path:
+        return None
+    try:
+        import linuxcnc
+        return linuxcnc.ini(path).find(section, name)
+    except Exception:
+        return None
+
+
+def ini_path(name):
+    '''
+    A [DISPLAY] file setting as an absolute path (relative to the INI
+    file's directory), or None if it is not set.
+    '''
+    value = ini_value("DISPLAY", name)
+    if not value:
+        return None
+    return os.path.join(
+        os.path.dirname(os.path.abspath(os.environ["INI_FILE_NAME"])), value
+    )
+
+
+def timeline_event(component, stage, when=None):
+    '''
+    Appends "<boot key> <component> <stage> <time>" to the
+    [DISPLAY]REB_STARTUP_TIMELINE file, if one is set. when is a
+    time.time() value and defaults to now.
+    '''
+    if when is None:
+        when = time.time()
+    timeline_events(component, [(stage, when)])
+
+
+def timeline_events(component, events):
+    '''
+    Appends several (stage, time.time() value) events of component to
+    the timeline in one go.
+    '''
+    path = ini_path("REB_STARTUP_TIMELINE")
+    if path is None:
+        return
+    key = boot_key()
+    try:
+        with open(path, "a") as f:
+            for stage, when in events:
+                f.write("%s %s %s %.3f\n" % (key, component, stage, when))
+    except OSError as e:
+        print("Could not write " + path + ": " + str(e))
+
+
+def mark(name):
+    '''
+    Records that the milestone name has just been reached.
+    '''
+    _marks[name] = time.monotonic()
+
+
+def _ms(start, end):
+    if start is None or end is None:
+        return "?"
+    return "%.0f ms" % ((end - start) * 1000)
+
+
+def summary(component):
+    '''
+    The one-line startup report of component.
+    '''
+    started = process_start()
+    return ("REB startup " + component
+            + ": python " + _ms(started, _marks["import_start"])
+            + ", import " + _ms(_marks["import_start"], _marks.get("imported"))
+            + ", handlers " + _ms(_marks.get("imported"),
+                                  _marks.get("handlers"))
+            + ", ready " + _ms(started, _marks.get("ready")))
+
+
+def report_when_ready(component):
+    '''
+    Prints (and logs) the startup report once the GTK main loop has
+    started running. Call at the end of get_handlers().
+    '''
+    from gi.repository import GLib
+
+    GLib.idle_add(_ready, component)
+
+
+def _ready(component):
+    mark("ready")
+    line = summary(component)
+    print(line)
+
+    log = ini_path("REB_STARTUP_LOG")
+    if log is not None:
+        try:
+            with open(log, "a") as f:
+                f.write(time.strftime("%Y-%m-%d %H:%M:%S ") + line + "\n")
+        except OSError as e:
+            print("Could not write " + log + ": " + str(e))
+
+    # The milestones, moved from the monotonic clock to wall-clock time.
+    offset = time.time() - time.monotonic()
+    events = []
+    started = process_epoch()
+    if started is not None:
+        events.append(("process_start", started))
+    for stage in STAGES[2:]:
+        if stage in _marks:
+            events.append((stage, _marks[stage] + offset))
+    timeline_events(component, events)
+    return False    # one-shot idle callback
@@ -0,0 +1,130 @@
+"""
+REB_Stat.py
+
+Shared, throttled linuxcnc.stat snapshots for the Rose Engine Butler
+GladeVCP handlers (hitcounter.py) and the MDI executor (REB_Mdi.py).
+
+Every consumer used to call s.poll() on its own whenever it wanted to
+look at the machine, so one button press could cost several NML round
+trips. A StatCache polls the status channel at most once per tick
+(by default [DISPLAY]CYCLE_TIME from the running INI file) and hands
+every caller the same immutable StatSnapshot. Each snapshot carries a
+generation number that goes up by one per poll, so a caller holding
+an old snapshot can tell that it is stale.
+
+A cache only polls when somebody asks for a snapshot. Components that
+never look at the machine (Help, Settings, License) therefore cost no
+status traffic at all; unless a stat object is passed in, the status
+channel itself is only opened by the first poll.
+"""
+
+import collections
+import os
+import threading
+import time
+
+import linuxcnc
+
+# Used when the INI file or its [DISPLAY]CYCLE_TIME can't be read.
+DEFAULT_TICK = 0.1
+
+StatSnapshot = collections.namedtuple("StatSnapshot", [
+    "generation",       # 1 for the first poll, +1 for every poll after
+    "time",             # time.monotonic() when the poll was taken
+    "task_mode",        # linuxcnc.MODE_MANUAL / MODE_AUTO / MODE_MDI
+    "task_state",       # linuxcnc.STATE_ESTOP / ... / STATE_ON
+    "exec_state",
+    "interp_state",     # linuxcnc.INTERP_IDLE / ...
+    "estop",
+    "enabled",
+    "current_vel",
+    "motion_line",      # line motion is executing
+    "current_line",     # line task is executing
+    "spindle_speeds",   # tuple, one commanded speed per spindle
+    "position",         # commanded position, X Y Z A B C U V W
+])
+
+
+def ini_tick():
+    '''
+    Polling tick in seconds, from [DISPLAY]CYCLE_TIME of the INI file
+    LinuxCNC was started with. Values of 1 or more are taken to be
+    milliseconds (REB.ini uses 100), smaller ones seconds.
+    '''
+    path = os.environ.get("INI_FILE_NAME")
+    if not path:
+        return DEFAULT_TICK
+    try:
+        value = float(linuxcnc.ini(path).find("DISPLAY", "CYCLE_TIME"))
+    except (linuxcnc.error, TypeError, ValueError):
+        return DEFAULT_TICK
+    if value <= 0:
+        return DEFAULT_TICK
+    return value / 1000.0 if value >= 1 else value
+
+
+class StatCache:
+    '''
+    Owns one linuxcnc.stat channel and shares snapshots of it.
+
+    Safe to use from the GTK main loop and from worker threads at the
+    same time; only one poll runs at a time.
+    '''
+
+    def __init__(self, stat=None, tick=None):
+        self._stat = stat
+        self.tick = tick if tick is not None else ini_tick()
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def poll(self):
+        '''
+        Polls the status channel now and returns the new snapshot.
+        For callers that are waiting on the machine and need fresh
+        data every time.
+        '''
+        with self._lock:
+            if self._stat is None:
+                self._stat = linuxcnc.stat()
+            s = self._stat
+            s.poll()
+            generation = 1
+            if self._snapshot is not None:
+                generation = self._snapshot.generation + 1
+            self._snapshot = StatSnapshot(
+                generation=generation,
+                time=time.monotonic(),
+                task_mode=s.task_mode,
+                task_state=s.task_state,
+                exec_state=s.exec_state,
+                interp_state=s.interp_state,
+                estop=s.estop,
+                enabled=s.enabled,
+                current_vel=s.current_vel,
+                motion_line=s.motion_line,
+                current_line=s.current_line,
+                spindle_speeds=tuple(spindle["speed"]
+                                     for spindle in s.spindle[:s.spindles]),
+                position=tuple(s.position),
+            )
+            return self._snapshot
+
+    def get(self, max_age=None):
+        '''
+        Returns the latest snapshot, polling first only if there is
+        none yet or it is older than max_age seconds (default: one
+        tick).
+        '''
+        if max_age is None:
+            max_age = self.tick
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot.time > max_age:
+            snapshot = self.poll()
+        return snapshot
+
+    def is_stale(self, snapshot):
+        '''
+        True if a newer snapshot than the one given has been taken.
+        '''
+        current = self._snapshot
+        return current is not None and current.generation != snapshot.generation
@@ -0,0 +1,217 @@
+"""
+REB_Timing.py
+
+Optional latency instrumentation for the Rose Engine Butler GladeVCP
+handlers (hitcounter.py), the MDI executor (REB_Mdi.py) and the HAL
+helpers (REB_Hal.py).
+
+When enabled, every HandlerClass callback is timed from the moment it
+is entered, and the phases that follow are recorded against the
+handler that started them:
+
+    handler   time spent inside the callback (blocking the GTK loop)
+    queued    entry -> the MDI worker picked the job up
+    mode      time taken by the mode check / mode change
+    mdi       entry -> the last c.mdi() (or program start) accepted
+    wait      entry -> wait_complete() returned
+    halcmd    duration of each halcmd process launched
+
+Results are kept per handler and phase as a window of recent samples,
+summarised as p50 / p95 / max. They are printed by dump(), which is
+also bound to SIGUSR1 (kill -USR1 <gladevcp pid>), and publish() can
+expose the per-phase summary over all handlers as HAL float pins.
+
+Timing is off unless the REB_TIMING environment variable, or failing
+that [DISPLAY]REB_TIMING in the INI file, is set to a non-zero value.
+When it is off, handlers are not wrapped and every hook below returns
+at its first line.
+"""
+
+import collections
+import os
+import signal
+import time
+
+PHASES = ("handler", "queued", "mode", "mdi", "wait", "halcmd")
+
+# Number of recent samples kept per handler and phase.
+WINDOW = 500
+
+# How often the HAL pins from publish() are refreshed, in ms.
+PUBLISH_INTERVAL = 1000
+
+
+def _enabled():
+    flag = os.environ.get("REB_TIMING")
+    if flag is None:
+        path = os.environ.get("INI_FILE_NAME")
+        if not path:
+            return False
+        try:
+            import linuxcnc
+            flag = linuxcnc.ini(path).find("DISPLAY", "REB_TIMING")
+        except Exception:
+            return False
+    return flag not in (None, "", "0")
+
+ENABLED = _enabled()
+
+_samples = collections.defaultdict(lambda: collections.deque(maxlen=WINDOW))
+_current = None
+
+
+class Trace:
+    '''
+    The timing context of one handler call: which handler it was and
+    when it was entered. MDI jobs carry the Trace of the handler that
+    submitted them.
+    '''
+
+    __slots__ = ("handler", "t0")
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.t0 = time.monotonic()
+
+
+def current():
+    '''
+    Trace of the handler running on the GTK loop right now, or None.
+    '''
+    return _current
+
+
+def mark(trace, phase):
+    '''
+    Records the time from the trace's handler entry until now.
+    '''
+    if trace is None:
+        return
+    _samples[(trace.handler, phase)].append(time.monotonic() - trace.t0)
+
+
+def record(trace, phase, seconds):
+    '''
+    Records a phase that has its own duration.
+    '''
+    if trace is None:
+        return
+    _samples[(trace.handler, phase)].append(seconds)
+
+
+def instrument(handler_obj):
+    '''
+    Wraps every public method of a gladevcp handler object so its
+    calls are timed. gladevcp collects callbacks with dir(), which
+    sees the wrappers set on the instance. Does nothing when timing is
+    disabled.
+    '''
+    if not ENABLED:
+        return
+    for name in dir(handler_obj):
+        if name.startswith("_"):
+            continue
+        method = getattr(handler_obj, name)
+        if callable(method):
+            setattr(handler_obj, name, _wrap(name, method))
+    signal.signal(signal.SIGUSR1, lambda signum, frame: dump())
+
+
+def _wrap(name, method):
+    def timed(*args, **kwargs):
+        global _current
+        trace = Trace(name)
+        _current = trace
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _current = None
+            mark(trace, "handler")
+    timed.__name__ = name
+    timed.__doc__ = method.__doc__
+    return timed
+
+
+def _percentile(ordered, pct):
+    index = int(round(pct / 100.0 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summary(values):
+    '''
+    (p50, p95, max) of a sequence of samples, or None if it is empty.
+    '''
+    if not values:
+        return None
+    ordered = sorted(values)
+    return (_percentile(ordered, 50), _percentile(ordered, 95), ordered[-1])
+
+
+def samples(handler, phase):
+    '''
+    The recent samples (in seconds) of one handler's phase.
+    '''
+    return list(_samples.get((handler, phase), ()))
+
+
+def reset():
+    '''
+    Forgets every sample recorded so far.
+    '''
+    _samples.clear()
+
+
+def dump():
+    '''
+    Prints p50 / p95 / max in ms for every handler and phase seen.
+    '''
+    print("=================================================")
+    print("REB timing (ms)          phase       n     p50     p95     max")
+    # The executor and stat threads add keys while this runs (it is
+    # also the SIGUSR1 handler), so work on a snapshot.
+    windows = list(_samples.items())
+    for (handler, phase), window in sorted(
+            windows, key=lambda item: (item[0][0], PHASES.index(item[0][1]))):
+        values = list(window)
+        p50, p95, peak = summary(values)
+        print("%-24s %-7s %6d %7.1f %7.1f %7.1f" % (
+            handler, phase, len(values), p50 * 1000, p95 * 1000, peak * 1000))
+
+
+def publish(halcomp):
+    '''
+    Creates Timing_<phase>_p50 / _p95 / _max HAL float pins (in ms,
+    over all handlers) on halcomp and keeps them updated. Must be
+    called before halcomp.ready(). Does nothing when timing is
+    disabled.
+    '''
+    if not ENABLED:
+        return None
+
+    import hal
+    import hal_glib
+    from gi.repository import GLib
+
+    pins = {}
+    for phase in PHASES:
+        for stat in ("p50", "p95", "max"):
+            name = "Timing_" + phase + "_" + stat
+            pins[name] = hal_glib.GPin(
+                halcomp.newpin(name, hal.HAL_FLOAT, hal.HAL_OUT)
+            )
+
+    def update():
+        for phase in PHASES:
+            values = []
+            for key, window in list(_samples.items()):
+                if key[1] == phase:
+                    values.extend(window)
+            result = summary(values)
+            if result is None:
+                continue
+            for stat, value in zip(("p50", "p95", "max"), result):
+                halcomp["Timing_" + phase + "_" + stat] = value * 1000
+        return True     # keep the timeout running
+
+    GLib.timeout_add(PUBLISH_INTERVAL, update)
+    return pins
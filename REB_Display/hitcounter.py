@@ -61,14 +61,26 @@
 # authorization from COPYRIGHT HOLDERS.
 #######################################################################
 
+# Imported first, so its clock covers the import of everything below.
+import REB_Startup
+
+# webbrowser and re are slow to import and only needed by a few
+# handlers; they are imported where they are used.
 import hal
 import hal_glib
-import glib
 import time
-import linuxcnc
-import webbrowser
-import subprocess
-import re
+import REB_Axis
+import REB_Hal
+import REB_Images
+import REB_Journal
+import REB_Lazy
+import REB_Mdi
+import REB_Program
+import REB_Rosette
+import REB_Session
+import REB_Settings
+import REB_Stat
+import REB_Timing
 from gi.repository import Gdk
 
 # Axis id (as used in REB_Settings_v1.ini and the Settings tab spin
@@ -86,15 +98,56 @@ AXIS_STEPGEN = {
     "Sp1": "07",
 }
 
-# Establish connection to command and status channels
-c = linuxcnc.command()
-s = linuxcnc.stat()
+# One descriptor per axis, from which REB_Axis.AxisEngine generates the
+# per-axis callbacks.
+AXES = REB_Axis.axis_table(AXIS_STEPGEN)
+REB_Session.add_axes(AXES)
+
+# Status channel, wrapped in a StatCache that polls it at most once per
+# [DISPLAY]CYCLE_TIME and shares the snapshot with every reader.
+stats = REB_Stat.StatCache()
+
+# Every MDI command goes through this executor, which waits for it to
+# complete on a background thread so no handler blocks the GTK main
+# loop. It owns the command channel.
+#
+# Neither connects to LinuxCNC until first used, so the tab components
+# that never move anything (Help, Settings, License) open no NML
+# channels and start no threads.
+mdi = REB_Mdi.MdiExecutor(None, stats)
+
+def _open_url(url):
+    '''
+    Opens url in the desktop's web browser. webbrowser is imported on
+    the first call; most components never open a link.
+    '''
+    import webbrowser
+    webbrowser.open(url)
+
+# A widget only the main panel's .ui has. The handler state the panel's
+# hand-written callbacks use is only set up in the component that has it.
+PANEL_WIDGET = "Sp0_Move_Stop"
 
 class HandlerClass:
     '''
     class with gladevcp callback handlers
     '''
 
+    def __setattr__(self, name, value):
+        '''
+        Records every change of a session value (REB_Session.FIELDS),
+        whichever handler or MDI callback makes it, for saving, and
+        keeps the Sp1_Ratio pin in step with Sp1_Pct.
+        '''
+        object.__setattr__(self, name, value)
+        session = self.__dict__.get("_session")
+        if session is not None and name in REB_Session.FIELDS:
+            session.record(name, value)
+        # Sp1 is geared to Sp0 in HAL (REB_Common.hal); its speed follows the
+        # ratio pin within a servo period.
+        if name == "Sp1_Pct" and "_sp1_ratio" in self.__dict__:
+            self.halcomp["Sp1_Ratio"] = value / 100
+
     def on_button_press(self,widget,data=None):
         '''
         a callback method
@@ -139,9 +192,9 @@ class HandlerClass:
     def _load_scale_settings(self):
         '''
         Reads persisted axis scale values from REB_Settings_v1.ini
-        (an XML file living alongside this script) and applies them
-        to the Settings tab's spin buttons and the real stepgen
-        position-scale HAL pins.
+        (see REB_Settings.py) and applies them to the Settings tab's
+        spin buttons and the real stepgen position-scale HAL pins. All
+        axes are restored in one REB_Hal.set_values() transaction.
 
         Only runs in the component that actually owns the Settings
         tab's spin buttons (X_Set_Scale etc.) - every other tab/panel
@@ -151,44 +204,218 @@ class HandlerClass:
         if self.builder.get_object("X_Set_Scale") is None:
             return
 
-        settings_path = "/home/reuben/linuxcnc/configs/RoseEngineButlerLocal/REB_Settings_v1.ini"
-
         try:
-            with open(settings_path, "r") as f:
-                xml_text = f.read()
-        except OSError as e:
-            print("Could not read " + settings_path + ": " + str(e))
+            settings = REB_Settings.Settings.load()
+        except REB_Settings.SettingsError as e:
+            print(str(e))
             return
+        stored = settings.values("scale")
 
+        # Scale changes made on this tab are saved back in the
+        # background (see the AxisEngine below).
+        self._settings = REB_Settings.SettingsWriter(settings)
+
+        # Build one command set covering every axis, then apply it as a
+        # single HAL transaction.
+        params = {}
         for axis_id, stepgen_ch in AXIS_STEPGEN.items():
-            match = re.search(
-                r'<axis\s+id="' + re.escape(axis_id) + r'">\s*<scale>([\d.]+)</scale>',
-                xml_text
-            )
-            if not match:
+            if axis_id not in stored:
                 print("No stored scale found for axis " + axis_id
-                      + " in " + settings_path)
+                      + " in " + settings.path)
                 continue
 
-            value = float(match.group(1))
-
             widget = self.builder.get_object(axis_id + "_Set_Scale")
             if widget is not None:
-                widget.set_value(value)
-
-            hal_pin = "hm2_7i92.0.stepgen." + stepgen_ch + ".position-scale"
-            try:
-                subprocess.run(
-                    ["halcmd", "setp", hal_pin, str(value)],
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                print("Restored " + hal_pin + " = " + str(value))
-            except subprocess.CalledProcessError as e:
-                print("Error restoring " + hal_pin + ": " + e.stderr)
-            except FileNotFoundError:
-                print("halcmd not found - is the LinuxCNC environment sourced?")
+                widget.set_value(stored[axis_id])
+
+            params[REB_Hal.stepgen_scale_param(stepgen_ch)] = stored[axis_id]
+
+        results = REB_Hal.set_values(params)
+
+        for axis_id, stepgen_ch in AXIS_STEPGEN.items():
+            hal_pin = REB_Hal.stepgen_scale_param(stepgen_ch)
+            if hal_pin not in results:
+                continue
+            if results[hal_pin]:
+                print("Restored " + axis_id + ": " + hal_pin + " = "
+                      + str(stored[axis_id]))
+            else:
+                print("Error restoring " + axis_id + ": " + hal_pin)
+
+    def _profile_name(self):
+        '''
+        The profile name typed or picked in Profile_Select.
+        '''
+        combo = self.builder.get_object("Profile_Select")
+        return combo.get_child().get_text().strip()
+
+    def _fill_profiles(self):
+        '''
+        Lists the stored profiles in Profile_Select, showing the one
+        last applied.
+        '''
+        combo = self.builder.get_object("Profile_Select")
+        if combo is None or self._settings is None:
+            return
+        settings = self._settings.settings
+        name = self._profile_name()
+        combo.remove_all()
+        for profile in settings.profiles:
+            combo.append_text(profile)
+        combo.get_child().set_text(name or settings.profile or "")
+
+    def _profile_applied(self, pin):
+        '''
+        Profile_Serial changed: the Settings tab has applied a profile.
+        Sets the panel's working values that differ from it; each
+        widget changed runs its callback as if the operator had
+        changed it.
+        '''
+        try:
+            settings = REB_Settings.Settings.load()
+        except REB_Settings.SettingsError as e:
+            print(str(e))
+            return
+        if settings.profile not in settings.profiles:
+            return
+        values = REB_Session.profile_attrs(settings.profiles[settings.profile])
+        changed = REB_Session.apply_changes(self, self.builder, values)
+        self._update_idx_deg()
+        print("Profile " + settings.profile + ": "
+              + (", ".join(changed) if changed else "nothing") + " changed")
+
+    def _update_idx_deg(self):
+        '''
+        Recomputes B_Idx_Deg and Sp0_Idx_Deg from the index distance
+        and Deg/Div mode.
+        '''
+        for axis_id in ("B", "Sp0"):
+            dist = getattr(self, axis_id + "_Idx_Dist")
+            if getattr(self, axis_id + "_Idx_DegDiv") == "Deg":
+                setattr(self, axis_id + "_Idx_Deg", round(dist, 1))
+            elif dist:
+                setattr(self, axis_id + "_Idx_Deg", round(360 / dist, 1))
+
+    def _fill_rosettes(self, path):
+        '''
+        Reads the rosettes in path and lists them in Rosette_Select.
+        '''
+        combo = self.builder.get_object("Rosette_Select")
+        self._rosettes = {}
+        for rosette in REB_Rosette.read_rosettes(path):
+            self._rosettes[rosette.name] = rosette
+            combo.append(rosette.name, rosette.name + " (" + str(rosette.lobes)
+                         + ")")
+
+    def _load_rosette(self):
+        '''
+        Loads the rosette Rosette_Name into reb-rosette.
+        '''
+        rosette = self._rosettes.get(self.Rosette_Name)
+        if rosette is None:
+            return
+        if REB_Rosette.load(rosette):
+            print("Loaded rosette " + rosette.name + ": "
+                  + str(rosette.lobes) + " lobes, "
+                  + str(len(rosette.values)) + " points")
+
+    def _count_index(self, counter, step, distance, position=None):
+        '''
+        Returns an MdiExecutor on_done callback that adds step to the
+        index counter attribute named counter once the move has
+        completed successfully, and journals the index. position is
+        the commanded spindle angle, which spindle callers must pass;
+        None reads the axis position.
+        Runs on the GTK main loop.
+        '''
+        def on_done(job):
+            if not job.ok:
+                return
+            setattr(self, counter, getattr(self, counter) + step)
+            print(counter + " = " + str(getattr(self, counter)))
+            self._journal_index(counter, step, distance, position)
+        return on_done
+
+    def _count_steps(self, counter, step, distance, position=None):
+        '''
+        Returns an MdiExecutor on_progress callback that adds step to
+        the index counter named counter, and journals the index, for
+        every completed step of a generated program. position(k) is
+        the commanded spindle angle of step k; None reads the axis
+        position. Runs on the GTK main loop.
+        '''
+        done = [0]
+        def on_progress(job, steps):
+            for i in range(steps):
+                done[0] += 1
+                setattr(self, counter, getattr(self, counter) + step)
+                self._journal_index(counter, step, distance,
+                                    position(done[0]) if position else None)
+            print(counter + " = " + str(getattr(self, counter)))
+        return on_progress
+
+    def _journal_index(self, counter, step, distance, position):
+        '''
+        Appends a completed index to the index journal (REB_Journal.py),
+        if there is one.
+        '''
+        if self._journal is None:
+            return
+        axis_id = counter[:-len("_Idx_Qty")]
+        if position is None:
+            # Only the axis letters have a position in stat; the
+            # spindle handlers pass the commanded angle. Never raise
+            # here, on the GTK main loop, for one that does not.
+            if len(axis_id) == 1 and axis_id in "XYZABCUVW":
+                position = stats.get().position["XYZABCUVW".index(axis_id)]
+            else:
+                position = 0.0
+        self._journal.append(axis_id, step, distance,
+                             getattr(self, counter), position)
+
+    def _reset_index(self, counter):
+        '''
+        Sets the index counter attribute named counter back to 0 and
+        journals the reset, so the next start does not restore the old
+        count.
+        '''
+        setattr(self, counter, 0)
+        print(counter + " = 0")
+        if self._journal is not None:
+            self._journal.reset(counter[:-len("_Idx_Qty")])
+
+    def _repeat_index(self, title, header, step_gcodes, count, counter,
+                      step, distance, position=None, moves=True):
+        '''
+        Runs count index steps as one generated program instead of
+        count separate MDI jobs. step_gcodes(k) returns the G-code lines
+        of step k (1 .. count); counter is kept in sync, and the
+        journal written, step by step (see _count_steps). moves is
+        False for steps that only orient spindles (M19).
+        '''
+        program = REB_Program.Program(
+            "REB repeat index: " + title + " x " + str(count), header,
+            moves=moves
+        )
+        for k in range(1, count + 1):
+            program.add_step(step_gcodes(k))
+
+        mdi.submit_program(
+            program,
+            on_progress=self._count_steps(counter, step, distance, position)
+        )
+
+    def _sp0_angle(self, step):
+        '''
+        Returns angle(k), the Sp0 orient angle k indexes of step (1
+        forward, -1 reverse) on from the current Sp0_Idx_Qty, so single
+        presses and repeats walk the same sequence of positions.
+        '''
+        start = self.Sp0_Idx_Qty
+        deg = self.Sp0_Idx_Deg
+        def angle(k):
+            return round(((start + k * step) * deg) % 360, 3)
+        return angle
 
 # ********************************************************************
 #    AA    XX    XX IIIIIIII  SSSSSS      BBBBBBB
@@ -213,38 +440,37 @@ class HandlerClass:
 # Data
 #   Read from UI:       B_Feed - Feed rate set by user
 #   Program Variables
-#       Referenced:     (none)
+#       Referenced:     self.B_Idx_Rpt - indexes per press
 #       Set:            B_Idx_Qty - the quantity of indexes so far.
 #                           Forward increases this value.
 #   Written to UI:      B_Idx_Qty - the quantity of indexes so far.
 #                           Forward increases this value.
 # ---------------------------------------------------------------------
-# Gcodes Called:    (none)
+# Gcodes Called:        G0 (as a generated program when repeating)
 #######################################################################
     def B_Move_Idx_Fwd(self,widget):
 
         print("=================================================")
         print("FUNCTION B_Move_Idx_Fwd")
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
+        # Send an MDI command to move along the axis. The executor
+        # waits for the move off the GTK main loop.
         Gcode = "G0 B" + str(self.B_Idx_Deg) + " F" + str(self.B_Feed)
 
         print(Gcode)
-        c.mdi(Gcode)
 
-        # Wait for the command to complete
-        c.wait_complete()
+        # Repeat mode runs all the indexes as one program, incrementing
+        # the count as each one completes.
+        if self.B_Idx_Rpt > 1:
+            print("repeat x " + str(self.B_Idx_Rpt))
+            self._repeat_index("B", ["G91"], lambda k: [Gcode],
+                               self.B_Idx_Rpt, "B_Idx_Qty", 1,
+                               self.B_Idx_Deg)
+            return
 
-        # increment the count and write out to the UI
-        self.B_Idx_Qty = self.B_Idx_Qty + 1
-        Prt1 = "B_Idx_Qty = " + str(self.B_Idx_Qty)
-        print(Prt1)
+        # increment the count once the move has completed
+        mdi.submit([Gcode], on_done=self._count_index("B_Idx_Qty", 1,
+                                                      self.B_Idx_Deg))
 
         # B_Idx_Qtystr = str(self.B_Idx_Qty)
         # widget.set_label(B_Idx_Qty, B_Idx_Qtystr)
@@ -263,37 +489,65 @@ class HandlerClass:
 # Data
 #   Read from UI:       B_Feed - Feed rate set by user
 #   Program Variables
-#       Referenced:     (none)
+#       Referenced:     self.B_Idx_Rpt - indexes per press
 #       Set:            B_Idx_Qty - the quantity of indexes so far. Reverse
 #                           decreases this value.
 #   Written to UI:      B_Idx_Qty - the quantity of indexes so far. Reverse
 #                           decreases this value.
 # ---------------------------------------------------------------------
-# Gcodes Called:        (none)
+# Gcodes Called:        G0 (as a generated program when repeating)
 #######################################################################
     def B_Move_Idx_Rev(self,widget):
 
         print("=================================================")
         print("FUNCTION B_Move_Idx_Rev")
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
+        # Send an MDI command to move along the axis. The executor
+        # waits for the move off the GTK main loop.
         Gcode = "G0 B-" + str(self.B_Idx_Deg) + " F" + str(self.B_Feed)
 
         print(Gcode)
-        c.mdi(Gcode)
 
-        self.B_Idx_Qty = self.B_Idx_Qty - 1
-        Prt1 = "B_Idx_Qty = " + str(self.B_Idx_Qty)
-        print(Prt1)
+        # Repeat mode runs all the indexes as one program, decrementing
+        # the count as each one completes.
+        if self.B_Idx_Rpt > 1:
+            print("repeat x " + str(self.B_Idx_Rpt))
+            self._repeat_index("B", ["G91"], lambda k: [Gcode],
+                               self.B_Idx_Rpt, "B_Idx_Qty", -1,
+                               self.B_Idx_Deg)
+            return
+
+        # decrement the count once the move has completed
+        mdi.submit([Gcode], on_done=self._count_index("B_Idx_Qty", -1,
+                                                      self.B_Idx_Deg))
+
+#######################################################################
+# B_Reset_Idx_Qty
+# Purpose:              This is used to set the B axis index count back
+#                       to 0, e.g. at the start of a new piece, and
+#                       record the reset in the index journal.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
+# ---------------------------------------------------------------------
+# Called from:
+#   UI:                 REB_Panel
+#   Button:             B_Idx_Reset  (Hal_Button)
+#   Signal:             GtkButton/pressed
+# ---------------------------------------------------------------------
+# Data
+#   Read from UI:       (none)
+#   Program Variables
+#       Referenced:     (none)
+#       Set:            B_Idx_Qty - the quantity of indexes so far.
+#   Written to UI:      (none)
+# ---------------------------------------------------------------------
+# Gcodes Called:        (none)
+#######################################################################
+    def B_Reset_Idx_Qty(self,widget):
 
-        # Wait for the command to complete
-        c.wait_complete()
+        print("=================================================")
+        print("FUNCTION B_Reset_Idx_Qty")
+
+        self._reset_index("B_Idx_Qty")
 
 #######################################################################
 # Sp0_Set_Idx_DegDiv
@@ -337,109 +591,6 @@ class HandlerClass:
         Prt2 = "self.B_Idx_DegDiv = " + self.B_Idx_DegDiv
         print(Prt2)
 
-#######################################################################
-# B_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the B axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             B_Move_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       B_Move_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.B_Move_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def B_Set_Move_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION B_Set_Move_Dist")
-
-        self.B_Move_Dist = widget.get_value()
-
-        print("B_Move_Dist = " + str(self.B_Move_Dist))
-
-#######################################################################
-# B_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           B axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             B_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
-#######################################################################
-    def B_Set_Scale(self,widget):
-
-        print("=================================================")
-        print("FUNCTION B_Set_Scale")
-
-        B_Scale = round(widget.get_value(), 1)
-
-        # B_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own B_Ena_Override pin
-        # (ANDed with the panel button in REB_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.B_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("B axis is enabled - disabling")
-                self.halcomp['B_Ena_Override'] = False
-            else:
-                print("B axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.05.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(B_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(B_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
 #######################################################################
 # B_Set_Idx_Dist
 # Purpose:              This is used to set the rotational distance
@@ -510,6 +661,36 @@ class HandlerClass:
         Prt1 = "B_Feed = " + str(self.B_Feed)
         print(Prt1)
 
+#######################################################################
+# B_Set_Idx_Repeat
+# Purpose:              This is used to set how many indexes the
+#                       B axis runs per press of its index buttons.
+#                       More than one runs them as a single generated
+#                       program.
+# Updated:              ver 1.0, 21 July 2026, R. Colvin
+# ---------------------------------------------------------------------
+# Called from:
+#   UI:                 REB_Panel
+#   Button:             B_Idx_Repeat  (Hal_SpinButton)
+#   Signal:             GtkSpinButton/value-changed
+# ---------------------------------------------------------------------
+# Data
+#   Read from UI:       B_Idx_Repeat
+#   Program Variables
+#       Referenced:     (none)
+#       Set:            self.B_Idx_Rpt
+#   Written to UI:      (none)
+# ---------------------------------------------------------------------
+# Gcodes Called:        (none)
+#######################################################################
+    def B_Set_Idx_Repeat(self,widget):
+
+        print("=================================================")
+        print("FUNCTION B_Set_Idx_Repeat")
+
+        self.B_Idx_Rpt = int(widget.get_value())
+        print("self.B_Idx_Rpt = " + str(self.B_Idx_Rpt))
+
 
 # ********************************************************************
 #    AA     LL       LL              AA    XX    XX EEEEEEEE  SSSSSS 
@@ -546,7 +727,7 @@ class HandlerClass:
         print("FUNCTION OpenGcodeLibrary")
 
         url = "https://gcode.RoseEngineButler.com"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -577,7 +758,7 @@ class HandlerClass:
         print("FUNCTION OpenGcodeQuickReference")
 
         url = "https://linuxcnc.org/docs/html/gcode.html"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -610,7 +791,7 @@ class HandlerClass:
         print("FUNCTION OpenLibrary")
 
         url = "https://www.RoseEngineButler.com"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -641,7 +822,7 @@ class HandlerClass:
         print("FUNCTION OpenOTHandyBook")
 
         url = "https://mdfre2.colvintools.com/Documents/OTHB.pdf"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -672,7 +853,7 @@ class HandlerClass:
         print("FUNCTION OpenUserForum")
 
         url = "https://RoseEngineButler.com/Forum"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -703,7 +884,7 @@ class HandlerClass:
         print("FUNCTION OpenUserManual")
 
         url = "https://manual.RoseEngineButler.com"
-        webbrowser.open(url)
+        _open_url(url)
 
         Prt1 = "Opening website " + url
         print(Prt1)
@@ -733,7 +914,6 @@ class HandlerClass:
 #   Read from UI:       (none)
 #   Program Variables
 #       Referenced:     self.Sp0_Feed
-#                       self.Sp1_Pct
 #       Set:            (none)
 #   Written to UI:      (none)
 # ---------------------------------------------------------------------
@@ -744,34 +924,20 @@ class HandlerClass:
         print("=================================================")
         print("FUNCTION Sp0_Move_Fwd")
 
-        # Ensure the system is in MDI mode
-        c.mode(linuxcnc.MODE_MDI)
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Set the feed rates
-        Sp1_Feed = self.Sp1_Pct * self.Sp0_Feed / 100
-
-        # Send an MDI command to set the spindles' speed.
+        # MDI command to set the spindle's speed. Sp1 follows Sp0
+        # through the gearing in HAL (Sp1_Ratio).
         sSp0_Feed = "S" + str(self.Sp0_Feed) + " $0"
-        sSp1_Feed = "S" + str(Sp1_Feed) + " $1"
 
         print(sSp0_Feed)
-        c.mdi(sSp0_Feed)
-
-        print(sSp1_Feed)
-        c.mdi(sSp1_Feed)
 
-        # Send an MDI command to start spindles rotating.
+        # MDI command to start spindles rotating.
         Gcode = "M3 $-1"
 
         print(Gcode)
-        c.mdi(Gcode)
 
-        # Wait for the command to complete
-        c.wait_complete()
+        # Send both as one job; the executor waits for them off the
+        # GTK main loop.
+        mdi.submit([sSp0_Feed, Gcode])
 
 #######################################################################
 # Sp0_Move_Idx_Fwd
@@ -788,46 +954,53 @@ class HandlerClass:
 #   Read from UI:       (none)
 #   Program Variables
 #       Referenced:     self.Sp0_Idx_Deg
-#                       self.Sp1_Pct
-#       Set:            (none)
-#   Written to UI:      B_Idx_Qty - the quantity of indexes so far.
+#                       self.Sp0_Idx_Qty - the index positions count on
+#                           from it
+#                       self.Sp0_Idx_Rpt - indexes per press
+#       Set:            Sp0_Idx_Qty - the quantity of indexes so far.
 #                           Forward increases this value.
+#   Written to UI:      (none)
 # ---------------------------------------------------------------------
-# Gcodes Called:        M19
+# Gcodes Called:        S, M19 (as a generated program when repeating)
 #######################################################################
     def Sp0_Move_Idx_Fwd(self,widget):
 
         print("=================================================")
         print("FUNCTION Sp0_Move_Idx_Fwd")
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
         # Set spindle rotational speeds
-        GcodeStr1 = "S0 " + str(self.Sp0_Feed)
+        GcodeStr1 = "S" + str(self.Sp0_Feed) + " $0"
         print(GcodeStr1)
 
-        Sp1_Feed = self.Sp0_Feed * self.Sp1_Pct / 100
-        GcodeStr2 = "S1 " + str(Sp1_Feed)
-        print(GcodeStr2)
-
-        c.mdi(GcodeStr1)
-        c.mdi(GcodeStr2)
+        # Only Sp0 is oriented: Sp1 is geared to Sp0 in HAL (sp1-gear
+        # in REB_Common.hal), so it stops when Sp0 does and an M19 $1
+        # would not move it.
+
+        # Index positions on from the current count, shared by a
+        # single press and a repeat.
+        angle = self._sp0_angle(1)
+
+        # Repeat mode orients the spindle to each successive index
+        # position in one program, counting as each one completes.
+        if self.Sp0_Idx_Rpt > 1:
+            print("repeat x " + str(self.Sp0_Idx_Rpt))
+            def step_gcodes(k):
+                return ["M19 R" + str(angle(k)) + " Q10 P1 $0"]
+            self._repeat_index("Sp0", [GcodeStr1], step_gcodes,
+                               self.Sp0_Idx_Rpt, "Sp0_Idx_Qty", 1,
+                               self.Sp0_Idx_Deg, angle, moves=False)
+            return
 
-        # Send MDI command to start spindles rotating.
-        GcodeStr3 = "M19 R" + str(self.Sp0_Idx_Deg) + " Q10 P1 $0"
+        # MDI command to orient the spindle to the next index position.
+        GcodeStr3 = "M19 R" + str(angle(1)) + " Q10 P1 $0"
         print(GcodeStr3)
-        c.mdi(GcodeStr3)
 
-        GcodeStr4 = "M19 R" + str(self.Sp0_Idx_Deg) + " Q10 P1 $1"
-        print(GcodeStr4)
-        c.mdi(GcodeStr4)
-
-        # Wait for the command to complete
-        c.wait_complete()
+        # Send them as one job; the executor waits for them off the
+        # GTK main loop.
+        mdi.submit([GcodeStr1, GcodeStr3],
+                   on_done=self._count_index("Sp0_Idx_Qty", 1,
+                                             self.Sp0_Idx_Deg,
+                                             angle(1)))
 
 #######################################################################
 # Sp0_Move_Idx_Rev
@@ -844,45 +1017,78 @@ class HandlerClass:
 #   Read from UI:       (none)
 #   Program Variables
 #       Referenced:     self.Sp0_Idx_Deg
-#                       self.Sp1_Pct
-#       Set:            (none)
-#   Written to UI:      B_Idx_Qty - the quantity of indexes so far.
-#                           Forward increases this value.
+#                       self.Sp0_Idx_Qty - the index positions count on
+#                           from it
+#                       self.Sp0_Idx_Rpt - indexes per press
+#       Set:            Sp0_Idx_Qty - the quantity of indexes so far.
+#                           Reverse decreases this value.
+#   Written to UI:      (none)
 # ---------------------------------------------------------------------
-# Gcodes Called:        M19
+# Gcodes Called:        S, M19 (as a generated program when repeating)
 #######################################################################
     def Sp0_Move_Idx_Rev(self,widget):
 
         print("=================================================")
         print("FUNCTION Sp0_Move_Idx_Rev")
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
         # Set spindle rotational speeds
-        GcodeStr1 = "S0 " + str(self.Sp0_Feed)
+        GcodeStr1 = "S" + str(self.Sp0_Feed) + " $0"
         print(GcodeStr1)
 
-        Sp1_Feed = self.Sp0_Feed * self.Sp1_Pct / 100
-        GcodeStr2 = "S1 " + str(Sp1_Feed)
-        print(GcodeStr2)
-
-        c.mdi(GcodeStr1)
-        c.mdi(GcodeStr2)
+        # Index positions back from the current count, shared by a
+        # single press and a repeat.
+        angle = self._sp0_angle(-1)
+
+        # Repeat mode orients the spindle to each successive index
+        # position (going backwards) in one program, counting down as
+        # each one completes.
+        if self.Sp0_Idx_Rpt > 1:
+            print("repeat x " + str(self.Sp0_Idx_Rpt))
+            def step_gcodes(k):
+                return ["M19 R" + str(angle(k)) + " Q10 P2 $0"]
+            self._repeat_index("Sp0", [GcodeStr1], step_gcodes,
+                               self.Sp0_Idx_Rpt, "Sp0_Idx_Qty", -1,
+                               self.Sp0_Idx_Deg, angle, moves=False)
+            return
 
-        # Send MDI commands to start spindles rotating.
-        GcodeStr3 = "M19 R" + str(self.Sp0_Idx_Deg) + " Q10 P2 $0"
+        # MDI command to orient the spindle to the next index position.
+        GcodeStr3 = "M19 R" + str(angle(1)) + " Q10 P2 $0"
         print(GcodeStr3)
-        GcodeStr4 = "M19 R" + str(Sp1_Idx_Deg) + " Q10 P1 $1"
-        print(GcodeStr4)
 
-        c.mdi(GcodeStr3)
+        # Send them as one job; the executor waits for them off the
+        # GTK main loop.
+        mdi.submit([GcodeStr1, GcodeStr3],
+                   on_done=self._count_index("Sp0_Idx_Qty", -1,
+                                             self.Sp0_Idx_Deg,
+                                             angle(1)))
+
+#######################################################################
+# Sp0_Reset_Idx_Qty
+# Purpose:              This is used to set the Sp0 spindle index count
+#                       back to 0, e.g. at the start of a new piece, and
+#                       record the reset in the index journal.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
+# ---------------------------------------------------------------------
+# Called from:
+#   UI:                 REB_Panel
+#   Button:             Sp0_Idx_Reset  (Hal_Button)
+#   Signal:             GtkButton/pressed
+# ---------------------------------------------------------------------
+# Data
+#   Read from UI:       (none)
+#   Program Variables
+#       Referenced:     (none)
+#       Set:            Sp0_Idx_Qty - the quantity of indexes so far.
+#   Written to UI:      (none)
+# ---------------------------------------------------------------------
+# Gcodes Called:        (none)
+#######################################################################
+    def Sp0_Reset_Idx_Qty(self,widget):
+
+        print("=================================================")
+        print("FUNCTION Sp0_Reset_Idx_Qty")
 
-        # Wait for the command to complete
-        c.wait_complete()
+        self._reset_index("Sp0_Idx_Qty")
 
 #######################################################################
 # Sp0_Move_Rev
@@ -900,7 +1106,6 @@ class HandlerClass:
 #   Read from UI:       (none)
 #   Program Variables
 #       Referenced:     self.Sp0_Feed
-#                       self.Sp1_Pct
 #       Set:            (none)
 #   Written to UI:      (none)
 # ---------------------------------------------------------------------
@@ -911,35 +1116,21 @@ class HandlerClass:
         print("=================================================")
         print("FUNCTION Sp0_Move_Rev")
 
-        # Ensure the system is in MDI mode
-        c.mode(linuxcnc.MODE_MDI)
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # In case the values had not already been written to the
-        # Gcode S values, write them.
-        Sp1_Feed = self.Sp1_Pct * self.Sp0_Feed / 100
-
-        # Send an MDI command to set the spindles' speed.
+        # In case the value had not already been written to the
+        # Gcode S value, write it. Sp1 follows Sp0 through the gearing
+        # in HAL (Sp1_Ratio).
         sSp0_Feed = "S" + str(self.Sp0_Feed) + " $0"
-        sSp1_Feed = "S" + str(Sp1_Feed) + " $1"
 
         print(sSp0_Feed)
-        c.mdi(sSp0_Feed)
-
-        print(sSp1_Feed)
-        c.mdi(sSp1_Feed)
 
-        # Send an MDI command to start spindles rotating.
+        # MDI command to start spindles rotating.
         Gcode = "M4 $-1"
 
         print(Gcode)
-        c.mdi(Gcode)
 
-        # Wait for the command to complete
-        c.wait_complete()
+        # Send both as one job; the executor waits for them off the
+        # GTK main loop.
+        mdi.submit([sSp0_Feed, Gcode])
 
 #######################################################################
 # Move_Stop
@@ -958,36 +1149,30 @@ class HandlerClass:
 #       Set:            (none)
 #   Written to UI:      (none)
 # ---------------------------------------------------------------------
-# Gcodes Called:        M5
+# Gcodes Called:        M5 (after the abort)
 #######################################################################
     def Move_Stop(self,widget):
 
+        pressed_at = time.monotonic()
+
         print("=================================================")
         print("FUNCTION Move_Stop")
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to stop the spindles from rotating.
+        # Abort at once through the executor's priority stop lane -
+        # this bypasses and drops any queued or in-flight MDI work and
+        # halts motion and both spindles. M5 then follows as the first
+        # new job so the interpreter's spindle state matches.
         Gcode = "M5"
 
-        print(Gcode)
-        c.mdi(Gcode)
-
-        c.mdi("M5")
-
-        # Wait for the command to complete
-        c.wait_complete()
+        print("abort, then " + Gcode)
+        mdi.stop(pressed_at, followup=[Gcode])
 
 #######################################################################
 # Sp0_Set_Feed
 # Purpose:              This is used to set the base feed rate for the
 #                           spindle (Sp0) & the rosette phaser
-#                           multiplier (Sp1).  (Sp1 gets multiplied
-#                           by the value of Sp1Pct
+#                           multiplier (Sp1).  (Sp1 follows Sp0 at
+#                           Sp1Pct through the gearing in HAL)
 # Updated:              ver 1.0, 21 July 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
@@ -1013,26 +1198,14 @@ class HandlerClass:
         self.Sp0_Feed = round(widget.get_value(), 1)
         print("self.Sp0_Feed = " + str(self.Sp0_Feed))
 
-        Sp1_Feed = round(self.Sp0_Feed * self.Sp1_Pct / 100, 2)
-
         Gcode0 = "S" + str(self.Sp0_Feed) + " $0"
-        Gcode1 = "S" + str(Sp1_Feed) + " $1"
 
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI commands to set the spindle speeds.
+        # Send an MDI command to set the spindle speed; Sp1 follows it
+        # through the gearing in HAL. Holding the spin button down
+        # fires this on every tick; only the last value is sent, once
+        # the button has been released.
         print(Gcode0)
-        c.mdi(Gcode0)
-
-        print(Gcode1)
-        c.mdi(Gcode1)
-
-        # Wait for the command to complete
-        c.wait_complete()
+        mdi.submit_coalesced("Sp0_Set_Feed", [Gcode0])
 
 #######################################################################
 # Sp0_Set_Idx_bW_DegDiv
@@ -1140,78 +1313,34 @@ class HandlerClass:
                 print("Sp0_Idx_Bool = True")
 
 #######################################################################
-# Sp0_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           Sp0 Spindle.
+# Sp0_Set_Idx_Repeat
+# Purpose:              This is used to set how many indexes the
+#                       Sp0 spindle runs per press of its index buttons.
+#                       More than one runs them as a single generated
+#                       program.
 # Updated:              ver 1.0, 21 July 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             Sp0_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
+#   UI:                 REB_Panel
+#   Button:             Sp0_Idx_Repeat  (Hal_SpinButton)
+#   Signal:             GtkSpinButton/value-changed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Sp0_Idx_Repeat
 #   Program Variables
 #       Referenced:     (none)
-#       Set:            (none)
+#       Set:            self.Sp0_Idx_Rpt
 #   Written to UI:      (none)
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
 #######################################################################
-    def Sp0_Set_Scale(self,widget):
+    def Sp0_Set_Idx_Repeat(self,widget):
 
         print("=================================================")
-        print("FUNCTION Sp0_Set_Scale")
-
-        Sp0_Scale = round(widget.get_value(), 1)
-
-        # Sp0_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own Sp0_Ena_Override pin
-        # (ANDed with the panel button in RESp0_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.Sp0_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("Sp0 axis is enabled - disabling")
-                self.halcomp['Sp0_Ena_Override'] = False
-            else:
-                print("Sp0 axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
+        print("FUNCTION Sp0_Set_Idx_Repeat")
 
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.06.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(Sp0_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(Sp0_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
+        self.Sp0_Idx_Rpt = int(widget.get_value())
+        print("self.Sp0_Idx_Rpt = " + str(self.Sp0_Idx_Rpt))
 
 # ********************************************************************
 #  SSSSSS  PPPPPPP  IIIIIIII N     NN DDDDDDD  LL       EEEEEEEE  1111
@@ -1300,1379 +1429,338 @@ class HandlerClass:
 #       Referenced:     (none)
 #       Set:            self.Sp1_Pct
 #   Written to UI:      (none)
+#   HAL pins:           Sp1_Ratio - Sp1 / Sp0 speed ratio
 # ---------------------------------------------------------------------
-# Gcodes Called:        S
+# Gcodes Called:        (none)
 #######################################################################
     def Sp1_Set_Move_Pct(self,widget):
 
         print("=================================================")
         print("FUNCTION Sp1_Set_Move_Pct")
 
+        # Setting Sp1_Pct writes the Sp1_Ratio pin (see __setattr__);
+        # the gearing in HAL applies it within one servo period, with
+        # no MDI command.
         self.Sp1_Pct = round(widget.get_value(), 2)
-        Sp1_Feed = round(self.Sp0_Feed * self.Sp1_Pct / 100, 2)
-
-        Gcode1 = "S" + str(Sp1_Feed) + " $1"
 
-        print("self.Sp0_Feed = " + str(self.Sp0_Feed))
         print("self.Sp1_Pct = " + str(self.Sp1_Pct))
-        print("Sp1_Feed = " + str(Sp1_Feed))
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
+        print("Sp1_Ratio = " + str(self.Sp1_Pct / 100))
 
-        # Send an MDI command to set the spindle speed.
-        print(Gcode1)
-        c.mdi(Gcode1)
-
-        # Wait for the command to complete
-        c.wait_complete()
+# ********************************************************************
+# RRRRRR    OOOOOO   SSSSSS  EEEEEEEE TTTTTTTT TTTTTTTT EEEEEEEE
+# RR   RR  OO    OO SS    SS EE          TT       TT    EE
+# RR   RR  OO    OO  SSS     EEEEE       TT       TT    EEEEE
+# RRRRRR   OO    OO     SSS  EE          TT       TT    EE
+# RR   RR  OO    OO SS    SS EE          TT       TT    EE
+# RR    RR  OOOOOO   SSSSSS  EEEEEEEE    TT       TT    EEEEEEEE
+# ********************************************************************
 
 #######################################################################
-# Sp1_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           Sp1 Spindle.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
+# Rosette_Select
+# Purpose:              This is used to pick the rosette the electronic
+#                       rosette (reb-rosette in REB_Rosette.tcl)
+#                       follows, from the rosettes in [DISPLAY]
+#                       REB_ROSETTE_FILE, and load its profile into the
+#                       component.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             Sp1_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
+#   UI:                 REB_Panel
+#   Button:             Rosette_Select  (GtkComboBoxText)
+#   Signal:             GtkComboBox/changed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Rosette_Select - rosette name
 #   Program Variables
-#       Referenced:     (none)
-#       Set:            (none)
+#       Referenced:     self._rosettes
+#       Set:            self.Rosette_Name
 #   Written to UI:      (none)
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
 # ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
+# HAL Commands:         REB_Rosette.load
+#                           reb-rosette.points, .lobes, .point-NNN,
+#                           .serial
 #######################################################################
-    def Sp1_Set_Scale(self,widget):
+    def Rosette_Select(self,widget):
 
         print("=================================================")
-        print("FUNCTION Sp1_Set_Scale")
-
-        Sp1_Scale = round(widget.get_value(), 1)
-
-        # Sp1_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own Sp1_Ena_Override pin
-        # (ANDed with the panel button in RESp1_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.Sp1_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("Sp1 axis is enabled - disabling")
-                self.halcomp['Sp1_Ena_Override'] = False
-            else:
-                print("Sp1 axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.07.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(Sp1_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(Sp1_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
+        print("FUNCTION Rosette_Select")
 
-# ********************************************************************
-#    AA    XX    XX IIIIIIII  SSSSSS      UU    UU
-#   AAAA    XX  XX    II     SS    SS     UU    UU
-#  AA  AA    XXXX     II      SSS         UU    UU
-# AAAAAAAA   XXXX     II         SSS      UU    UU
-# AA    AA  XX  XX    II     SS    SS     UU    UU
-# AA    AA XX    XX IIIIIIII  SSSSSS       UUUUUU
-# ********************************************************************
+        name = widget.get_active_id()
+        if name is None:
+            return
+        self.Rosette_Name = name
+        self._load_rosette()
 
 #######################################################################
-# U_Idx_Minus
-# Purpose:              This is used to index the U axis in the
-#                           minus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
+# Rosette_Set_OnOff
+# Purpose:              This is used to switch the electronic rosette
+#                       on or off. Off eases the X offset back to 0.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
 #   UI:                 REB_Panel
-#   Button:             U_Idx_Minus
-#   Signal:             GtkButton/pressed
+#   Button:             Rosette_OnOff  (HAL_CheckButton)
+#   Signal:             GtkToggleButton/toggled
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Rosette_OnOff
 #   Program Variables
-#       Referenced:     self.U_Feed
-#                       self.U_Idx_Dist
-#       Set:            (none)
+#       Referenced:     (none)
+#       Set:            self.Rosette_Bool
 #   Written to UI:      (none)
+#   HAL pins:           Rosette_OnOff - reb-rosette.enable
 # ---------------------------------------------------------------------
-# Gcodes Called:        G0
+# Gcodes Called:        (none)
 #######################################################################
-    def U_Idx_Minus(self,widget):
+    def Rosette_Set_OnOff(self,widget):
 
         print("=================================================")
-        print("FUNCTION U_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
+        print("FUNCTION Rosette_Set_OnOff")
 
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 U-" + str(self.X_Idx_Dist) + " F" + str(self.X_Feed)
+        # The widget's own pin switches the component (REB_PostGUI.hal).
+        self.Rosette_Bool = widget.get_active()
 
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
+        print("Rosette_Bool = " + str(self.Rosette_Bool))
 
 #######################################################################
-# U_Idx_Plus
-# Purpose:              This is used to index the U axis in the
-#                           plus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
+# Rosette_Set_Phase
+# Purpose:              This is used to set the phase of the rosette,
+#                       in degrees of Sp0 rotation.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
 #   UI:                 REB_Panel
-#   Button:             U_Idx_Plus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.U_Feed
-#                       self.U_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def U_Idx_Plus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION U_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 U" + str(self.U_Idx_Dist) + " F" + str(self.U_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# U_Set_Feed
-# Purpose:              This is used to set the movement speed for the
-#                           U axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             U_Feed (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       U_Feed
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.U_Feed
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def U_Set_Feed(self,widget):
-
-        print("=================================================")
-        print("FUNCTION U_Set_Feed")
-
-        self.U_Feed = round(widget.get_value(), 1)
-
-        print("U_Set_Feed =")
-        print(self.U_Feed)
-
-#######################################################################
-# U_Set_Idx_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the U axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             U_Idx_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       U_Idx_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.U_Idx_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def U_Set_Idx_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION U_Set_Idx_Dist")
-
-        self.U_Idx_Dist = widget.get_value()
-
-        print("U_Idx_Dist_chg_value =")
-        print(self.U_Idx_Dist)
-
-#######################################################################
-# U_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the U axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             U_Move_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       U_Move_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.U_Move_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def U_Set_Move_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION U_Set_Move_Dist")
-
-        self.U_Move_Dist = widget.get_value()
-
-        print("U_Move_Dist = " + str(self.U_Move_Dist))
-
-#######################################################################
-# U_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           U axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             U_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
-#######################################################################
-    def U_Set_Scale(self,widget):
-
-        print("=================================================")
-        print("FUNCTION U_Set_Scale")
-
-        U_Scale = round(widget.get_value(), 1)
-
-        # U_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own U_Ena_Override pin
-        # (ANDed with the panel button in REU_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.U_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("U axis is enabled - disabling")
-                self.halcomp['U_Ena_Override'] = False
-            else:
-                print("U axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.02.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(U_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(U_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-# ********************************************************************
-#    AA    XX    XX IIIIIIII  SSSSSS      VV    VV
-#   AAAA    XX  XX    II     SS    SS     VV    VV
-#  AA  AA    XXXX     II      SSS         VV    VV
-# AAAAAAAA   XXXX     II         SSS       VV  VV
-# AA    AA  XX  XX    II     SS    SS       VVVV
-# AA    AA XX    XX IIIIIIII  SSSSSS         VV
-# ********************************************************************
-
-#######################################################################
-# V_Idx_Minus
-# Purpose:              This is used to index the V axis in the
-#                           minus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             V_Idx_Minus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.V_Feed
-#                       self.V_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def V_Idx_Minus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 V-" + str(self.V_Idx_Dist) + " F" + str(self.V_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# V_Idx_Plus
-# Purpose:              This is used to index the V axis in the
-#                           plus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             V_Idx_Plus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.V_Feed
-#                       self.V_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def V_Idx_Plus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 V" + str(self.V_Idx_Dist) + " F" + str(self.V_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# V_Set_Feed
-# Purpose:              This is used to set the movement speed for the
-#                           V axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             V_Feed (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       V_Feed
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.V_Feed
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def V_Set_Feed(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Set_Feed")
-
-        self.V_Feed = round(widget.get_value(), 1)
-
-        print("V_Set_Feed =")
-        print(self.V_Feed)
-
-#######################################################################
-# V_Set_Idx_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the V axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             V_Idx_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       V_Idx_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.V_Idx_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def V_Set_Idx_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Set_Idx_Dist")
-
-        self.V_Idx_Dist = widget.get_value()
-
-        print("V_Idx_Dist =")
-        print(self.V_Idx_Dist)
-
-#######################################################################
-# V_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the V axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             U_Move_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       V_Move_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.V_Move_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def V_Set_Move_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Set_Move_Dist")
-
-        self.V_Move_Dist = widget.get_value()
-
-        print("V_Move_Dist = " + str(self.V_Move_Dist))
-
-#######################################################################
-# V_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           V axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             V_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
-#######################################################################
-    def V_Set_Scale(self,widget):
-
-        print("=================================================")
-        print("FUNCTION V_Set_Scale")
-
-        V_Scale = round(widget.get_value(), 1)
-
-        # V_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own V_Ena_Override pin
-        # (ANDed with the panel button in REV_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.V_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("V axis is enabled - disabling")
-                self.halcomp['V_Ena_Override'] = False
-            else:
-                print("V axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.03.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(V_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(V_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-# ********************************************************************
-#    AA    XX    XX IIIIIIII  SSSSSS      WW       WW
-#   AAAA    XX  XX    II     SS    SS     WW       WW
-#  AA  AA    XXXX     II      SSS         WW   W   WW
-# AAAAAAAA   XXXX     II         SSS       WW WWW WW
-# AA    AA  XX  XX    II     SS    SS       WWW WWW
-# AA    AA XX    XX IIIIIIII  SSSSSS         W   W
-# ********************************************************************
-
-#######################################################################
-# W_Idx_Minus
-# Purpose:              This is used to index the W axis in the
-#                           minus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             W_Idx_Minus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.W_Feed
-#                       self.W_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def W_Idx_Minus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION W_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 W-" + str(self.W_Idx_Dist) + " F" + str(self.W_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# W_Idx_Plus
-# Purpose:              This is used to index the W axis in the
-#                           plus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             W_Idx_Plus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.W_Feed
-#                       self.W_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def W_Idx_Plus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION W_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 W" + str(self.W_Idx_Dist) + " F" + str(self.W_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# W_Set_Feed
-# Purpose:              This is used to set the movement speed for the
-#                           W axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             W_Feed (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       W_Feed
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.W_Feed
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        M5
-#######################################################################
-    def W_Set_Feed(self,widget):
-
-        print("=================================================")
-        print("FUNCTION W_Set_Feed")
-
-        self.W_Feed = round(widget.get_value(), 1)
-
-        print("W_Set_Feed =")
-        print(self.W_Feed)
-
-#######################################################################
-# W_Set_Idx_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the W axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             W_Idx_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       W_Idx_Dist
-#   Program Variables
-#       Referenced:     self.W_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        M5
-#######################################################################
-    def W_Set_Idx_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION W_Set_Idx_Dist_by_Deg")
-
-        self.W_Idx_Dist = widget.get_value()
-
-        print("W_Idx_Dist =")
-        print(self.W_Idx_Dist)
-
-#######################################################################
-# W_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the W axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             W_Move_Dist (on setting the value)
+#   Button:             Rosette_Phase  (HAL_SpinButton)
 #   Signal:             GtkSpinButton/value-changed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       W_Move_Dist
+#   Read from UI:       Rosette_Phase
 #   Program Variables
 #       Referenced:     (none)
-#       Set:            self.W_Move_Dist
+#       Set:            self.Rosette_Phase
 #   Written to UI:      (none)
+#   HAL pins:           Rosette_Phase-f - reb-rosette.phase
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
 #######################################################################
-    def W_Set_Move_Dist(self,widget):
+    def Rosette_Set_Phase(self,widget):
 
         print("=================================================")
-        print("FUNCTION W_Set_Move_Dist")
+        print("FUNCTION Rosette_Set_Phase")
 
-        self.W_Move_Dist = widget.get_value()
+        # The widget's own pin drives the component (REB_PostGUI.hal);
+        # the value is only kept for the session.
+        self.Rosette_Phase = round(widget.get_value(), 1)
 
-        print("W_Move_Dist = " + str(self.W_Move_Dist))
+        print("self.Rosette_Phase = " + str(self.Rosette_Phase))
 
 #######################################################################
-# W_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           W axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
+# Rosette_Set_Scale
+# Purpose:              This is used to set the amplitude of the
+#                       rosette: the X offset at the top of a lobe.
+# Updated:              ver 1.0, 18 October 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             W_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
+#   UI:                 REB_Panel
+#   Button:             Rosette_Scale  (HAL_SpinButton)
+#   Signal:             GtkSpinButton/value-changed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Rosette_Scale
 #   Program Variables
 #       Referenced:     (none)
-#       Set:            (none)
+#       Set:            self.Rosette_Scale
 #   Written to UI:      (none)
+#   HAL pins:           Rosette_Scale-f - reb-rosette.scale
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
 #######################################################################
-    def W_Set_Scale(self,widget):
+    def Rosette_Set_Scale(self,widget):
 
         print("=================================================")
-        print("FUNCTION W_Set_Scale")
-
-        W_Scale = round(widget.get_value(), 1)
-
-        # W_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own W_Ena_Override pin
-        # (ANDed with the panel button in REB_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.W_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
+        print("FUNCTION Rosette_Set_Scale")
 
-            if is_enabled:
-                print("W axis is enabled - disabling")
-                self.halcomp['W_Ena_Override'] = False
-            else:
-                print("W axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.00.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(W_Scale)]
+        # The widget's own pin drives the component (REB_PostGUI.hal);
+        # the value is only kept for the session.
+        self.Rosette_Scale = round(widget.get_value(), 3)
 
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(W_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
+        print("self.Rosette_Scale = " + str(self.Rosette_Scale))
 
 # ********************************************************************
-#    AA    XX    XX IIIIIIII  SSSSSS      YY    YY
-#   AAAA    XX  XX    II     SS    SS      YY  YY
-#  AA  AA    XXXX     II      SSS           YYYY
-# AAAAAAAA   XXXX     II         SSS        XXXX
-# AA    AA  XX  XX    II     SS    SS      XX   XX
-# AA    AA XX    XX IIIIIIII  SSSSSS      XX     XX
+# PPPPPPP  RRRRRR    OOOOOO  FFFFFFFF IIIIIIII LL       EEEEEEEE  SSSSSS
+# PP    PP RR   RR  OO    OO FF          II    LL       EE       SS    SS
+# PP    PP RR   RR  OO    OO FFFFF       II    LL       EEEEE     SSS
+# PPPPPPP  RRRRRR   OO    OO FF          II    LL       EE           SSS
+# PP       RR   RR  OO    OO FF          II    LL       EE       SS    SS
+# PP       RR    RR  OOOOOO  FF       IIIIIIII LLLLLLLL EEEEEEEE  SSSSSS
 # ********************************************************************
 
 #######################################################################
-# X_Idx_Minus
-# Purpose:              This is used to index the X axis in the
-#                           minus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             X_Idx_Minus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.X_Feed
-#                       self.X_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def X_Idx_Minus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION X_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 X-" + str(self.X_Idx_Dist) + " F" + str(self.X_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# X_Idx_Plus
-# Purpose:              This is used to index the X axis in the
-#                           plus direction.
+# Profile_Apply
+# Purpose:              This is used to apply a named profile (a
+#                       machine or job setup stored in
+#                       REB_Settings_v1.ini): its scales here, its
+#                       working values on the main panel. Only the
+#                       values that differ from the current ones are
+#                       written.
 # Updated:              ver 1.0, 21 July 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
-#   UI:                 REB_Panel
-#   Button:             X_Idx_Plus
+#   UI:                 REB_Tab_Settings
+#   Button:             Profile_Apply  (GtkButton)
 #   Signal:             GtkButton/pressed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Profile_Select - profile name
 #   Program Variables
-#       Referenced:     self.X_Feed
-#                       self.X_Idx_Dist
+#       Referenced:     self._settings
 #       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def X_Idx_Plus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION X_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 X" + str(self.X_Idx_Dist) + " F" + str(self.X_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# X_Set_Feed
-# Purpose:              This is used to set the movement speed for the
-#                           X axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             X_Feed (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       X_Feed
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.X_Feed
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def X_Set_Feed(self,widget):
-
-        print("=================================================")
-        print("FUNCTION X_Set_Feed")
-
-        self.X_Feed = round(widget.get_value(), 1)
-
-        print("X_Set_Feed =")
-        print(self.X_Feed)
-
-#######################################################################
-# X_Set_Idx_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the X axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             X_Idx_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       X_Idx_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.X_Idx_Dist
-#   Written to UI:      (none)
+#   Written to UI:      <axis>_Set_Scale
+#   HAL pins:           Profile_Serial - counted up once the profile
+#                           is saved as applied; the main panel then
+#                           applies its working values
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
-#######################################################################
-    def X_Set_Idx_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION X_Set_Idx_Dist")
-
-        self.X_Idx_Dist = widget.get_value()
-
-        print("X_Idx_Dist =")
-        print(self.X_Idx_Dist)
-
-#######################################################################
-# X_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the X axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             X_Move_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       X_Move_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.X_Move_Dist
-#   Written to UI:      (none)
 # ---------------------------------------------------------------------
-# Gcodes Called:        (none)
+# HAL Commands:         REB_Hal.set_values
+#                           <stepgen>.position-scale
 #######################################################################
-    def X_Set_Move_Dist(self,widget):
+    def Profile_Apply(self,widget):
 
         print("=================================================")
-        print("FUNCTION X_Set_Move_Dist")
-
-        self.X_Move_Dist = widget.get_value()
+        print("FUNCTION Profile_Apply")
 
-        print("X_Move_Dist = " + str(self.X_Move_Dist))
+        if self._settings is None:
+            print("No settings file - profiles are not available")
+            return
+        settings = self._settings.settings
+        name = self._profile_name()
+        if name not in settings.profiles:
+            print("No profile named " + repr(name))
+            return
+        profile = settings.profiles[name]
+
+        # The Set_Scale callbacks the spin buttons fire only collect
+        # the new scales; the batch writes the ones that changed in a
+        # single HAL transaction when it ends.
+        with self.axes.batch() as scales:
+            for axis_id, fields in profile.items():
+                spin = self.builder.get_object(axis_id + "_Set_Scale")
+                if spin is None or "scale" not in fields:
+                    continue
+                spin.set_value(fields["scale"])
+                scales[axis_id] = round(spin.get_value(), 1)
+
+        # Save straight away, so the file the main panel reads has it.
+        self._settings.modify(settings.select_profile, name)
+        self._settings.flush()
+        self.halcomp["Profile_Serial"] = self.halcomp["Profile_Serial"] + 1
+
+        Prt1 = "Applied profile " + name
+        print(Prt1)
 
 #######################################################################
-# X_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           X axis.
+# Profile_Save
+# Purpose:              This is used to save the current scales and
+#                       the main panel's working values as a named
+#                       profile, replacing any profile of that name.
 # Updated:              ver 1.0, 21 July 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
 #   UI:                 REB_Tab_Settings
-#   Button:             X_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
+#   Button:             Profile_Save  (GtkButton)
+#   Signal:             GtkButton/pressed
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
+#   Read from UI:       Profile_Select - profile name
+#                       <axis>_Set_Scale
 #   Program Variables
-#       Referenced:     (none)
+#       Referenced:     self._settings
 #       Set:            (none)
-#   Written to UI:      (none)
+#   Written to UI:      Profile_Select - list of profiles
 # ---------------------------------------------------------------------
 # Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.04.position-scale
-#                              (value)
 #######################################################################
-    def X_Set_Scale(self,widget):
+    def Profile_Save(self,widget):
 
         print("=================================================")
-        print("FUNCTION X_Set_Scale")
+        print("FUNCTION Profile_Save")
 
-        X_Scale = round(widget.get_value(), 1)
+        if self._settings is None:
+            print("No settings file - profiles are not available")
+            return
+        name = self._profile_name()
+        if not name:
+            print("Enter a name for the profile first")
+            return
 
-        # X_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own X_Ena_Override pin
-        # (ANDed with the panel button in REB_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.X_ENA_Status"
+        axes = {}
+        for axis_id in AXIS_STEPGEN:
+            spin = self.builder.get_object(axis_id + "_Set_Scale")
+            if spin is not None:
+                axes[axis_id] = {"scale": round(spin.get_value(), 1)}
+
+        # The panel's working values, as last saved to the session
+        # file (up to REB_Settings.FLUSH_DELAY seconds behind).
+        session_path = REB_Session.session_path()
+        if session_path is not None:
+            working = REB_Session.Session.load(session_path).values
+            working = REB_Session.profile_values(working)
+            for axis_id, fields in working.items():
+                axes.setdefault(axis_id, {}).update(fields)
 
         try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("X axis is enabled - disabling")
-                self.halcomp['X_Ena_Override'] = False
-            else:
-                print("X axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the X axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.04.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(X_Scale)]
+            self._settings.modify(self._settings.settings.set_profile,
+                                  name, axes)
+        except REB_Settings.SettingsError as e:
+            print("Could not save profile " + name + ": " + str(e))
+            return
+        self._settings.flush()
+        self._fill_profiles()
 
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(X_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
+        Prt1 = "Saved profile " + name
+        print(Prt1)
 
 # ********************************************************************
-#    AA    XX    XX IIIIIIII  SSSSSS      ZZZZZZZZ
-#   AAAA    XX  XX    II     SS    SS          ZZ
-#  AA  AA    XXXX     II      SSS             ZZ
-# AAAAAAAA   XXXX     II         SSS        ZZ
-# AA    AA  XX  XX    II     SS    SS      ZZ
-# AA    AA XX    XX IIIIIIII  SSSSSS      ZZZZZZZZ
+#    AA    XX    XX IIIIIIII  SSSSSS      EEEEEEEE NN    NN  GGGGGG
+#   AAAA    XX  XX    II     SS    SS     EE       NNN   NN GG
+#  AA  AA    XXXX     II      SSS         EEEEE    NN NN NN GG  GGG
+# AAAAAAAA   XXXX     II         SSS      EE       NN  NNNN GG    GG
+# AA    AA  XX  XX    II     SS    SS     EE       NN    NN GG    GG
+# AA    AA XX    XX IIIIIIII  SSSSSS      EEEEEEEE NN    NN  GGGGGG
 # ********************************************************************
 
 #######################################################################
-# Z_Idx_Minus
-# Purpose:              This is used to index the Z axis in the
-#                           minus direction.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             Z_Idx_Minus
-#   Signal:             GtkButton/pressed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     self.Z_Feed
-#                       self.Z_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        G0
-#######################################################################
-    def Z_Idx_Minus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 Z-" + str(self.Z_Idx_Dist) + " F" + str(self.Z_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# Z_Idx_Plus
-# Purpose:              This is used to index the Z axis in the
-#                           plus direction.
+# <axis>_Idx_Minus, <axis>_Idx_Plus, <axis>_Set_Feed,
+# <axis>_Set_Idx_Dist, <axis>_Set_Move_Dist, <axis>_Set_Scale
+# Purpose:              These per-axis callbacks are not written out
+#                       here. REB_Axis.AxisEngine generates them for
+#                       every axis in AXIS_STEPGEN when the handler is
+#                       created (see REB_Axis.py for which axis gets
+#                       which).
 # Updated:              ver 1.0, 21 July 2026, R. Colvin
 # ---------------------------------------------------------------------
 # Called from:
-#   UI:                 REB_Panel
-#   Button:             Z_Idx_Plus
-#   Signal:             GtkButton/pressed
+#   UI:                 REB_Panel, REB_Tab_Settings
+#   Button:             <axis>_Idx_Minus / _Idx_Plus (GtkButton/pressed)
+#                       <axis>_Feed, _Idx_Dist, _Move_Dist, _Set_Scale
+#                           (GtkSpinButton/value-changed)
 # ---------------------------------------------------------------------
 # Data
-#   Read from UI:       (none)
 #   Program Variables
-#       Referenced:     self.Z_Feed
-#                       self.Z_Idx_Dist
-#       Set:            (none)
-#   Written to UI:      (none)
+#       Referenced:     self.<axis>_Feed
+#                       self.<axis>_Idx_Dist
+#       Set:            self.<axis>_Feed
+#                       self.<axis>_Idx_Dist
+#                       self.<axis>_Move_Dist
 # ---------------------------------------------------------------------
 # Gcodes Called:        G0
-#######################################################################
-    def Z_Idx_Plus(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Idx_Minus")
-
-        # Ensure the system is in MDI mode
-        s.poll()
-        if s.task_state != linuxcnc.MODE_MDI:
-                c.mode(linuxcnc.MODE_MDI)
-                c.wait_complete() # Wait for mode change to complete
-
-        # Send an MDI command to move along the axis.
-        Gcode = "G0 Z" + str(self.Z_Idx_Dist) + " F" + str(self.Z_Feed)
-
-        print(Gcode)
-        c.mdi(Gcode)
-
-        # Wait for the command to complete
-        c.wait_complete()
-
-#######################################################################
-# Z_Set_Feed
-# Purpose:              This is used to set the movement speed for the
-#                           Z axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             Z_Feed (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       Z_Feed
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.Z_Feed
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        M5
-#######################################################################
-    def Z_Set_Feed(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Set_Feed")
-
-        self.Z_Feed = round(widget.get_value(), 1)
-
-        print("Z_Set_Feed =")
-        print(self.Z_Feed)
-
-#######################################################################
-# Z_Set_Idx_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the Z axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Linear
-#   Button:             Z_Idx_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       Z_Idx_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.Z_Idx_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        M5
-#######################################################################
-    def Z_Set_Idx_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Set_Idx_Dist")
-
-        self.Z_Idx_Dist = widget.get_value()
-
-        print("Z_Idx_Dist =")
-        print(self.Z_Idx_Dist)
-
-#######################################################################
-# Z_Set_Move_Dist
-# Purpose:              This is used to set the movement distance for
-#                           the Z axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Panel
-#   Button:             Z_Move_Dist (on setting the value)
-#   Signal:             GtkSpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       Z_Move_Dist
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            self.Z_Move_Dist
-#   Written to UI:      (none)
-# ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-#######################################################################
-    def Z_Set_Move_Dist(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Set_Move_Dist")
-
-        self.Z_Move_Dist = widget.get_value()
-
-        print("Z_Move_Dist = " + str(self.Z_Move_Dist))
-
-#######################################################################
-# Z_Set_Scale
-# Purpose:              This is used to set the scale distance for the
-#                           Z axis.
-# Updated:              ver 1.0, 21 July 2026, R. Colvin
-# ---------------------------------------------------------------------
-# Called from:
-#   UI:                 REB_Tab_Settings
-#   Button:             Z_Set_Scale (on setting the value)
-#   Signal:             HAL_SpinButton/value-changed
-# ---------------------------------------------------------------------
-# Data
-#   Read from UI:       (none)
-#   Program Variables
-#       Referenced:     (none)
-#       Set:            (none)
-#   Written to UI:      (none)
 # ---------------------------------------------------------------------
-# Gcodes Called:        (none)
-# ---------------------------------------------------------------------
-# HAL Commands:         halcmd setp hm2_7i92.0.stepgen.01.position-scale
-#                              (value)
+# HAL Commands:         REB_Hal.set_value
+#                           <stepgen>.position-scale
 #######################################################################
-    def Z_Set_Scale(self,widget):
-
-        print("=================================================")
-        print("FUNCTION Z_Set_Scale")
-
-        Z_Scale = round(widget.get_value(), 1)
-
-        # Z_ENA_Status belongs to the main panel's HAL component
-        # ("gladevcp"); read it cross-component via halcmd. To disable
-        # the axis, drive this component's own Z_Ena_Override pin
-        # (ANDed with the panel button in REB_PostGUI.hal) instead of
-        # trying to write another component's pin directly.
-        status_pin = "gladevcp.Z_ENA_Status"
-
-        try:
-            result = subprocess.run(
-                ["halcmd", "getp", status_pin],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            is_enabled = result.stdout.strip().upper() in ("TRUE", "1")
-            print(status_pin + " = " + result.stdout.strip())
-
-            if is_enabled:
-                print("Z axis is enabled - disabling")
-                self.halcomp['Z_Ena_Override'] = False
-            else:
-                print("Z axis is already disabled")
-        except subprocess.CalledProcessError as e:
-            print("Error checking " + status_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
-
-        # Send the new scale to the Z axis stepgen via halcmd.
-        hal_pin = "hm2_7i92.0.stepgen.01.position-scale"
-        cmd = ["halcmd", "setp", hal_pin, str(Z_Scale)]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("Set " + hal_pin + " = " + str(Z_Scale))
-        except subprocess.CalledProcessError as e:
-            print("Error setting " + hal_pin + ": " + e.stderr)
-        except FileNotFoundError:
-            print("halcmd not found - is the LinuxCNC environment sourced?")
 
 #######################################################################
 # __init__
@@ -2696,11 +1784,28 @@ class HandlerClass:
         self.builder        = builder
         self.nhits          = 0
 
-        # Independent pins this component owns, used to force each
-        # axis disabled from this tab regardless of what the main
-        # panel's own enable button is doing. Each defaults to "allow
-        # enabled". ANDed with the panel button per-axis in
-        # REB_PostGUI.hal (REBHlp.<Axis>_Ena_Override).
+        # Fill the images a .cached.ui leaves out from the pre-decoded
+        # cache (REB_Images.py) rather than decoding the PNGs.
+        REB_Images.load(self.builder)
+
+        # A tab listed in [DISPLAY]REB_LAZY_TABS starts on a placeholder
+        # .ui; its real .ui is built the first time the tab is shown
+        # (REB_Lazy.py). Nothing below applies to the placeholder.
+        lazy_ui = REB_Lazy.lazy_ui(useropts)
+        if lazy_ui is not None:
+            self._lazy_tab = REB_Lazy.LazyTab(self, lazy_ui)
+            self._lazy_tab.attach(self.builder)
+
+        # REB.ini loads this file into four gladevcp components (the
+        # main panel, REBHlp, REBCnfg and REBUsg), each with its own
+        # .ui. Only the pins and state the loaded .ui needs are built.
+
+        # Independent pins the Settings tab (REBCnfg) owns, used to
+        # force each axis disabled from that tab regardless of what the
+        # main panel's own enable button is doing. Each defaults to
+        # "allow enabled". ANDed with the panel button per-axis in
+        # REB_PostGUI.hal (REBCnfg.<Axis>_Ena_Override). Only created
+        # for axes whose <Axis>_Set_Scale spin button is in this .ui.
         #
         # Per the GladeVCP docs, an output pin must be created via
         # hal_glib.GPin(halcomp.newpin(...)) - not a bare newpin() -
@@ -2709,6 +1814,8 @@ class HandlerClass:
         # garbage-collected.
         self._ena_override_pins = {}
         for axis_id in AXIS_STEPGEN:
+            if self.builder.get_object(axis_id + "_Set_Scale") is None:
+                continue
             pin_name = axis_id + "_Ena_Override"
             self._ena_override_pins[axis_id] = hal_glib.GPin(
                 self.halcomp.newpin(pin_name, hal.HAL_BIT, hal.HAL_OUT)
@@ -2718,10 +1825,35 @@ class HandlerClass:
         # Restore persisted axis scale values (REB_Settings_v1.ini)
         # into the Settings tab's spin buttons and the real stepgen
         # scale pins. No-ops in every component other than the
-        # Settings tab (REBHlp), which is the only one with these
-        # widgets.
+        # Settings tab (REBCnfg), which is the only one with these
+        # widgets. There, it also sets up self._settings, which saves
+        # scale changes back to the file.
+        self._settings = None
         self._load_scale_settings()
 
+        # Generate the per-axis callbacks (X_Idx_Plus, U_Set_Feed,
+        # B_Set_Scale, ...) this .ui has widgets for, along with the
+        # self.<axis>_Feed / _Idx_Dist / _Move_Dist values they use.
+        self.axes = REB_Axis.AxisEngine(self, mdi, AXES, self._settings)
+        self.axes.bind(self.builder)
+
+        # Named profiles on the Settings tab (Profile_Apply,
+        # Profile_Save). Profile_Serial tells the main panel when one
+        # has been applied (REB_PostGUI.hal).
+        if self.builder.get_object("Profile_Select") is not None:
+            self._profile_serial = hal_glib.GPin(
+                self.halcomp.newpin("Profile_Serial", hal.HAL_S32,
+                                    hal.HAL_OUT)
+            )
+            self._fill_profiles()
+
+        # Everything below belongs to the main panel only.
+        if self.builder.get_object(PANEL_WIDGET) is None:
+            return
+
+        # Latency summary pins, only when timing is enabled.
+        REB_Timing.publish(self.halcomp)
+
         ###############################################################
         # Global Program Variables - declare and set initial value.
         ###############################################################
@@ -2731,6 +1863,7 @@ class HandlerClass:
         self.B_Idx_DegDiv   = "Deg"     # B axis index by degrees or divisions
         self.B_Idx_Dist     = 90.0      # B axis index distance
         self.B_Idx_Qty      = 0         # B axis index counter
+        self.B_Idx_Rpt      = 1         # B axis indexes per press
         self.B_Move_Dist    = 0.0       # B axis move distance
 
         self.Sp0_Feed       = 1.0       # Sp0 Speed
@@ -2739,36 +1872,72 @@ class HandlerClass:
         self.Sp0_Idx_Deg    = 90.0      # Sp0 index degrees
         self.Sp0_Idx_Dist   = 90.0      # B axis index distance
         self.Sp0_Idx_Qty    = 0         # Sp0 axis index counter
+        self.Sp0_Idx_Rpt    = 1         # Sp0 indexes per press
 
         self.Sp1_Idx_Bool   = False     # Index this spindle?
         self.Sp1_Idx_Dist   = 90.0      # Sp1 index degrees
         self.Sp1_Idx_Qty    = 0         # Sp1 axis index counter
         self.Sp1_Pct        = 100.0     # Sp1 speed percentage of Sp0 speed
 
-        self.U_Feed         = 1.0       # U axis feed rate
-        self.U_Idx_Dist     = 0.0       # U axis index distance
-        self.U_Idx_Qty      = 0         # U axis index counter
-        self.U_Move_Dist    = 0.0       # U axis move distance
-
-        self.V_Feed         = 1.0       # V axis feed rate
-        self.V_Idx_Dist     = 0.0       # V axis index distance
-        self.V_Idx_Qty      = 0         # V axis index counter
-        self.V_Move_Dist    = 0.0       # V axis move distance
-
-        self.W_Feed         = 1.0       # W axis feed rate
-        self.W_Idx_Dist     = 0.0       # W axis index distance
-        self.W_Idx_Qty      = 0         # W axis index counter
-        self.W_Move_Dist    = 0.0       # W axis move distance
-
-        self.X_Feed         = 1.0       # X axis feed rate
-        self.X_Idx_Dist     = 0.0       # X axis index distance
-        self.X_Idx_Qty      = 0         # X axis index counter
-        self.X_Move_Dist    = 0.0       # X axis move distance
-
-        self.Z_Feed         = 1.0       # Z axis feed rate
-        self.Z_Idx_Dist     = 0.0       # Z axis index distance
-        self.Z_Idx_Qty      = 0         # Z axis index counter
-        self.Z_Move_Dist    = 0.0       # Z axis move distance
+        self.Rosette_Bool   = False     # Electronic rosette on?
+        self.Rosette_Name   = ""        # Rosette followed
+        self.Rosette_Phase  = 0.0       # Rosette phase, degrees
+        self.Rosette_Scale  = 0.0       # Rosette amplitude
+
+        # List the rosettes of [DISPLAY]REB_ROSETTE_FILE
+        # (REB_Rosette.py), before the session restores the one last
+        # picked.
+        self._rosettes = {}
+        rosette_path = REB_Rosette.rosette_path()
+        if rosette_path is not None:
+            self._fill_rosettes(rosette_path)
+
+        # Rebuild the index counters from the index journal
+        # (REB_Journal.py), which every completed index is appended to.
+        self._journal = None
+        journal_path = REB_Journal.journal_path()
+        if journal_path is not None:
+            self._journal = REB_Journal.Journal(journal_path)
+            for axis_id, count in self._journal.counters().items():
+                counter = axis_id + "_Idx_Qty"
+                if hasattr(self, counter):
+                    setattr(self, counter, count)
+                    print("Restored " + counter + " = " + str(count))
+
+        # Restore the working values of the last session
+        # (REB_Session.py) in one batch, then keep saving them as they
+        # change (see __setattr__).
+        session_path = REB_Session.session_path()
+        if session_path is not None:
+            session = REB_Session.Session.load(session_path)
+            session.apply(self, self.builder)
+            self._update_idx_deg()
+            self._session = REB_Session.SessionWriter(session)
+
+        # Load the rosette picked into reb-rosette (the first one if the
+        # session has none that is still listed). It starts switched
+        # off whatever the last session did.
+        if self._rosettes:
+            combo = self.builder.get_object("Rosette_Select")
+            if combo.get_active_id() is None:
+                combo.set_active(0)
+            self.Rosette_Name = combo.get_active_id()
+            self._load_rosette()
+
+        # Sp1's speed is Sp0's times Sp1_Ratio, computed in the servo
+        # thread (sp1-gear in REB_Common.hal, netted in REB_PostGUI.hal).
+        self._sp1_ratio = hal_glib.GPin(
+            self.halcomp.newpin("Sp1_Ratio", hal.HAL_FLOAT, hal.HAL_OUT)
+        )
+        self.halcomp["Sp1_Ratio"] = self.Sp1_Pct / 100
+
+        # Apply a profile's working values whenever the Settings tab
+        # (REBCnfg.Profile_Serial, netted in REB_PostGUI.hal) has
+        # applied one.
+        self._profile_serial = hal_glib.GPin(
+            self.halcomp.newpin("Profile_Serial", hal.HAL_S32, hal.HAL_IN)
+        )
+        self._profile_serial.connect("value-changed", self._profile_applied)
 
 def get_handlers(halcomp,builder,useropts):
     '''
@@ -2779,6 +1948,16 @@ def get_handlers(halcomp,builder,useropts):
 
     the 'get_handlers' name is reserved - gladevcp expects it, so do not change
     '''
-    return [HandlerClass(halcomp,builder,useropts)]
+    handler = HandlerClass(halcomp,builder,useropts)
+
+    # Time every callback when REB_TIMING is set (see REB_Timing.py).
+    REB_Timing.instrument(handler)
+
+    # Report this component's startup time once it is up.
+    REB_Startup.mark("handlers")
+    REB_Startup.report_when_ready(halcomp.getprefix())
+    return [handler]
+
+REB_Startup.mark("imported")
 
 #
@@ -0,0 +1,131 @@
+#######################################################################
+#                    RRRRRR    EEEEEEEE  BBBBBBB                      #
+#                    RR   RR   EE        BB    BB                     #
+#                    RR   RR   EE        BB    BB                     #
+#                    RRRRRR    EEEEEE    BBBBBBB                      #
+#                    RR   RR   EE        BB    BB                     #
+#                    RR    RR  EE        BB    BB                     #
+#                    RR    RR  EEEEEEEE  BBBBBBB                      #
+#                                                                     #
+# Rose Engine Butler                                                  #
+#######################################################################
+#                                                                     #
+# LinuxCNC configuration for use with a Rose Engine                   #
+#                                                                     #
+# File:                                                               #
+#   REB_Rosette.tcl                                                   #
+#                                                                     #
+# Purpose:                                                            #
+#   This is used to setup the electronic rosette                      #
+#   (REB_Comp/reb_rosette.comp). It is a Tcl HAL file so that a       #
+#   machine without the component still starts: if reb_rosette is     #
+#   not installed (REB_Setup/REB_Update.sh has not been run since     #
+#   it was added) the rosette is left out, X runs without its         #
+#   external offset, and a message says how to add it. Loaded after   #
+#   REB_Common.hal by both REB.ini and REB_Sim.ini.                   #
+#                                                                     #
+# End User Customisation:                                             #
+#   The end user of the Rose Engine Butler system should not modify   #
+#   this file.  Changes to this file are not supported by Colvin      #
+#   Tools nor Brainwave Embedded.                                     #
+#                                                                     #
+# Version                                                             #
+#   1.0 - 18 October 2026, R. Colvin                                  #
+#                                                                     #
+# Copyright (c) 2026 Colvin Tools and Brainwave Embedded.             #
+#                                                                     #
+# The following MIT/X Consortium License applies to the Rose Engine   #
+# Butler system. Use of this system constitutes consent to the terms  #
+# outlined below.                                                     #
+#                                                                     #
+# Permission is hereby granted, free of charge, to any person         #
+# obtaining a copy of this software and associated documentation      #
+# files (the "Software"), to deal in the Software without             #
+# restriction, including without limitation the rights to use, copy,  #
+# modify, merge, publish, distribute, sublicense, and/or sell copies  #
+# of the Software, and to permit persons to whom the Software is      #
+# furnished to do so, subject to the following conditions:            #
+#                                                                     #
+#       The above copyright notice and this permission notice shall   #
+#       be included in all copies or substantial portions of the      #
+#       Software.                                                     #
+#                                                                     #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,     #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF  #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND               #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN  #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN   #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE    #
+# SOFTWARE.                                                           #
+#                                                                     #
+# Except as contained in this notice, the name of COPYRIGHT HOLDERS   #
+# shall not be used in advertising or otherwise to promote the sale,  #
+# use or other dealings in this Software without prior written        #
+# authorization from COPYRIGHT HOLDERS.                               #
+#######################################################################
+
+# ********************************************************************
+# RRRRRR    OOOOOO   SSSSSS  EEEEEEEE TTTTTTTT TTTTTTTT EEEEEEEE
+# RR   RR  OO    OO SS    SS EE          TT       TT    EE
+# RR   RR  OO    OO  SSS     EEEEE       TT       TT    EEEEE
+# RRRRRR   OO    OO     SSS  EE          TT       TT    EE
+# RR   RR  OO    OO SS    SS EE          TT       TT    EE
+# RR    RR  OOOOOO   SSSSSS  EEEEEEEE    TT       TT    EEEEEEEE
+# ********************************************************************
+#
+# Electronic rosette: rocks the X axis with the rosette profile
+# selected on the panel as Sp0 turns, looked up and interpolated every
+# servo period. The offset goes through X's external offset, so the
+# planner keeps it within [AXIS_X]OFFSET_AV_RATIO of X's velocity and
+# acceleration. Switching the rosette off sends the offset back to 0;
+# the component keeps axis.x.eoffset-enable on until X has got there,
+# so X only carries an external offset while the rosette is in use.
+# To pump Z instead, net the counts, offset and enable to the
+# axis.z.eoffset pins and set OFFSET_AV_RATIO for Z.
+#
+# The panel loads the profile table (REB_Display/REB_Rosette.py) and
+# drives amplitude, phase and on/off (REB_PostGUI.hal) through the
+# reb-rosette-enable, -scale and -phase signals made here. The
+# simulation has no panel widgets, so there the rosette stays
+# switched off.
+# ********************************************************************
+#  Modified 18 Oct 26 by R. Colvin
+# ********************************************************************
+
+if {[catch {loadrt reb_rosette names=reb-rosette} message]} {
+    puts "REB_Rosette.tcl: $message"
+    puts "REB_Rosette.tcl: reb_rosette is not installed; the electronic"
+    puts "REB_Rosette.tcl: rosette is disabled. Run REB_Setup/REB_Update.sh."
+    # The signals REB_PostGUI.hal nets the panel's widgets to.
+    newsig reb-rosette-enable                 bit
+    newsig reb-rosette-scale                  float
+    newsig reb-rosette-phase                  float
+    return
+}
+
+addf reb-rosette                            servo-thread
+
+# ********************************************************************
+#  Connect signals to pins
+net spindle.0-position-fb                => reb-rosette.revs
+
+net reb-rosette-enable                   => reb-rosette.enable
+net reb-rosette-scale                    => reb-rosette.scale
+net reb-rosette-phase                    => reb-rosette.phase
+
+net x-rosette-counts                    <=  reb-rosette.counts
+net x-rosette-counts                     => axis.x.eoffset-counts
+net x-rosette-offset                    <=  axis.x.eoffset
+net x-rosette-offset                     => reb-rosette.offset-fb
+net x-rosette-eoffset-enable            <=  reb-rosette.offset-enable
+net x-rosette-eoffset-enable             => axis.x.eoffset-enable
+
+# ********************************************************************
+#  Set pin values
+setp reb-rosette.resolution                 0.00001
+setp axis.x.eoffset-scale                   0.00001
+
+# ********************************************************************
+
+# *********************** NOTHING FOLLOWS ****************************
@@ -273,6 +273,14 @@ if [ $? != 0 ]; then
    echo -e "${KEYNOTE}PROGRAM TERMINATED PREMATURELY                                       ${NOCOLOR}"
    exit $?
 fi
+echo -e "${CMNTTEXT}    reb_rosette (realtime component)                               ${NOCOLOR}"
+sudo halcompile --install /home/cnc/linuxcnc/configs/RoseEngineButler/REB_Comp/reb_rosette.comp
+if [ $? != 0 ]; then
+   echo -e "${KEYNOTE}ERROR: halcompile of REB_Comp/reb_rosette.comp failed.              ${NOCOLOR}"
+   echo -e "${KEYNOTE}Ensure the linuxcnc-uspace-dev package is installed.                ${NOCOLOR}"
+   echo -e "${KEYNOTE}PROGRAM TERMINATED PREMATURELY                                       ${NOCOLOR}"
+   exit $?
+fi
 #
 # ********************************************************************
 # Step 4 - Install ClamAV
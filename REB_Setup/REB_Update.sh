@@ -103,6 +103,15 @@ if [ $? != 0 ]; then
 fi
 echo -e "${TITLE}Latest files pulled from GitHub                                        ${NOCOLOR}"
 echo -e "${TITLE}#######################################################################${NOCOLOR}"
+echo -e "${TITLE}Rebuild the realtime components                                        ${NOCOLOR}"
+sudo halcompile --install REB_Comp/reb_rosette.comp
+if [ $? != 0 ]; then
+    echo -e "${KEYNOTE}ERROR: halcompile of REB_Comp/reb_rosette.comp failed.              ${NOCOLOR}"
+    echo -e "${KEYNOTE}PROGRAM TERMINATED PREMATURELY                                       ${NOCOLOR}"
+    exit $?
+fi
+echo -e "${TITLE}Realtime components installed                                          ${NOCOLOR}"
+echo -e "${TITLE}#######################################################################${NOCOLOR}"
 echo -e "${TITLE}Update the package indexes                                             ${NOCOLOR}"
 sudo apt update
 if [ $? != 0 ]; then
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+REB_Sim_Driver.py
+
+Headless driver for the simulated-motion Rose Engine Butler
+configuration (REB_Sim.ini). LinuxCNC starts it in place of a GUI:
+
+    REB_Sim/REB_Sim_Driver.py -ini REB_Sim.ini
+
+It takes the machine out of estop, creates the panel's HandlerClass
+(REB_Display/hitcounter.py) on a "gladevcp" HAL component of its own,
+and plays back every [REB_SIM]SEQUENCE file against it. Each button
+press waits for the MDI executor to finish, the way an operator
+would, and is timed. The cycle-time report is printed, written to
+[REB_SIM]REPORT and followed by the REB_Timing breakdown; the driver
+then exits, which shuts LinuxCNC down.
+
+Sequence files hold one step per line ("#" starts a comment):
+
+    <handler> [value] [x<count>]    call a HandlerClass callback count
+                                    times (default once), passing a
+                                    spin button holding value if given
+    sleep <seconds>                 pause without pressing anything
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "REB_Display"))
+
+import hal
+import linuxcnc
+from gi.repository import GLib
+
+# The stand-in GtkBuilder and widgets REB_Bench uses. Loaded from its
+# file, since putting REB_Bench/stand_ins on sys.path would shadow the
+# real hal and linuxcnc modules with the benchmark's.
+_spec = importlib.util.spec_from_file_location(
+    "gtk_builder", os.path.join(os.path.dirname(HERE), "REB_Bench",
+                                "stand_ins", "gtk_builder.py"))
+gtk_builder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gtk_builder)
+
+
+def read_sequence(path):
+    '''
+    Parses a sequence file into a list of (handler, value, count) and
+    ("sleep", seconds, 1) steps.
+    '''
+    steps = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, start=1):
+            fields = line.split("#")[0].split()
+            if not fields:
+                continue
+            name, value, count = fields[0], None, 1
+            for field in fields[1:]:
+                if field.startswith("x") and field[1:].isdigit():
+                    count = int(field[1:])
+                else:
+                    value = float(field)
+            if name == "sleep" and value is None:
+                raise ValueError(path + ":" + str(lineno)
+                                 + ": sleep needs a number of seconds")
+            steps.append((name, value, count))
+    return steps
+
+
+class Player:
+    '''
+    Plays sequences against a HandlerClass on the GLib main loop and
+    collects the cycle time of every press.
+    '''
+
+    def __init__(self, handler, mdi, sequences):
+        self.handler = handler
+        self.mdi = mdi
+        self.sequences = sequences
+        self.results = []       # (sequence, handler, [cycle times])
+        self.loop = GLib.MainLoop()
+        self._steps = self._play()
+
+    def run(self):
+        GLib.idle_add(self._advance)
+        self.loop.run()
+
+    def _advance(self, *args):
+        try:
+            kind, seconds = next(self._steps)
+        except StopIteration:
+            self.loop.quit()
+            return False
+        if kind == "sleep":
+            GLib.timeout_add(int(seconds * 1000), self._advance)
+        else:
+            # Queued behind everything the press submitted, so its
+            # callback marks the moment the machine is done.
+            self.mdi.submit([], on_done=self._advance)
+        return False    # one-shot callback
+
+    def _play(self):
+        for path in self.sequences:
+            for name, value, count in read_sequence(path):
+                if name == "sleep":
+                    yield "sleep", value
+                    continue
+                callback = getattr(self.handler, name)
+                widget = None
+                if value is not None:
+                    widget = gtk_builder.SpinButton(value)
+                times = []
+                for i in range(count):
+                    pressed = time.monotonic()
+                    callback(widget)
+                    yield "drain", None
+                    times.append(time.monotonic() - pressed)
+                self.results.append((os.path.basename(path), name, times))
+
+
+def report(results):
+    import REB_Timing
+
+    lines = [
+        "REB_Sim cycle times (ms)",
+        "sequence               handler              n   total     p50"
+        "     p95     max",
+    ]
+    for sequence, name, times in results:
+        p50, p95, peak = REB_Timing.summary(times)
+        lines.append("%-22s %-18s %3d %7.0f %7.1f %7.1f %7.1f" % (
+            sequence, name, len(times), sum(times) * 1000,
+            p50 * 1000, p95 * 1000, peak * 1000))
+
+    timing = io.StringIO()
+    with contextlib.redirect_stdout(timing):
+        REB_Timing.dump()
+    return "\n".join(lines) + "\n" + timing.getvalue()
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "-ini":
+        sys.exit("usage: REB_Sim_Driver.py -ini <inifile>")
+    ini_path = os.path.abspath(sys.argv[2])
+    os.environ["INI_FILE_NAME"] = ini_path
+    config_dir = os.path.dirname(ini_path)
+    inifile = linuxcnc.ini(ini_path)
+
+    sequences = [os.path.join(config_dir, path)
+                 for path in inifile.findall("REB_SIM", "SEQUENCE")]
+    report_path = inifile.find("REB_SIM", "REPORT")
+
+    # Out of estop and on, as the operator would before pressing
+    # anything.
+    c = linuxcnc.command()
+    c.state(linuxcnc.STATE_ESTOP_RESET)
+    c.wait_complete()
+    c.state(linuxcnc.STATE_ON)
+    c.wait_complete()
+
+    import hitcounter
+
+    # get_handlers() also wraps the callbacks for REB_Timing, which
+    # [DISPLAY]REB_TIMING turns on in REB_Sim.ini.
+    halcomp = hal.component("gladevcp")
+    builder = gtk_builder.Builder()
+    handler = hitcounter.get_handlers(halcomp, builder, [])[0]
+    halcomp.ready()
+
+    # There is no REB_PostGUI.hal here; net the Sp1 gearing ratio
+    # (sp1-gear in REB_Common.hal) to the panel ourselves.
+    import REB_Hal
+    REB_Hal.net("sp1-gear-ratio", "gladevcp.Sp1_Ratio")
+
+    player = Player(handler, hitcounter.mdi, sequences)
+    player.run()
+
+    text = report(player.results)
+    print(text)
+    if report_path:
+        with open(os.path.join(config_dir, report_path), "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
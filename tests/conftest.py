@@ -0,0 +1,15 @@
+"""
+Puts REB_Display and the offline stand-ins for the LinuxCNC, HAL and
+GTK modules (REB_Bench/stand_ins) on sys.path, so the REB modules can
+be tested without LinuxCNC.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "REB_Bench", "stand_ins"),
+                os.path.join(ROOT, "REB_Display")]
+
+# Never pick up the INI file of a running LinuxCNC.
+os.environ.pop("INI_FILE_NAME", None)
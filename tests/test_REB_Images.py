@@ -0,0 +1,30 @@
+import os
+import re
+
+import REB_Images
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cached_ui_falls_back_to_the_ui(tmp_path):
+    ui = tmp_path / "Tab.ui"
+    cached = tmp_path / "Tab.cached.ui"
+    ui.write_text("<interface/>")
+    assert REB_Images.cached_ui(str(ui)) == str(ui)
+
+    cached.write_text("<interface/>")
+    os.utime(str(ui), (1000, 1000))
+    os.utime(str(cached), (2000, 2000))
+    assert REB_Images.cached_ui(str(ui)) == str(cached)
+
+    # A .ui edited since the last build wins over its stale copy.
+    os.utime(str(ui), (3000, 3000))
+    assert REB_Images.cached_ui(str(ui)) == str(ui)
+
+
+def test_the_panel_loads_a_tracked_ui():
+    with open(os.path.join(ROOT, "REB.ini")) as f:
+        line = re.search(r"^GLADEVCP\s*=(.*)$", f.read(), re.M).group(1)
+    ui_file = line.split()[-1]
+    assert not ui_file.endswith(REB_Images.CACHED_UI)
+    assert os.path.exists(os.path.join(ROOT, ui_file))
@@ -0,0 +1,78 @@
+import REB_Journal
+
+
+def journal(tmp_path):
+    return REB_Journal.Journal(str(tmp_path / "index.journal"))
+
+
+def test_counters_are_the_last_count_of_each_axis(tmp_path):
+    j = journal(tmp_path)
+    for count in (1, 2, 3):
+        j.append("B", 1, 15.0, count, 15.0 * count)
+    j.append("Sp0", -1, 30.0, -1, 330.0)
+    j.close()
+    assert j.counters() == {"B": 3, "Sp0": -1}
+
+
+def test_a_truncated_last_line_is_skipped(tmp_path):
+    j = journal(tmp_path)
+    j.append("B", 1, 15.0, 1, 15.0)
+    j.append("B", 1, 15.0, 2, 30.0)
+    j.close()
+    with open(j.path, "r+") as f:
+        text = f.read()
+        f.seek(0)
+        f.truncate()
+        f.write(text[:-5])
+    assert j.counters() == {"B": 1}
+
+    # The next append starts a new line instead of running on.
+    j.append("B", 1, 15.0, 2, 30.0)
+    j.close()
+    assert j.counters() == {"B": 2}
+
+
+def test_close_is_registered_once(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(REB_Journal.atexit, "register", registered.append)
+    j = journal(tmp_path)
+    for count in (1, 2, 3):
+        j.append("B", 1, 15.0, count, 15.0 * count)
+        j.close()
+    assert registered == [j.close]
+    assert j.counters() == {"B": 3}
+
+
+def test_reset(tmp_path):
+    j = journal(tmp_path)
+    j.append("B", 1, 15.0, 5, 75.0)
+    j.append("Sp0", 1, 30.0, 2, 60.0)
+    assert j.reset("B")
+    assert j.counters() == {"B": 0, "Sp0": 2}
+    j.append("B", 1, 15.0, 1, 15.0)
+    j.close()
+    assert j.counters() == {"B": 1, "Sp0": 2}
+
+
+def test_compaction_keeps_the_last_line_of_each_axis(tmp_path, monkeypatch):
+    monkeypatch.setattr(REB_Journal, "COMPACT_LINES", 5)
+    j = journal(tmp_path)
+    for count in range(1, 8):
+        j.append("B", 1, 15.0, count, 15.0 * count)
+    j.append("Sp0", 1, 30.0, 1, 30.0)
+    j.reset("Sp0")
+    j.close()
+    assert j.counters() == {"B": 7, "Sp0": 0}
+    with open(j.path) as f:
+        lines = f.readlines()
+    assert len(lines) == 2
+    assert REB_Journal.parse_line(lines[1])[2] == REB_Journal.RESET
+    assert j.counters() == {"B": 7, "Sp0": 0}
+
+
+def test_parse_line():
+    assert REB_Journal.parse_line("1.5 B +1 15.0 3 45.0\n") == (
+        1.5, "B", 1, 15.0, 3, 45.0)
+    assert REB_Journal.parse_line("1.5 B +1 15.0 3 45.0") is None
+    assert REB_Journal.parse_line("1.5 B up 15.0 3 45.0\n") is None
+    assert REB_Journal.parse_line("1.5 B reset 0 0 0\n")[4] == 0
@@ -0,0 +1,40 @@
+import linuxcnc
+from gi.repository import GLib
+
+import REB_Mdi
+import REB_Program
+import REB_Stat
+
+
+def executor(monkeypatch):
+    monkeypatch.setattr(linuxcnc, "ACCEPT_DELAY", 0.0)
+    monkeypatch.setattr(linuxcnc, "MOTION_DELAY", 0.01)
+    return REB_Mdi.MdiExecutor(None, REB_Stat.StatCache(tick=0.0))
+
+
+def test_jobs_run_in_order(monkeypatch):
+    mdi = executor(monkeypatch)
+    done = []
+    for n in range(3):
+        mdi.submit(["G0 B15"], on_done=done.append, label=str(n))
+    assert GLib.run_until(lambda: len(done) == 3)
+    assert [job.label for job in done] == ["0", "1", "2"]
+    assert all(job.ok for job in done)
+
+
+def test_program_reports_every_step(monkeypatch, tmp_path):
+    monkeypatch.setattr(REB_Program, "program_dir", lambda: str(tmp_path))
+    for moves, gcode in ((True, "G0 B15"), (False, "M19 R15 Q10 P1 $0")):
+        mdi = executor(monkeypatch)
+        program = REB_Program.Program("steps", ["G91"], moves=moves)
+        for k in range(5):
+            program.add_step([gcode])
+        steps = []
+        done = []
+        mdi.submit_program(program,
+                           on_progress=lambda job, n: steps.append(n),
+                           on_done=done.append)
+        assert GLib.run_until(lambda: done)
+        assert done[0].ok
+        assert sum(steps) == 5
+        assert done[0].completed == 5
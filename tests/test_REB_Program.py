@@ -0,0 +1,36 @@
+import REB_Program
+
+
+def program(moves=True):
+    p = REB_Program.Program("B x 3", ["G91"], moves=moves)
+    for k in range(1, 4):
+        p.add_step(["G0 B15 F10"] if moves
+                   else ["M19 R" + str(15 * k) + " Q10 P1 $0"])
+    return p
+
+
+def test_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(REB_Program, "program_dir", lambda: str(tmp_path))
+    path = program().write()
+    assert path == str(tmp_path / REB_Program.REPEAT_FILE)
+    with open(path) as f:
+        assert f.read() == ("%\n(B x 3)\nG91\n"
+                            "G0 B15 F10\nG0 B15 F10\nG0 B15 F10\n%\n")
+
+
+def test_move_lines_are_the_last_line_of_each_step():
+    p = REB_Program.Program("two lines a step")
+    p.add_step(["G0 X1", "G0 Z1"])
+    p.add_step(["G0 X-1", "G0 Z-1"])
+    assert p.move_lines == [4, 6]
+    assert [p.lines[n - 1] for n in p.move_lines] == ["G0 Z1", "G0 Z-1"]
+
+
+def test_line_field():
+    assert program().line_field == "motion_line"
+    assert program(moves=False).line_field == "current_line"
+
+
+def test_program_dir_without_an_ini_file():
+    import tempfile
+    assert REB_Program.program_dir() == tempfile.gettempdir()
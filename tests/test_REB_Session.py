@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+import REB_Session
+
+
+def test_convert():
+    assert REB_Session.convert("B_Idx_Rpt", 4.0) == 4
+    assert REB_Session.convert("B_Feed", 3) == 3.0
+    assert REB_Session.convert("B_Idx_DegDiv", "Div") == "Div"
+    for name, value in (("B_Idx_Rpt", 1.5), ("B_Feed", True),
+                        ("B_Idx_DegDiv", "Rad"), ("Sp0_Idx_Bool", 1),
+                        ("Rosette_Name", 3)):
+        with pytest.raises(ValueError):
+            REB_Session.convert(name, value)
+
+
+def test_load_drops_unknown_and_invalid_values(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"B_Feed": 12.5, "B_Idx_Rpt": "many",
+                                "No_Such_Field": 1}))
+    session = REB_Session.Session.load(str(path))
+    assert session.values == {"B_Feed": 12.5}
+
+
+def test_missing_or_broken_file_is_an_empty_session(tmp_path):
+    assert REB_Session.Session.load(str(tmp_path / "none")).values == {}
+    path = tmp_path / "broken.json"
+    path.write_text("{")
+    assert REB_Session.Session.load(str(path)).values == {}
+
+
+def test_dump_load_round_trip(tmp_path):
+    path = str(tmp_path / "session.json")
+    session = REB_Session.Session(path)
+    assert session.set("Sp0_Feed", 20)
+    assert session.set("Sp0_Idx_DegDiv", "Deg")
+    assert not session.set("Sp0_Feed", 20.0)
+    with open(path, "w") as f:
+        f.write(session.dump())
+    assert REB_Session.Session.load(path).values == session.values
+
+
+
+def test_profile_values_and_attrs():
+    values = {"B_Feed": 10.0, "B_Idx_DegDiv": "Div", "Sp1_Pct": 50.0}
+    axes = REB_Session.profile_values(values)
+    assert axes == {"B": {"feed": 10.0, "idx_mode": "Div"},
+                    "Sp1": {"pct": 50.0}}
+    attrs = REB_Session.profile_attrs(axes)
+    assert attrs == values
+    # The Deg/Div mode is set before the distances it applies to.
+    assert list(attrs)[0] == "B_Idx_DegDiv"
@@ -0,0 +1,130 @@
+import os
+import threading
+
+import pytest
+
+import REB_Settings
+
+TEXT = '''<?xml version="1.0" encoding="UTF-8"?>
+<!-- Rose Engine Butler settings; <settings> holds one <axis> per axis -->
+<settings>
+    <axis id="B">
+        <scale>57599</scale>
+        <feed>10</feed>
+        <idx_mode>Div</idx_mode>
+    </axis>
+    <axis id="X">
+        <scale>16000</scale>
+    </axis>
+</settings>
+<!-- trailer -->
+'''
+
+
+def test_to_xml_round_trip():
+    settings = REB_Settings.Settings("unused")
+    settings.parse(TEXT)
+    assert settings.get("B", "scale") == 57599.0
+    assert settings.get("B", "idx_mode") == "Div"
+    assert settings.values("scale") == {"B": 57599.0, "X": 16000.0}
+    assert settings.to_xml() == TEXT
+
+
+PROFILE_TEXT = TEXT.replace(
+    "<settings>", '<settings profile="Small">').replace(
+    "</settings>", """    <profile name="Small">
+        <axis id="B">
+            <idx_rpt>24</idx_rpt>
+        </axis>
+    </profile>
+</settings>""")
+
+
+def test_profile_round_trip():
+    settings = REB_Settings.Settings("unused")
+    settings.parse(PROFILE_TEXT)
+    assert settings.profiles["Small"] == {"B": {"idx_rpt": 24}}
+    assert settings.profile == "Small"
+    assert settings.to_xml() == PROFILE_TEXT
+
+
+def test_set_reports_changes_and_checks_values():
+    settings = REB_Settings.Settings("unused")
+    settings.parse(TEXT)
+    assert settings.set("X", "scale", "16000") is False
+    assert settings.set("X", "feed", 2) is True
+    assert settings.get("X", "feed") == 2.0
+    with pytest.raises(REB_Settings.SettingsError):
+        settings.set("X", "idx_rpt", "1.5")
+    with pytest.raises(REB_Settings.SettingsError):
+        settings.set("X", "idx_mode", "Rad")
+    with pytest.raises(REB_Settings.SettingsError):
+        settings.set("X", "colour", 1)
+
+
+def test_load_rejects_a_duplicate_axis(tmp_path):
+    path = tmp_path / "settings.ini"
+    path.write_text('<settings><axis id="B"/><axis id="B"/></settings>')
+    with pytest.raises(REB_Settings.SettingsError):
+        REB_Settings.Settings.load(str(path))
+
+
+def test_write_atomic_rotates_backups(tmp_path):
+    path = str(tmp_path / "settings.ini")
+    for text in ("1", "2", "3", "4", "5"):
+        REB_Settings.write_atomic(path, text, backups=3)
+
+    def read(name):
+        with open(name) as f:
+            return f.read()
+
+    assert read(path) == "5"
+    assert [read(path + "." + str(n)) for n in (1, 2, 3)] == ["4", "3", "2"]
+    assert not os.path.exists(path + ".4")
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "settings.ini", "settings.ini.1", "settings.ini.2", "settings.ini.3"]
+
+
+def test_write_atomic_keeps_the_file_mode(tmp_path):
+    path = str(tmp_path / "settings.ini")
+    REB_Settings.write_atomic(path, "1")
+    os.chmod(path, 0o640)
+    REB_Settings.write_atomic(path, "2")
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+class Model:
+    def __init__(self, path):
+        self.path = path
+        self.value = 0
+
+    def set(self, value):
+        changed = value != self.value
+        self.value = value
+        return changed
+
+    def dump(self):
+        return str(self.value)
+
+
+def test_writer_saves_the_latest_value_from_concurrent_flushes(tmp_path):
+    model = Model(str(tmp_path / "model"))
+    writer = REB_Settings.SettingsWriter(model, delay=0.01)
+
+    def changes(first):
+        for value in range(first, first + 50):
+            writer.record(value)
+            writer.flush()
+
+    threads = [threading.Thread(target=changes, args=(n * 100 + 1,))
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.flush()
+
+    with open(model.path) as f:
+        assert f.read() == str(model.value)
+    assert not [name for name in os.listdir(str(tmp_path))
+                if name.endswith(".tmp")]
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import REB_Journal
+import REB_Program
+import REB_Settings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "REB_Bench"))
+import REB_Bench
+
+
+def load(tmp_path):
+    tmp_path.mkdir(exist_ok=True)
+    hitcounter, handler = REB_Bench.load(0.0, 0.001)
+    handler._journal = REB_Journal.Journal(str(tmp_path / "index.journal"))
+    return hitcounter, handler
+
+
+def test_a_spindle_index_without_a_position_is_journalled(tmp_path):
+    hitcounter, h = load(tmp_path)
+    h.Sp1_Idx_Qty = 0
+    on_done = h._count_index("Sp1_Idx_Qty", 1, 90.0)
+    on_done(type("Job", (), {"ok": True})())
+    h._journal.close()
+    assert h._journal.counters() == {"Sp1": 1}
+
+
+def journalled_positions(j):
+    j.close()
+    with open(j.path) as f:
+        return [REB_Journal.parse_line(line)[5] for line in f]
+
+
+def test_single_presses_and_a_repeat_index_the_same_positions(
+        tmp_path, monkeypatch):
+    monkeypatch.setattr(REB_Program, "program_dir", lambda: str(tmp_path))
+    positions = []
+    for rpt in (1, 5):
+        hitcounter, h = load(tmp_path / str(rpt))
+        h.Sp0_Idx_Deg = 50.0
+        h.Sp0_Idx_Qty = 2
+        h.Sp0_Idx_Rpt = rpt
+        for press in range(5 // rpt):
+            h.Sp0_Move_Idx_Fwd(None)
+            REB_Bench.drain(hitcounter)
+        h.Sp0_Idx_Rpt = 1
+        h.Sp0_Move_Idx_Rev(None)
+        REB_Bench.drain(hitcounter)
+        assert h.Sp0_Idx_Qty == 6
+        positions.append(journalled_positions(h._journal))
+    assert positions[0] == positions[1]
+    assert positions[0] == [150.0, 200.0, 250.0, 300.0, 350.0, 300.0]
+
+
+def test_the_settings_tab_lists_the_profiles(tmp_path, monkeypatch):
+    path = tmp_path / "settings.ini"
+    path.write_text("""<settings profile="Small">
+    <axis id="X">
+        <scale>500</scale>
+    </axis>
+    <profile name="Small">
+        <axis id="X">
+            <scale>400</scale>
+        </axis>
+    </profile>
+</settings>
+""")
+    monkeypatch.setattr(REB_Settings, "SETTINGS_PATH", str(path))
+    hitcounter, h = load(tmp_path)
+    assert h.builder.get_object("X_Set_Scale").get_value() == 500.0
+    combo = h.builder.get_object("Profile_Select")
+    assert combo.items == [(None, "Small")]
+    assert combo.get_child().get_text() == "Small"
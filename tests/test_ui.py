@@ -0,0 +1,29 @@
+import glob
+import os
+import re
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_FILES = [path for path in glob.glob(os.path.join(ROOT, "REB_Display",
+                                                    "*.ui"))
+            if not path.endswith(".cached.ui")]
+
+# <axis>_Idx_<name>, as in X_Idx_Minus, B_Idx_Fwd or Sp0_Idx_Reset.
+IDX_WIDGET = re.compile(r"^(X|Y|Z|A|B|C|U|V|W|Sp\d)_Idx_(\w+)$")
+DIRECTIONS = ("Minus", "Plus", "Fwd", "Rev")
+
+
+def test_every_index_widget_calls_its_own_axis():
+    assert UI_FILES
+    for path in UI_FILES:
+        for obj in ET.parse(path).iter("object"):
+            match = IDX_WIDGET.match(obj.get("id", ""))
+            if match is None:
+                continue
+            axis_id, name = match.groups()
+            for signal in obj.findall("signal"):
+                handler = signal.get("handler")
+                where = os.path.basename(path) + ": " + obj.get("id")
+                assert handler.startswith(axis_id + "_"), where
+                if name in DIRECTIONS:
+                    assert handler.endswith("_" + name), where